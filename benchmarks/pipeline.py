@@ -0,0 +1,386 @@
+"""
+Benchmark des étapes du traitement sur des dépôts Git synthétiques.
+
+Les dépôts sont générés par synthetic_repo.py (commits, auteurs, branches et densité de tickets
+paramétrables), puis chaque étape est chronométrée plusieurs fois : extraction (complète puis
+incrémentale), nettoyage de l'ancien CSV, chargement du magasin, analyse des tickets par moteur
+(et répartie sur un pool de processus avec --processes), ajustement des durées, exports JSON/XML
+et remplissage du tableau de l'interface.
+
+Les résultats sont écrits en JSON (--output) avec le commit, la plateforme et les paramètres ;
+--compare confronte la mesure à un fichier de résultats antérieur et échoue (code 1) si une étape
+ralentit au-delà du seuil.
+
+Usage :
+    python benchmarks/pipeline.py --commits 50000 --authors 10 --output resultats.json
+    python benchmarks/pipeline.py --compare resultats.json --threshold 1.2
+    python benchmarks/pipeline.py --commits 500000 --engines loop --processes 16
+    python benchmarks/pipeline.py --commits 200000 --processes 4 --parallel-sizes 25000 50000 100000
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from synthetic_repo import generate_repository
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Paramètres des dépôts générés, conservés dans le répertoire de travail pour le réutiliser
+PARAMETERS_FILE = 'parameters.json'
+
+# Part de lignes mal formées ajoutées à l'ancien CSV pour l'étape de nettoyage
+MALFORMED_RATIO = 0.01
+
+
+def git_revision():
+    """Retourne le commit du dépôt mesuré (suffixé de -dirty si l'arbre est modifié), ou None."""
+    try:
+        revision = subprocess.run(['git', '-C', ROOT, 'rev-parse', 'HEAD'],
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', '-C', ROOT, 'status', '--porcelain', '--untracked-files=no'],
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}-dirty" if status else revision
+
+
+def package_versions():
+    """Retourne les versions des dépendances qui influencent les mesures."""
+    versions = {}
+    for name in ('pandas', 'numpy', 'pyarrow', 'PyQt5.QtCore'):
+        try:
+            module = __import__(name, fromlist=['_'])
+        except ImportError:
+            versions[name] = None
+            continue
+        versions[name] = getattr(module, '__version__', None) or getattr(module, 'PYQT_VERSION_STR', None)
+    return versions
+
+
+def prepare_repositories(workdir, parameters):
+    """
+    Génère les dépôts synthétiques, ou réutilise ceux du répertoire de travail s'ils ont été
+    générés avec les mêmes paramètres.
+
+    Args:
+        workdir: Le répertoire de travail.
+        parameters: Les paramètres de génération.
+
+    Returns:
+        Les chemins des dépôts.
+    """
+    parameters_file = os.path.join(workdir, PARAMETERS_FILE)
+    repositories = [os.path.join(workdir, f'repo_{index:02d}') for index in range(parameters['repositories'])]
+    if os.path.exists(parameters_file):
+        with open(parameters_file, encoding='utf-8') as f:
+            if json.load(f) == parameters:
+                return repositories
+    for repository in repositories:
+        shutil.rmtree(repository, ignore_errors=True)
+
+    commits_per_repository = max(1, parameters['commits'] // parameters['repositories'])
+    for index, repository in enumerate(repositories):
+        generate_repository(
+            repository,
+            commits=commits_per_repository,
+            authors=parameters['authors'],
+            branches=parameters['branches'],
+            ticket_density=parameters['ticket_density'],
+            tickets=parameters['tickets'],
+            days=parameters['days'],
+            seed=parameters['seed'] + index
+        )
+    with open(parameters_file, 'w', encoding='utf-8') as f:
+        json.dump(parameters, f, indent=4, sort_keys=True)
+    return repositories
+
+
+def time_stage(function, repeat, setup=None):
+    """
+    Chronomètre une étape.
+
+    Args:
+        function: L'étape, appelée avec les arguments retournés par setup.
+        repeat: Le nombre de mesures.
+        setup: Fonction préparant les arguments de chaque mesure (non chronométrée), ou None.
+
+    Returns:
+        Un tuple (résultat de la dernière mesure, durées en secondes).
+    """
+    runs = []
+    result = None
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        result = function(*args)
+        runs.append(time.perf_counter() - start)
+    return result, runs
+
+
+def write_legacy_logs(df, logs_file, delimiter):
+    """Écrit les commits à l'ancien format CSV délimité, avec une part de lignes mal formées."""
+    every = int(1 / MALFORMED_RATIO)
+    with open(logs_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        for index, row in enumerate(zip(df['hash'], df['author'], df['date'].astype(str), df['message'])):
+            writer.writerow(row)
+            if index % every == 0:
+                writer.writerow(row + ('colonne en trop',))
+
+
+def copy_durations(durees_par_journee):
+    """Copie les durées par journée (adjust_durations modifie les tickets en place)."""
+    return {journee: [dict(t) for t in tickets] for journee, tickets in durees_par_journee.items()}
+
+
+def table_stage():
+    """
+    Prépare l'étape de remplissage du tableau de l'interface (PyQt5, affichage hors écran).
+
+    Returns:
+        La fonction (durees_par_journee, work_periods) à chronométrer, ou None sans PyQt5.
+    """
+    if not os.environ.get('DISPLAY') and sys.platform.startswith('linux'):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PyQt5.QtWidgets import QApplication, QTableView
+        from src.ui.timesheet_model import TimesheetTableModel
+    except ImportError:
+        return None
+    app = QApplication.instance() or QApplication([])
+    model = TimesheetTableModel()
+    table = QTableView()
+    table.setModel(model)
+    table.resize(1000, 700)
+    table.show()
+
+    def populate(durees_par_journee, work_periods):
+        # Même séquence que MainWindow.update_table, suivie de l'affichage des lignes visibles
+        model.set_durations(durees_par_journee, work_periods)
+        table.clearSpans()
+        for row in model.day_rows:
+            table.setSpan(row, 0, 1, model.columnCount())
+        table.viewport().repaint()
+        app.processEvents()
+        return model.rowCount()
+
+    return populate
+
+
+def run(repositories, workdir, args):
+    """
+    Chronomètre les étapes sur les dépôts générés.
+
+    Args:
+        repositories: Les chemins des dépôts.
+        workdir: Le répertoire de travail.
+        args: Les arguments de la ligne de commande.
+
+    Returns:
+        Un tuple (statistiques du jeu de données, durées par étape).
+    """
+    from src.core.git_processor import GitProcessor
+    from src.core.parallel_analysis import analyze_parallel
+    from src.core.ticket_analyzer import TicketAnalyzer
+    from src.core.timesheet_generator import TimesheetGenerator
+    from src.utils.config import Config
+
+    config = Config(os.path.join(workdir, 'config.yaml'), save_delay=0)
+    for repository in repositories:
+        config.add_repository(repository)
+    git_processor = GitProcessor(config)
+    ticket_analyzer = TicketAnalyzer(config)
+    timesheet_generator = TimesheetGenerator(config)
+    stages = {}
+    stores = []
+
+    def fresh_store():
+        stores.append(tempfile.mkdtemp(prefix='store_', dir=workdir))
+        return (stores[-1],)
+
+    store_path, stages['extraction'] = time_stage(git_processor.extract_git_logs, args.repeat, fresh_store)
+    _, stages['extraction_incremental'] = time_stage(lambda: git_processor.extract_git_logs(store_path), args.repeat)
+
+    df, stages['loading'] = time_stage(lambda: git_processor.load_git_logs_dataframe(store_path=store_path), args.repeat)
+
+    legacy_file = os.path.join(workdir, 'git_logs_legacy.csv')
+    logs_file = os.path.join(workdir, 'git_logs.csv')
+    write_legacy_logs(df, legacy_file, git_processor.delimiter)
+    _, stages['cleaning'] = time_stage(git_processor.clean_logs_file, args.repeat,
+                                       lambda: (shutil.copyfile(legacy_file, logs_file),))
+
+    durees_par_journee = None
+    for engine in args.engines:
+        durees_par_journee, stages[f'tickets_{engine}'] = time_stage(
+            lambda: ticket_analyzer.extract_tickets_from_dataframe(df, engine=engine, processes=1), args.repeat
+        )
+        if args.processes > 1:
+            # Mode réparti mesuré quel que soit le volume (pas de seuil PARALLEL_MIN_COMMITS)
+            _, stages[f'tickets_{engine}_x{args.processes}'] = time_stage(
+                lambda: analyze_parallel(config, df, engine, args.processes), args.repeat
+            )
+            for size in args.parallel_sizes:
+                if size >= len(df):
+                    continue
+                # Seuil de l'analyse répartie : analyse séquentielle et répartie des premiers commits
+                head = df.head(size)
+                _, stages[f'tickets_{engine}_{size}'] = time_stage(
+                    lambda: ticket_analyzer.extract_tickets_from_dataframe(head, engine=engine, processes=1), args.repeat
+                )
+                _, stages[f'tickets_{engine}_{size}_x{args.processes}'] = time_stage(
+                    lambda: analyze_parallel(config, head, engine, args.processes), args.repeat
+                )
+
+    durees_par_journee, stages['adjust_durations'] = time_stage(
+        ticket_analyzer.adjust_durations, args.repeat, lambda: (copy_durations(durees_par_journee),)
+    )
+
+    json_file = os.path.join(workdir, 'timesheet.json')
+    xml_file = os.path.join(workdir, 'timesheet.xml')
+    _, stages['export_json'] = time_stage(lambda: timesheet_generator.generate_json(durees_par_journee, json_file), args.repeat)
+    _, stages['export_xml'] = time_stage(lambda: timesheet_generator.generate_xml(durees_par_journee, xml_file), args.repeat)
+
+    populate = table_stage() if not args.no_table else None
+    rows = None
+    if populate is not None:
+        work_periods = config.get_work_periods()
+        rows, stages['table'] = time_stage(lambda: populate(durees_par_journee, work_periods), args.repeat)
+
+    for store in stores:
+        shutil.rmtree(store, ignore_errors=True)
+
+    dataset = {
+        'commits': int(len(df)),
+        'days': len(durees_par_journee),
+        'slots': sum(len(tickets) for tickets in durees_par_journee.values()),
+        'table_rows': rows
+    }
+    return dataset, stages
+
+
+def summarize(runs):
+    """Résume les durées d'une étape (en secondes)."""
+    return {'runs': runs, 'min': min(runs), 'median': statistics.median(runs)}
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare les médianes aux résultats de référence.
+
+    Args:
+        results: Les résultats de la mesure.
+        baseline: Les résultats de référence.
+        threshold: Le rapport au-delà duquel une étape est considérée comme ralentie.
+
+    Returns:
+        La liste des étapes ralenties.
+    """
+    if baseline.get('parameters') != results['parameters']:
+        print("Attention : la référence a été mesurée avec d'autres paramètres")
+    print(f"Comparaison avec {baseline.get('revision') or 'la référence'} :")
+    slower = []
+    for stage, measure in results['stages'].items():
+        reference = baseline.get('stages', {}).get(stage)
+        if not reference:
+            print(f"  {stage:24s} (absente de la référence)")
+            continue
+        ratio = measure['median'] / reference['median'] if reference['median'] else float('inf')
+        flag = "  RALENTIE" if ratio > threshold else ""
+        print(f"  {stage:24s} {reference['median'] * 1000:10.1f} ms -> {measure['median'] * 1000:10.1f} ms  x{ratio:.2f}{flag}")
+        if ratio > threshold:
+            slower.append(stage)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des étapes du traitement sur des dépôts Git synthétiques.")
+    parser.add_argument('--commits', type=int, default=20000, help="nombre total de commits (par défaut 20000)")
+    parser.add_argument('--repositories', type=int, default=2, help="nombre de dépôts (par défaut 2)")
+    parser.add_argument('--authors', type=int, default=5, help="nombre d'auteurs (par défaut 5)")
+    parser.add_argument('--branches', type=int, default=3, help="branches par dépôt, main comprise (par défaut 3)")
+    parser.add_argument('--ticket-density', type=float, default=0.8,
+                        help="proportion de commits mentionnant un ticket (par défaut 0.8)")
+    parser.add_argument('--tickets', type=int, default=200, help="tickets distincts par projet (par défaut 200)")
+    parser.add_argument('--days', type=int, default=250, help="jours ouvrés couverts (par défaut 250)")
+    parser.add_argument('--seed', type=int, default=0, help="graine du générateur (par défaut 0)")
+    parser.add_argument('--repeat', type=int, default=3, help="nombre de mesures par étape (par défaut 3)")
+    parser.add_argument('--engines', nargs='+', default=['vectorized', 'loop'], choices=['vectorized', 'loop'],
+                        help="moteurs d'analyse mesurés (par défaut les deux)")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="mesurer aussi l'analyse répartie sur ce nombre de processus (par défaut 1 : non mesurée)")
+    parser.add_argument('--parallel-sizes', type=int, nargs='*', default=[],
+                        help="avec --processes, mesurer aussi les deux modes sur ces nombres de commits, "
+                             "pour situer le seuil PARALLEL_MIN_COMMITS")
+    parser.add_argument('--no-table', action='store_true', help="ne pas mesurer le remplissage du tableau")
+    parser.add_argument('--workdir', default=None,
+                        help="répertoire des dépôts générés, réutilisés d'une mesure à l'autre (par défaut temporaire)")
+    parser.add_argument('--output', default=None, help="fichier JSON des résultats")
+    parser.add_argument('--compare', default=None, help="fichier JSON de résultats de référence")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="rapport des médianes signalé comme ralentissement (par défaut 1.2)")
+    args = parser.parse_args()
+
+    parameters = {
+        'commits': args.commits,
+        'repositories': args.repositories,
+        'authors': args.authors,
+        'branches': args.branches,
+        'ticket_density': args.ticket_density,
+        'tickets': args.tickets,
+        'days': args.days,
+        'seed': args.seed
+    }
+    workdir = args.workdir or tempfile.mkdtemp(prefix='timesheet_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        start = time.perf_counter()
+        repositories = prepare_repositories(workdir, parameters)
+        print(f"Dépôts prêts en {time.perf_counter() - start:.1f} s ({workdir})")
+        dataset, stages = run(repositories, workdir, args)
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        'benchmark': 'pipeline',
+        'revision': git_revision(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'packages': package_versions(),
+        'parameters': parameters,
+        'repeat': args.repeat,
+        'dataset': dataset,
+        'stages': {stage: summarize(runs) for stage, runs in stages.items()}
+    }
+
+    print(f"{dataset['commits']} commits, {dataset['days']} journées, {dataset['slots']} créneaux")
+    for stage, measure in results['stages'].items():
+        print(f"  {stage:24s} {measure['median'] * 1000:10.1f} ms (min {measure['min'] * 1000:.1f} ms)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+        print(f"Résultats écrits dans {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
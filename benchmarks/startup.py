@@ -0,0 +1,99 @@
+"""
+Mesure du temps de démarrage de l'interface graphique, avec un budget à respecter.
+
+Chaque mesure lance un interpréteur neuf (imports à froid du point de vue de Python) qui importe
+la fenêtre principale, la construit et l'affiche. Le script échoue (code 1) si la médiane dépasse
+le budget, ou si un module lourd (pandas, NumPy, XML) est chargé avant le premier affichage.
+
+Usage :
+    python benchmarks/startup.py [--runs 5] [--budget-ms 300]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules qui ne doivent être chargés qu'au premier usage
+HEAVY_MODULES = ['pandas', 'numpy', 'pyarrow', 'xml.dom.minidom', 'src.core.ticket_analyzer']
+
+# Programme exécuté dans l'interpréteur mesuré
+PROBE = r'''
+import json, os, sys, tempfile, time
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from src.ui.main_window import MainWindow
+from src.utils.config import Config
+imported = time.perf_counter()
+app = QApplication(sys.argv)
+window = MainWindow(Config(os.path.join(tempfile.mkdtemp(), 'config.yaml')))
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+loaded = [name for name in json.loads(sys.argv[1]) if name in sys.modules]
+print(json.dumps({'import': imported - start, 'shown': shown - start, 'heavy': loaded}))
+'''
+
+
+def measure(env):
+    """Lance une mesure dans un nouvel interpréteur et retourne son résultat."""
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, json.dumps(HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_profile(env, top=10):
+    """Retourne les modules les plus coûteux à importer (python -X importtime)."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import src.ui.main_window'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure du temps de démarrage de l'interface graphique.")
+    parser.add_argument('--runs', type=int, default=5, help="nombre de mesures (par défaut 5)")
+    parser.add_argument('--budget-ms', type=float, default=300, help="budget de la médiane jusqu'à l'affichage (par défaut 300 ms)")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen' if not os.environ.get('DISPLAY') and sys.platform.startswith('linux') else '')
+    if not env['QT_QPA_PLATFORM']:
+        del env['QT_QPA_PLATFORM']
+
+    results = [measure(env) for _ in range(args.runs)]
+    import_ms = statistics.median(result['import'] for result in results) * 1000
+    shown_ms = statistics.median(result['shown'] for result in results) * 1000
+    heavy = sorted(set(name for result in results for name in result['heavy']))
+
+    print(f"Imports : {import_ms:.0f} ms (médiane sur {args.runs} mesures)")
+    print(f"Fenêtre affichée : {shown_ms:.0f} ms (budget : {args.budget_ms:.0f} ms)")
+    print("Imports les plus coûteux (cumulés) :")
+    for cumulative, name in import_profile(env):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if heavy:
+        print(f"ÉCHEC : modules lourds chargés au démarrage : {', '.join(heavy)}")
+        failed = True
+    if shown_ms > args.budget_ms:
+        print("ÉCHEC : budget de démarrage dépassé")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
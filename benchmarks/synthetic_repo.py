@@ -0,0 +1,198 @@
+"""
+Génération de dépôts Git synthétiques pour les benchmarks.
+
+Les commits sont écrits en une passe par git fast-import (plusieurs dizaines de milliers de
+commits par seconde), avec un nombre de commits, d'auteurs, de branches et une densité de
+tickets paramétrables. La génération est déterministe pour une graine donnée.
+
+Usage :
+    python benchmarks/synthetic_repo.py /tmp/depot --commits 20000 --authors 10 --branches 4
+"""
+import argparse
+import calendar
+import os
+import random
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+
+
+# Fuseau horaire des commits générés (les heures locales restent dans la journée de travail)
+TIMEZONE = '+0100'
+TIMEZONE_OFFSET = 3600
+
+PROJECTS = ['PROJ', 'CORE', 'WEB', 'API']
+SUBJECTS = [
+    "Correction de l'affichage des totaux",
+    "Ajout de la validation du formulaire",
+    "Refactorisation du service d'import",
+    "Mise à jour des dépendances",
+    "Gestion des caractères spéciaux < & > \"",
+    "Optimisation des requêtes",
+    "Documentation de l'API",
+    "Tests de non-régression"
+]
+
+
+def author_names(count):
+    """Retourne les noms des auteurs synthétiques."""
+    return [f"Auteur {index:02d}" for index in range(1, count + 1)]
+
+
+def working_days(start, count):
+    """Retourne les count premiers jours ouvrés (lundi-vendredi) à partir de start."""
+    days = []
+    day = start
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def commit_message(rng, ticket_density, tickets):
+    """
+    Tire un sujet de commit, préfixé par un code de ticket avec la probabilité ticket_density.
+
+    Args:
+        rng: Le générateur aléatoire.
+        ticket_density: La proportion de commits mentionnant un ticket (0 à 1).
+        tickets: Le nombre de tickets distincts par projet.
+
+    Returns:
+        Le sujet du commit.
+    """
+    subject = rng.choice(SUBJECTS)
+    if rng.random() >= ticket_density:
+        return subject
+    return f"{rng.choice(PROJECTS)}-{rng.randint(1, tickets)} {subject}"
+
+
+def iter_commits(commits, authors, days, ticket_density, tickets, start, seed):
+    """
+    Produit les commits synthétiques dans l'ordre chronologique.
+
+    Args:
+        commits: Le nombre de commits.
+        authors: Le nombre d'auteurs.
+        days: Le nombre de jours ouvrés couverts.
+        ticket_density: La proportion de commits mentionnant un ticket.
+        tickets: Le nombre de tickets distincts par projet.
+        start: Le premier jour (date).
+        seed: La graine du générateur aléatoire.
+
+    Returns:
+        Un générateur de tuples (auteur, date locale, sujet).
+    """
+    rng = random.Random(seed)
+    names = author_names(authors)
+    calendar_days = working_days(start, days)
+    moments = sorted(
+        (rng.choice(calendar_days), rng.randint(8 * 60, 19 * 60 - 1))
+        for _ in range(commits)
+    )
+    for day, minute in moments:
+        moment = datetime(day.year, day.month, day.day, minute // 60, minute % 60, rng.randint(0, 59))
+        yield rng.choice(names), moment, commit_message(rng, ticket_density, tickets)
+
+
+def fast_import_stream(commits, branches, seed):
+    """
+    Produit le flux git fast-import des commits.
+
+    Le premier commit est sur main ; chaque autre branche part de l'extrémité de main au moment
+    de son premier commit, puis les commits sont répartis au hasard entre les branches.
+
+    Args:
+        commits: Les commits (auteur, date locale, sujet) dans l'ordre chronologique.
+        branches: Le nombre de branches (main comprise).
+        seed: La graine du générateur aléatoire.
+
+    Returns:
+        Un générateur de blocs d'octets.
+    """
+    rng = random.Random(seed + 1)
+    names = ['main'] + [f'feature/{index}' for index in range(1, branches)]
+    started = set()
+    main_tip = None
+    for mark, (author, moment, subject) in enumerate(commits, 1):
+        branch = 'main' if main_tip is None else rng.choice(names)
+        epoch = calendar.timegm(moment.timetuple()) - TIMEZONE_OFFSET
+        email = author.lower().replace(' ', '.') + '@example.com'
+        message = subject.encode('utf-8')
+        content = f"{mark}\n".encode('ascii')
+        lines = [
+            f"commit refs/heads/{branch}\n".encode('ascii'),
+            f"mark :{mark}\n".encode('ascii'),
+            f"author {author} <{email}> {epoch} {TIMEZONE}\n".encode('utf-8'),
+            f"committer {author} <{email}> {epoch} {TIMEZONE}\n".encode('utf-8'),
+            f"data {len(message)}\n".encode('ascii') + message + b"\n"
+        ]
+        if branch != 'main' and branch not in started:
+            lines.append(f"from :{main_tip}\n".encode('ascii'))
+        lines.append(f"M 644 inline journal.txt\ndata {len(content)}\n".encode('ascii') + content + b"\n")
+        started.add(branch)
+        if branch == 'main':
+            main_tip = mark
+        yield b''.join(lines)
+
+
+def generate_repository(path, commits=10000, authors=5, branches=3, ticket_density=0.8,
+                        tickets=200, days=250, start=date(2023, 1, 2), seed=0):
+    """
+    Crée un dépôt Git synthétique.
+
+    Args:
+        path: Le répertoire du dépôt (créé s'il n'existe pas, il doit être vide).
+        commits: Le nombre de commits.
+        authors: Le nombre d'auteurs.
+        branches: Le nombre de branches (main comprise).
+        ticket_density: La proportion de commits mentionnant un ticket (0 à 1).
+        tickets: Le nombre de tickets distincts par projet.
+        days: Le nombre de jours ouvrés couverts.
+        start: Le premier jour (date).
+        seed: La graine du générateur aléatoire.
+
+    Returns:
+        Le chemin du dépôt.
+
+    Raises:
+        subprocess.CalledProcessError: Si git init ou git fast-import échoue.
+    """
+    os.makedirs(path, exist_ok=True)
+    subprocess.run(['git', 'init', '--quiet', '--initial-branch=main', path], check=True)
+    process = subprocess.Popen(['git', '-C', path, 'fast-import', '--quiet'], stdin=subprocess.PIPE)
+    try:
+        stream = iter_commits(commits, authors, days, ticket_density, tickets, start, seed)
+        for block in fast_import_stream(stream, max(1, branches), seed):
+            process.stdin.write(block)
+        process.stdin.close()
+    finally:
+        returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, 'git fast-import')
+    subprocess.run(['git', '-C', path, 'checkout', '--quiet', 'main'], check=True)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un dépôt Git synthétique pour les benchmarks.")
+    parser.add_argument('path', help="répertoire du dépôt à créer")
+    parser.add_argument('--commits', type=int, default=10000, help="nombre de commits (par défaut 10000)")
+    parser.add_argument('--authors', type=int, default=5, help="nombre d'auteurs (par défaut 5)")
+    parser.add_argument('--branches', type=int, default=3, help="nombre de branches, main comprise (par défaut 3)")
+    parser.add_argument('--ticket-density', type=float, default=0.8,
+                        help="proportion de commits mentionnant un ticket (par défaut 0.8)")
+    parser.add_argument('--tickets', type=int, default=200, help="tickets distincts par projet (par défaut 200)")
+    parser.add_argument('--days', type=int, default=250, help="jours ouvrés couverts (par défaut 250)")
+    parser.add_argument('--seed', type=int, default=0, help="graine du générateur (par défaut 0)")
+    args = parser.parse_args()
+
+    generate_repository(args.path, args.commits, args.authors, args.branches, args.ticket_density,
+                        args.tickets, args.days, seed=args.seed)
+    print(args.path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
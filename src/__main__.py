@@ -0,0 +1,7 @@
+"""Exécution de la ligne de commande : python -m src."""
+import sys
+
+from src.cli import main
+
+
+sys.exit(main())
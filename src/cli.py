@@ -0,0 +1,318 @@
+"""
+Interface en ligne de commande : extraction des logs Git, analyse des tickets et export des
+feuilles de temps, sans interface graphique (utilisable depuis cron, sur un serveur sans écran).
+
+Usage :
+    python -m src extract
+    python -m src analyze --from 2024-01-01 --to 2024-01-31 --author "Jean Dupont"
+    python -m src export --from 2024-01-01 --to 2024-01-31 --format xml --output janvier.xml
+    python -m src batch --from 2024-01-01 --to 2024-01-31 --format json --format xml
+    python -m src tickets --from 2024-01-01 --to 2024-03-31 --ticket PROJ-123
+    python -m src rollup --level week --by ticket --from 2024-01-01 --to 2024-03-31
+    python -m src export-logs --from 2024-01-01 --to 2024-01-31 --output janvier.log
+    python -m src import-logs git_logs.csv
+    python -m src --profile --trace trace.json analyze
+
+Ce module n'importe jamais PyQt5 ; les modules métier lourds (pandas) ne sont importés que par
+la sous-commande qui en a besoin.
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+from src.core.rollup_store import ROLLUP_DIMENSIONS, ROLLUP_LEVELS
+from src.utils.profiling import profiler
+
+
+ALL_AUTHORS = "Tous"
+
+
+def parse_date(value):
+    """Convertit une date 'AAAA-MM-JJ' passée en argument."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide : {value} (format attendu : AAAA-MM-JJ)")
+
+
+def load_config(args):
+    """Charge la configuration indiquée par --config."""
+    from src.utils.config import Config
+    return Config(args.config, save_delay=0)
+
+
+def analyze(config, args):
+    """
+    Charge les logs Git de la période et analyse les tickets.
+
+    Args:
+        config: L'objet de configuration.
+        args: Les arguments de la ligne de commande (période, auteur, magasin).
+
+    Returns:
+        Le dictionnaire des durées par journée.
+    """
+    from src.core.analysis_cache import DayResultCache
+    from src.core.git_processor import GitProcessor
+    from src.core.ticket_analyzer import TicketAnalyzer
+
+    git_processor = GitProcessor(config)
+    ticket_analyzer = TicketAnalyzer(config)
+    df, _ = git_processor.load_commits(args.date_from, args.date_to, store_path=args.store)
+    if args.author != ALL_AUTHORS:
+        df = df[df['author'] == args.author]
+    # Avec un cache d'analyse sur disque, seules les journées modifiées depuis le dernier appel sont analysées
+    day_cache = DayResultCache(directory=config.get_analysis_cache_dir() or None)
+    return ticket_analyzer.analyze_days(df, day_cache)
+
+
+def format_duration(duree):
+    """Formate une durée en HH:MM (jamais négative)."""
+    seconds = max(duree.total_seconds(), 0)
+    return f"{int(seconds // 3600):02d}:{int((seconds % 3600) // 60):02d}"
+
+
+def command_extract(args):
+    """Sous-commande extract : extrait les logs Git des dépôts configurés."""
+    from src.core.git_processor import GitProcessor
+
+    config = load_config(args)
+    git_processor = GitProcessor(config)
+    store_path = git_processor.extract_git_logs(store_path=args.store, offline=args.offline or None)
+    print(f"Logs Git extraits dans {store_path}")
+    # Les tables d'agrégats déjà calculées suivent les nouveaux commits
+    rollups = git_processor.get_rollup_store(store_path)
+    if rollups.exists():
+        from src.core.ticket_analyzer import TicketAnalyzer
+        months = rollups.update(git_processor, TicketAnalyzer(config))
+        if months:
+            print(f"Agrégats mis à jour : {', '.join(months)}")
+    for repo_path, error in git_processor.get_fetch_errors():
+        print(f"Avertissement : {repo_path} non mis à jour : {error}", file=sys.stderr)
+    failed = git_processor.get_failed_repositories()
+    for result in failed:
+        print(f"Échec : {result['repository']} : {result['error']}", file=sys.stderr)
+    return 2 if failed else 0
+
+
+def command_analyze(args):
+    """Sous-commande analyze : affiche les tickets et les durées par journée."""
+    config = load_config(args)
+    durees_par_journee = analyze(config, args)
+    for journee, tickets in sorted(durees_par_journee.items()):
+        print(journee)
+        for t in tickets:
+            debut = t['debut'].strftime('%H:%M')
+            fin = t['fin'].strftime('%H:%M')
+            erreur = " (erreur)" if t.get('erreur') else ""
+            print(f"  {t['ticket']}\t{format_duration(t['duree'])}\t{debut}-{fin}\t{t['message']}{erreur}")
+    return 0
+
+
+def command_tickets(args):
+    """
+    Sous-commande tickets : temps passé par ticket (classement, ou historique d'un ticket).
+
+    L'index des tickets est tiré des créneaux enregistrés avec les tables d'agrégats, mises à jour
+    au préalable (seuls les mois modifiés du magasin sont réanalysés) : chaque auteur est analysé
+    séparément, comme pour la sous-commande rollup.
+    """
+    from src.core.git_processor import GitProcessor
+    from src.core.ticket_analyzer import TicketAnalyzer
+
+    config = load_config(args)
+    git_processor = GitProcessor(config)
+    rollups = git_processor.get_rollup_store(args.store)
+    rollups.update(git_processor, TicketAnalyzer(config))
+    author = args.author if args.author != ALL_AUTHORS else None
+    index = rollups.ticket_index(args.date_from, args.date_to, author=author)
+    if args.ticket:
+        if args.ticket not in index:
+            print(f"Aucun créneau pour {args.ticket} sur la période", file=sys.stderr)
+            return 1
+        for journee, duree in index.history(args.ticket):
+            print(f"{journee}\t{format_duration(duree)}")
+        for (author, repo), duree in sorted(index.contributors(args.ticket).items(), key=lambda item: item[1], reverse=True):
+            print(f"  {author or '-'}\t{repo or '-'}\t{format_duration(duree)}")
+        print(f"Total\t{format_duration(index.total(args.ticket))}")
+    else:
+        for ticket, duree in index.top(args.top):
+            print(f"{ticket}\t{format_duration(duree)}")
+    return 0
+
+
+def command_rollup(args):
+    """Sous-commande rollup : temps passé par semaine ou par mois, par auteur, ticket ou dépôt."""
+    from src.core.git_processor import GitProcessor
+    from src.core.ticket_analyzer import TicketAnalyzer
+
+    config = load_config(args)
+    git_processor = GitProcessor(config)
+    rollups = git_processor.get_rollup_store(args.store)
+    rollups.update(git_processor, TicketAnalyzer(config))
+    author = args.author if args.author != ALL_AUTHORS else None
+    for period, value, duree in rollups.totals(args.level, args.by, args.date_from, args.date_to,
+                                               author=author, ticket=args.ticket, repo=args.repo):
+        print(f"{period}\t{value}\t{format_duration(duree)}")
+    return 0
+
+
+def command_export(args):
+    """Sous-commande export : génère la feuille de temps au format demandé."""
+    from src.core.timesheet_generator import TimesheetGenerator
+
+    config = load_config(args)
+    durees_par_journee = analyze(config, args)
+    author = args.author if args.author != ALL_AUTHORS else None
+    output_file = TimesheetGenerator(config).generate(args.format, durees_par_journee, args.output, author=author)
+    print(output_file)
+    return 0
+
+
+def command_export_logs(args):
+    """Sous-commande export-logs : écrit les commits du magasin au format d'échange (séparateur US)."""
+    from src.core.git_processor import GitProcessor
+
+    config = load_config(args)
+    git_processor = GitProcessor(config)
+    git_processor.migrate_legacy_logs(args.store)
+    print(git_processor.export_git_logs(args.output, args.date_from, args.date_to, store_path=args.store))
+    return 0
+
+
+def command_import_logs(args):
+    """Sous-commande import-logs : importe un fichier de logs (format d'échange ou ancien CSV) dans le magasin."""
+    from src.core.git_processor import GitProcessor
+
+    config = load_config(args)
+    count = GitProcessor(config).import_logs_file(args.logs_file, store_path=args.store)
+    print(f"{count} commits importés depuis {args.logs_file}")
+    return 0
+
+
+def command_batch(args):
+    """Sous-commande batch : génère en une passe les feuilles de temps de plusieurs auteurs."""
+    from src.core.batch_generator import BatchGenerator
+
+    config = load_config(args)
+    output_files = BatchGenerator(config).generate(
+        args.date_from,
+        args.date_to,
+        authors=args.authors,
+        formats=args.formats or ['json'],
+        combined=args.combined,
+        store_path=args.store
+    )
+    for output_file in output_files:
+        print(output_file)
+    return 0
+
+
+def add_period_arguments(parser, author=True):
+    """Ajoute les options de période (30 derniers jours par défaut, comme l'interface) et d'auteur."""
+    today = date.today()
+    parser.add_argument('--from', dest='date_from', type=parse_date, default=today - timedelta(days=30),
+                        help="premier jour inclus (AAAA-MM-JJ, par défaut il y a 30 jours)")
+    parser.add_argument('--to', dest='date_to', type=parse_date, default=today,
+                        help="dernier jour inclus (AAAA-MM-JJ, par défaut aujourd'hui)")
+    if author:
+        parser.add_argument('--author', default=ALL_AUTHORS,
+                            help="auteur des commits (par défaut tous les auteurs configurés)")
+
+
+def export_formats():
+    """Retourne les formats d'export connus (documentaires puis à plat)."""
+    from src.core.exporters import FLAT_EXPORTERS
+    from src.core.timesheet_generator import DOCUMENT_FORMATS
+    return list(DOCUMENT_FORMATS) + list(FLAT_EXPORTERS)
+
+
+def build_parser():
+    """Construit l'analyseur des arguments de la ligne de commande."""
+    formats = export_formats()
+    parser = argparse.ArgumentParser(prog='python -m src', description="Générateur de feuilles de temps à partir des logs Git.")
+    parser.add_argument('--config', default='config.yaml', help="fichier de configuration (par défaut config.yaml)")
+    parser.add_argument('--store', default=None, help="répertoire du magasin de commits (par défaut git_store)")
+    parser.add_argument('--profile', action='store_true', help="afficher la durée de chaque étape sur la sortie d'erreur")
+    parser.add_argument('--trace', default=None,
+                        help="écrire la trace des étapes dans ce fichier (format Chrome Trace Event, implique --profile)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    extract_parser = subparsers.add_parser('extract', help="extraire les logs Git des dépôts configurés")
+    extract_parser.add_argument('--offline', action='store_true',
+                                help="lire les références existantes sans git fetch (par défaut selon la configuration)")
+    extract_parser.set_defaults(handler=command_extract)
+
+    analyze_parser = subparsers.add_parser('analyze', help="afficher les tickets et les durées par journée")
+    add_period_arguments(analyze_parser)
+    analyze_parser.set_defaults(handler=command_analyze)
+
+    tickets_parser = subparsers.add_parser('tickets', help="afficher le temps passé par ticket")
+    add_period_arguments(tickets_parser)
+    tickets_parser.add_argument('--ticket', default=None, help="détailler ce ticket (historique, auteurs et dépôts)")
+    tickets_parser.add_argument('--top', type=int, default=20, help="nombre de tickets du classement (par défaut 20)")
+    tickets_parser.set_defaults(handler=command_tickets)
+
+    rollup_parser = subparsers.add_parser('rollup', help="afficher le temps passé par semaine ou par mois (agrégats incrémentaux)")
+    add_period_arguments(rollup_parser)
+    rollup_parser.add_argument('--level', choices=ROLLUP_LEVELS, default='month', help="période d'agrégation (par défaut month)")
+    rollup_parser.add_argument('--by', choices=ROLLUP_DIMENSIONS, default='author', help="regroupement (par défaut author)")
+    rollup_parser.add_argument('--ticket', default=None, help="ne compter que ce ticket")
+    rollup_parser.add_argument('--repo', default=None, help="ne compter que ce dépôt")
+    rollup_parser.set_defaults(handler=command_rollup)
+
+    export_parser = subparsers.add_parser('export', help="générer la feuille de temps (JSON, XML, NDJSON, CSV ou Parquet)")
+    add_period_arguments(export_parser)
+    export_parser.add_argument('--format', choices=formats, default='json', help="format du fichier (par défaut json)")
+    export_parser.add_argument('--output', default=None, help="fichier de sortie (par défaut dans le dossier d'exportation)")
+    export_parser.set_defaults(handler=command_export)
+
+    export_logs_parser = subparsers.add_parser('export-logs', help="écrire les commits du magasin dans un fichier de logs (format d'échange)")
+    add_period_arguments(export_logs_parser, author=False)
+    export_logs_parser.add_argument('--output', default=None, help="fichier de sortie (par défaut git_logs.log)")
+    export_logs_parser.set_defaults(handler=command_export_logs)
+
+    import_logs_parser = subparsers.add_parser('import-logs', help="importer un fichier de logs (format d'échange ou ancien git_logs.csv)")
+    import_logs_parser.add_argument('logs_file', help="le fichier de logs à importer")
+    import_logs_parser.set_defaults(handler=command_import_logs)
+
+    batch_parser = subparsers.add_parser('batch', help="générer les feuilles de temps de toute l'équipe en une passe")
+    add_period_arguments(batch_parser, author=False)
+    batch_parser.add_argument('--authors', nargs='+', default=None,
+                              help="auteurs à traiter (par défaut tous ceux qui ont des commits sur la période)")
+    batch_parser.add_argument('--format', dest='formats', action='append', choices=formats,
+                              help="format des fichiers, répétable (par défaut json)")
+    batch_parser.add_argument('--combined', action='store_true', help="un seul fichier pour tous les auteurs")
+    batch_parser.set_defaults(handler=command_batch)
+    return parser
+
+
+def main(argv=None):
+    """Point d'entrée de la ligne de commande."""
+    args = build_parser().parse_args(argv)
+    if hasattr(args, 'date_from') and args.date_from > args.date_to:
+        print("La date de début doit précéder la date de fin", file=sys.stderr)
+        return 1
+    profiler.enabled = args.profile or bool(args.trace)
+    try:
+        return args.handler(args)
+    except Exception as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 1
+    finally:
+        if profiler.enabled:
+            report_profile(args.trace)
+
+
+def report_profile(trace_file=None):
+    """Affiche la durée des étapes sur la sortie d'erreur et écrit la trace demandée."""
+    print(profiler.report(), file=sys.stderr)
+    if trace_file:
+        try:
+            profiler.write_trace(trace_file)
+        except OSError as e:
+            print(f"Impossible d'écrire la trace {trace_file} : {e}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,301 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from datetime import date
+
+
+class AnalysisCache:
+    """
+    Cache des résultats d'analyse des tickets, avec éviction LRU et stockage disque optionnel.
+
+    Une entrée est identifiée par le périmètre de l'analyse (empreinte du magasin de commits,
+    motif de ticket, plages horaires, heures par jour, auteurs) et par sa période. Les journées
+    étant analysées indépendamment, une période incluse dans une période déjà en cache est servie
+    en ne gardant que ses journées. Les résultats mis en cache sont partagés : ils ne doivent pas
+    être modifiés.
+    """
+
+    def __init__(self, max_entries=16, directory=None):
+        """
+        Initialise le cache.
+
+        Args:
+            max_entries: Le nombre maximal d'entrées conservées en mémoire (et sur disque).
+            directory: Le répertoire du stockage disque, ou None pour un cache uniquement en mémoire.
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()  # (périmètre, début, fin) -> résultat
+
+    @staticmethod
+    def scope_key(**inputs):
+        """
+        Calcule la clé d'un périmètre d'analyse.
+
+        Args:
+            **inputs: Les paramètres qui influent sur le résultat (hors période), sérialisables en JSON.
+
+        Returns:
+            La clé du périmètre (hexadécimal).
+        """
+        data = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()[:20]
+
+    def get(self, scope, date_from, date_to):
+        """
+        Retourne le résultat d'une analyse déjà faite, ou None.
+
+        Args:
+            scope: La clé du périmètre (voir scope_key).
+            date_from: Premier jour inclus, ou None.
+            date_to: Dernier jour inclus, ou None.
+
+        Returns:
+            Le dictionnaire {journée: [tickets]} de la période, ou None s'il n'est pas en cache.
+        """
+        start, end = self._bounds(date_from, date_to)
+        key = (scope, start, end)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        # Période incluse dans une période en cache
+        for (entry_scope, entry_start, entry_end), result in reversed(self.entries.items()):
+            if entry_scope == scope and entry_start <= start and end <= entry_end:
+                self.entries.move_to_end((entry_scope, entry_start, entry_end))
+                return self._slice(result, start, end)
+
+        result = self._load(scope, start, end)
+        if result is not None:
+            self._remember((scope, start, end), result)
+        return result
+
+    def put(self, scope, date_from, date_to, result):
+        """
+        Met en cache le résultat d'une analyse.
+
+        Args:
+            scope: La clé du périmètre (voir scope_key).
+            date_from: Premier jour inclus, ou None.
+            date_to: Dernier jour inclus, ou None.
+            result: Le dictionnaire {journée: [tickets]} de la période.
+        """
+        start, end = self._bounds(date_from, date_to)
+        self._remember((scope, start, end), result)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._file(scope, start, end)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._prune_files()
+
+    def invalidate(self, predicate=None):
+        """
+        Supprime des entrées du cache.
+
+        Args:
+            predicate: Une fonction (périmètre) -> bool désignant les périmètres à supprimer,
+                ou None pour vider le cache.
+        """
+        for key in list(self.entries):
+            if predicate is None or predicate(key[0]):
+                del self.entries[key]
+        for name in self._files():
+            if predicate is None or predicate(name.split('_', 1)[0]):
+                self._remove_file(name)
+
+    def _bounds(self, date_from, date_to):
+        """Remplace les bornes ouvertes par date.min et date.max."""
+        return date_from or date.min, date_to or date.max
+
+    def _slice(self, result, start, end):
+        """Retourne les journées de result comprises dans [start, end]."""
+        return {journee: tickets for journee, tickets in result.items() if start <= journee <= end}
+
+    def _remember(self, key, result):
+        """Ajoute une entrée en mémoire et évince les moins récemment utilisées."""
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _file(self, scope, start, end):
+        """Retourne le chemin du fichier d'une entrée sur disque."""
+        return os.path.join(self.directory, f"{scope}_{start.isoformat()}_{end.isoformat()}.pkl")
+
+    def _files(self):
+        """Retourne les noms des fichiers du stockage disque."""
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        return [name for name in os.listdir(self.directory) if name.endswith('.pkl')]
+
+    def _remove_file(self, name):
+        """Supprime un fichier du stockage disque (s'il existe encore)."""
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def _load(self, scope, start, end):
+        """Charge depuis le disque une entrée dont la période contient [start, end], ou None."""
+        for name in self._files():
+            entry_scope, entry_start, entry_end = name[:-len('.pkl')].split('_')
+            if entry_scope != scope:
+                continue
+            entry_start = date.fromisoformat(entry_start)
+            entry_end = date.fromisoformat(entry_end)
+            if not (entry_start <= start and end <= entry_end):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, 'rb') as f:
+                    result = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                self._remove_file(name)
+                continue
+            os.utime(path)  # Marque l'entrée comme récemment utilisée
+            return result if (entry_start, entry_end) == (start, end) else self._slice(result, start, end)
+        return None
+
+    def _prune_files(self):
+        """Limite le stockage disque à max_entries fichiers, en supprimant les plus anciens."""
+        names = self._files()
+        if len(names) <= self.max_entries:
+            return
+        names.sort(key=lambda name: os.path.getmtime(os.path.join(self.directory, name)))
+        for name in names[:len(names) - self.max_entries]:
+            self._remove_file(name)
+
+
+class DayResultCache:
+    """
+    Résultats d'analyse par journée, indexés par l'empreinte de la journée.
+
+    L'empreinte d'une journée (voir TicketAnalyzer.day_digests) couvre ses commits et les
+    paramètres qui influent sur son analyse : une journée dont l'empreinte est connue n'est pas
+    réanalysée, même si le reste de la période (ou le magasin) a changé. Les journées non
+    travaillées sont mémorisées avec le résultat None. Les résultats mis en cache sont
+    partagés : ils ne doivent pas être modifiés.
+
+    Sur disque, le cache est un journal : chaque mise à jour y ajoute un lot (les journées
+    analysées seulement), relu dans l'ordre au chargement. Le journal n'est réécrit, compacté,
+    que lorsqu'il contient plus de COMPACT_RATIO fois max_days journées.
+    """
+
+    # Pas d'extension .pkl : le fichier peut partager le répertoire d'un AnalysisCache
+    FILE = 'days.cache'
+
+    # Taille du journal (en journées, relativement à max_days) au-delà de laquelle il est compacté
+    COMPACT_RATIO = 2
+
+    def __init__(self, max_days=20000, directory=None):
+        """
+        Initialise le cache.
+
+        Args:
+            max_days: Le nombre maximal de journées conservées.
+            directory: Le répertoire du stockage disque, ou None pour un cache uniquement en mémoire.
+        """
+        self.max_days = max_days
+        self.directory = directory
+        self.entries = OrderedDict()  # empreinte -> [tickets] de la journée, ou None
+        self._loaded = False
+        self._journal_days = 0  # Journées écrites dans le journal depuis sa dernière réécriture
+
+    def _path(self):
+        """Retourne le chemin du journal."""
+        return os.path.join(self.directory, self.FILE)
+
+    def _load(self):
+        """Charge les journées du journal, au premier accès (un lot illisible et la suite sont ignorés)."""
+        self._loaded = True
+        if not self.directory:
+            return
+        entries = OrderedDict()
+        try:
+            with open(self._path(), 'rb') as f:
+                while True:
+                    try:
+                        batch = pickle.load(f)
+                    except EOFError:
+                        break
+                    # Ancien format : tout le cache en un seul dictionnaire
+                    for digest, tickets in (batch.items() if isinstance(batch, dict) else batch):
+                        entries[digest] = tickets
+                        entries.move_to_end(digest)
+                        self._journal_days += 1
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, ValueError, TypeError):
+            # Journal tronqué ou illisible : il sera réécrit à la prochaine mise à jour
+            self._journal_days = self.COMPACT_RATIO * self.max_days
+        entries.update(self.entries)
+        self.entries = entries
+        self._evict()
+
+    def _evict(self):
+        """Évince les journées les moins récemment utilisées au-delà de max_days."""
+        while len(self.entries) > self.max_days:
+            self.entries.popitem(last=False)
+
+    def lookup(self, digests):
+        """
+        Sépare les journées déjà analysées des journées à analyser.
+
+        Args:
+            digests: Le dictionnaire {journée: empreinte}.
+
+        Returns:
+            Un tuple (résultats connus {journée: [tickets] ou None}, journées à analyser).
+        """
+        if not self._loaded:
+            self._load()
+        known = {}
+        missing = []
+        for journee, digest in digests.items():
+            if digest in self.entries:
+                self.entries.move_to_end(digest)
+                known[journee] = self.entries[digest]
+            else:
+                missing.append(journee)
+        return known, missing
+
+    def update(self, digests, durees_par_journee):
+        """
+        Mémorise les résultats de journées analysées (une seule écriture disque par appel).
+
+        Args:
+            digests: Le dictionnaire {journée: empreinte} des journées analysées.
+            durees_par_journee: Leur résultat {journée: [tickets]} (une journée absente n'est pas travaillée).
+        """
+        if not digests:
+            return
+        if not self._loaded:
+            self._load()
+        batch = [(digest, durees_par_journee.get(journee)) for journee, digest in digests.items()]
+        for digest, tickets in batch:
+            self.entries[digest] = tickets
+            self.entries.move_to_end(digest)
+        self._evict()
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self._journal_days + len(batch) > self.COMPACT_RATIO * self.max_days:
+            self._compact()
+            return
+        with open(self._path(), 'ab') as f:
+            pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._journal_days += len(batch)
+
+    def _compact(self):
+        """Réécrit le journal en un seul lot des journées conservées, dans l'ordre LRU."""
+        path = self._path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(list(self.entries.items()), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._journal_days = len(self.entries)
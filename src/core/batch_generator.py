@@ -0,0 +1,158 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.core.git_processor import GitProcessor, OperationCancelled
+from src.core.parallel_analysis import AnalysisSettings, pack_commits, slice_commits, unpack_commits
+from src.core.timesheet_generator import TimesheetGenerator
+
+
+# Nombre d'auteurs à partir duquel l'analyse est répartie sur plusieurs processus
+PROCESS_POOL_MIN_AUTHORS = 8
+
+
+def analyze_author(config, df, processes=None):
+    """
+    Analyse les commits d'un auteur (exécutable dans un processus de calcul).
+
+    Args:
+        config: L'objet de configuration.
+        df: Le DataFrame des commits de l'auteur.
+        processes: Le nombre de processus d'analyse des journées, par défaut celui de la configuration.
+
+    Returns:
+        Le dictionnaire des durées par journée.
+    """
+    from src.core.ticket_analyzer import TicketAnalyzer
+
+    ticket_analyzer = TicketAnalyzer(config)
+    durees_par_journee = ticket_analyzer.extract_tickets_from_dataframe(df, processes=processes)
+    return ticket_analyzer.adjust_durations(durees_par_journee)
+
+
+def analyze_packed_author(settings, chunk):
+    """
+    Analyse les commits compacts d'un auteur (exécuté dans un processus de calcul).
+
+    Args:
+        settings: Les paramètres d'analyse (AnalysisSettings).
+        chunk: Les commits compacts de l'auteur (voir parallel_analysis.slice_commits).
+
+    Returns:
+        Le dictionnaire des durées par journée.
+    """
+    # Les auteurs sont déjà répartis : pas de second pool par auteur
+    return analyze_author(settings, unpack_commits(chunk), processes=1)
+
+
+class BatchGenerator:
+    """Classe pour générer en une passe les feuilles de temps de plusieurs auteurs."""
+
+    def __init__(self, config):
+        """
+        Initialise le générateur par lot.
+
+        Args:
+            config: L'objet de configuration contenant les informations nécessaires.
+        """
+        self.config = config
+        self.git_processor = GitProcessor(config)
+        self.timesheet_generator = TimesheetGenerator(config)
+
+    def analyze(self, date_from, date_to, authors=None, store_path=None, progress=None, cancel_event=None):
+        """
+        Analyse les tickets de plusieurs auteurs à partir d'une seule lecture du magasin de commits.
+
+        Les commits de la période sont chargés une fois puis groupés par auteur. Au-delà de
+        PROCESS_POOL_MIN_AUTHORS auteurs, les analyses sont réparties sur un pool de processus
+        (max_workers de la configuration) : chaque processus reçoit les paramètres d'analyse et
+        les commits compacts de son auteur (voir parallel_analysis), pas la configuration ni
+        de DataFrame.
+
+        Args:
+            date_from: Premier jour inclus.
+            date_to: Dernier jour inclus.
+            authors: Les auteurs à traiter (par défaut, tous ceux qui ont des commits sur la période).
+            store_path: Le répertoire du magasin de commits.
+            progress: Fonction (étape, courant, total, message) signalant l'avancement, ou None.
+            cancel_event: Un threading.Event qui interrompt le lot lorsqu'il est positionné, ou None.
+
+        Returns:
+            Le dictionnaire {auteur: {jour: [tickets]}}, dans l'ordre des auteurs.
+
+        Raises:
+            OperationCancelled: Si le lot a été annulé.
+        """
+        progress = progress or (lambda *args: None)
+        progress('chargement', 0, 0, "Chargement des logs Git...")
+        df = self.git_processor.load_git_logs_dataframe(date_from, date_to, store_path=store_path)
+        groups = dict(tuple(df.groupby('author', sort=True)))
+        authors = list(authors) if authors else list(groups)
+        empty = df.iloc[:0]
+
+        durees_par_auteur = {}
+        max_workers = self.config.get_max_workers()
+        if len(authors) >= PROCESS_POOL_MIN_AUTHORS and max_workers > 1:
+            # spawn : les processus ne dupliquent pas les threads (interface, pool Git) du parent
+            context = multiprocessing.get_context('spawn')
+            settings = AnalysisSettings(self.config)
+            # Commits groupés par auteur (ordre d'origine conservé) puis compactés une seule fois
+            ordered = df.sort_values(by=['author'], kind='stable')
+            packed = pack_commits(ordered)
+            positions = ordered.reset_index(drop=True).groupby('author', sort=False).indices
+            bounds = {author: (int(rows[0]), int(rows[-1]) + 1) for author, rows in positions.items()}
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+                futures = {
+                    executor.submit(analyze_packed_author, settings, slice_commits(packed, *bounds.get(author, (0, 0)))): author
+                    for author in authors
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    if cancel_event is not None and cancel_event.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        raise OperationCancelled("Génération annulée")
+                    author = futures[future]
+                    durees_par_auteur[author] = future.result()
+                    progress('analyse', done, len(authors), f"Analyse : {author}")
+            durees_par_auteur = {author: durees_par_auteur[author] for author in authors}
+        else:
+            for done, author in enumerate(authors, 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled("Génération annulée")
+                durees_par_auteur[author] = analyze_author(self.config, groups.get(author, empty))
+                progress('analyse', done, len(authors), f"Analyse : {author}")
+        return durees_par_auteur
+
+    def generate(self, date_from, date_to, authors=None, formats=('json',), combined=False,
+                 store_path=None, progress=None, cancel_event=None):
+        """
+        Génère les feuilles de temps de plusieurs auteurs en une passe.
+
+        Args:
+            date_from: Premier jour inclus.
+            date_to: Dernier jour inclus.
+            authors: Les auteurs à traiter (par défaut, tous ceux qui ont des commits sur la période).
+            formats: Les formats à générer (voir TimesheetGenerator.export_formats).
+            combined: True pour un fichier unique par format, False pour un fichier par auteur.
+            store_path: Le répertoire du magasin de commits.
+            progress: Fonction (étape, courant, total, message) signalant l'avancement, ou None.
+            cancel_event: Un threading.Event qui interrompt le lot lorsqu'il est positionné, ou None.
+
+        Returns:
+            La liste des fichiers générés.
+        """
+        progress = progress or (lambda *args: None)
+        durees_par_auteur = self.analyze(date_from, date_to, authors, store_path, progress, cancel_event)
+
+        output_files = []
+        if combined:
+            for export_format in formats:
+                output_files.append(self.timesheet_generator.generate_combined(export_format, durees_par_auteur))
+            return output_files
+
+        total = len(durees_par_auteur) * len(formats)
+        for author, durees_par_journee in durees_par_auteur.items():
+            for export_format in formats:
+                output_file = self.timesheet_generator.generate(export_format, durees_par_journee, author=author)
+                output_files.append(output_file)
+                progress('export', len(output_files), total, f"Export : {output_file}")
+        return output_files
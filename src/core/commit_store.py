@@ -0,0 +1,688 @@
+import json
+import os
+import shutil
+
+from src.core.dedup_index import DedupIndex, read_keys, write_keys
+
+
+class CommitStore:
+    """
+    Magasin de commits en colonnes, partitionné par mois.
+
+    Chaque partition est un répertoire contenant une colonne par fichier NumPy (.npy), lisible en
+    mémoire mappée : hash, date (datetime64 à la minute), codes d'auteur et de dépôt, et les
+    messages (octets UTF-8 concaténés + tableau d'offsets). Les lignes d'une partition sont triées
+    par date, ce qui permet de ne lire que la tranche demandée. Un manifeste JSON recense les
+    partitions et les dictionnaires d'auteurs et de dépôts.
+
+    Les commits ajoutés à un mois existant sont écrits dans un nouveau répertoire (un « lot »,
+    trié lui aussi) référencé par la partition, sans réécrire celle-ci ; au-delà de
+    MAX_PARTITION_RUNS lots, la partition est réécrite en un seul répertoire. À la lecture, les
+    lots d'un mois sont fusionnés dans l'ordre de la partition (date, dépôt, hash).
+
+    Un index de dédoublonnage (voir DedupIndex), persisté en segments dans le sous-répertoire
+    dedup, écarte à l'ingestion un commit déjà présent, quel que soit le dépôt (forks, miroirs)
+    ou la branche (cherry-picks en mode 'content'). Les clés des commits écartés sont mémorisées
+    par dépôt : si le dépôt qui les avait apportés les perd, seuls les dépôts qui les contiennent
+    encore sont à relire (voir sharing_repositories).
+
+    NumPy et pandas ne sont importés que par les méthodes qui lisent ou écrivent les partitions :
+    consulter le manifeste (exists, last_modified, fingerprint) reste instantané.
+    """
+
+    MANIFEST = 'manifest.json'
+    FORMAT_VERSION = 1
+    DEDUP_DIR = 'dedup'
+    # Nombre de segments de l'index de dédoublonnage au-delà duquel ils sont fusionnés
+    MAX_DEDUP_SEGMENTS = 16
+    # Nombre de lots d'une partition au-delà duquel elle est réécrite en un seul répertoire
+    MAX_PARTITION_RUNS = 8
+
+    def __init__(self, path, flush_rows=200000, dedup='hash'):
+        """
+        Initialise le magasin de commits.
+
+        Args:
+            path: Le répertoire du magasin.
+            flush_rows: Nombre de commits en attente au-delà duquel ils sont écrits dans les partitions.
+            dedup: Le mode de dédoublonnage à l'ingestion ('off', 'hash' ou 'content', voir DEDUP_MODES).
+        """
+        self.path = path
+        self.flush_rows = flush_rows
+        self.dedup = dedup
+        self.manifest = self._load_manifest()
+        self._author_codes = {author: code for code, author in enumerate(self.manifest['authors'])}
+        self._repository_codes = {repo: code for code, repo in enumerate(self.manifest['repositories'])}
+        self._obsolete_dirs = []
+        self._obsolete_files = []
+        # Index chargé au premier ajout ; rewrite : toutes les clés sont à réécrire en un segment
+        self._dedup_index = None
+        self._dedup_rewrite = False
+        self.duplicates = 0  # Doublons écartés par le dernier append()
+        self.removed_keys = []  # Clés des commits supprimés par le dernier remove_repository()
+        # Dépôt -> clés de ses commits écartés comme doublons ; unknown : dépôts dont ces clés
+        # ne sont pas connues (index reconstruit) ; dirty : dépôts dont les clés sont à réécrire
+        self._shared = {}
+        self._shared_unknown = set()
+        self._shared_dirty = set()
+
+    def _empty_manifest(self):
+        """Retourne le manifeste d'un magasin vide."""
+        return {
+            'format': self.FORMAT_VERSION,
+            'version': 0,
+            'authors': [],
+            'repositories': [],
+            'partitions': {}
+        }
+
+    def _load_manifest(self):
+        """Charge le manifeste (vide si le magasin n'existe pas encore)."""
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            return self._empty_manifest()
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != self.FORMAT_VERSION:
+            return self._empty_manifest()
+        return manifest
+
+    def exists(self):
+        """Indique si le magasin a déjà été écrit."""
+        return os.path.exists(os.path.join(self.path, self.MANIFEST))
+
+    def last_modified(self):
+        """Retourne l'horodatage (secondes epoch) de la dernière écriture du magasin, ou None."""
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
+        return os.path.getmtime(manifest_path)
+
+    def fingerprint(self):
+        """
+        Retourne l'empreinte du contenu du magasin : elle change à chaque sauvegarde.
+
+        Returns:
+            Une chaîne (chemin, version du manifeste, date de modification).
+        """
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        mtime = os.stat(manifest_path).st_mtime_ns if os.path.exists(manifest_path) else 0
+        return f"{os.path.abspath(self.path)}:{self.manifest['version']}:{mtime}"
+
+    def row_count(self):
+        """Retourne le nombre total de commits du magasin."""
+        return sum(partition['rows'] for partition in self.manifest['partitions'].values())
+
+    def partition_dirs(self, partition):
+        """Retourne les répertoires d'une partition : le sien, puis ceux de ses lots."""
+        return [partition['dir']] + [run['dir'] for run in partition.get('runs', [])]
+
+    def partition_versions(self):
+        """
+        Retourne la version de chaque partition : elle change à chaque écriture dans le mois.
+
+        Returns:
+            Le dictionnaire {mois: répertoires de la partition, séparés par '+'}.
+        """
+        return {month: '+'.join(self.partition_dirs(partition)) for month, partition in self.manifest['partitions'].items()}
+
+    def save(self):
+        """Écrit le manifeste de façon atomique puis supprime les partitions remplacées."""
+        os.makedirs(self.path, exist_ok=True)
+        self.manifest['version'] += 1
+        self._save_dedup_index()
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+        for directory in self._obsolete_dirs:
+            shutil.rmtree(os.path.join(self.path, directory), ignore_errors=True)
+        for file_name in self._obsolete_files:
+            try:
+                os.remove(os.path.join(self.path, file_name))
+            except OSError:
+                pass
+        self._obsolete_dirs = []
+        self._obsolete_files = []
+
+    def clear(self):
+        """Vide le magasin (les partitions sont supprimées à la prochaine sauvegarde)."""
+        for partition in self.manifest['partitions'].values():
+            self._obsolete_dirs.extend(self.partition_dirs(partition))
+        meta = self.manifest.get('dedup') or {}
+        self._obsolete_files.extend(meta.get('segments', []))
+        self._obsolete_files.extend(meta.get('shared', {}).values())
+        version = self.manifest['version']
+        self.manifest = self._empty_manifest()
+        self.manifest['version'] = version
+        self._author_codes = {}
+        self._repository_codes = {}
+        self._dedup_index = None
+        self._shared = {}
+        self._shared_unknown = set()
+        self._shared_dirty = set()
+
+    def get_dedup_index(self):
+        """
+        Retourne l'index de dédoublonnage, chargé depuis ses segments au premier appel.
+
+        L'index est reconstruit à partir des partitions s'il n'existe pas encore (magasin antérieur)
+        ou s'il a été construit pour un autre mode.
+
+        Returns:
+            Le DedupIndex, ou None si le dédoublonnage est désactivé.
+        """
+        if self.dedup == 'off':
+            return None
+        if self._dedup_index is None:
+            index = DedupIndex(self.dedup)
+            meta = self.manifest.get('dedup') or {}
+            segments = [os.path.join(self.path, segment) for segment in meta.get('segments', [])]
+            shared = meta.get('shared')
+            if meta.get('mode') == self.dedup and all(os.path.exists(segment) for segment in segments):
+                for segment in segments:
+                    index.load_segment(segment)
+                if shared is not None and all(os.path.exists(os.path.join(self.path, f)) for f in shared.values()):
+                    self._shared = {repo: set(read_keys(os.path.join(self.path, f))) for repo, f in shared.items()}
+                    self._shared_unknown = set(meta.get('unknown', []))
+                else:
+                    self._shared_unknown = set(self.manifest['repositories'])
+                    self._shared_dirty = set(shared or {})
+            else:
+                for partition in self.manifest['partitions'].values():
+                    for directory in self.partition_dirs(partition):
+                        for keys in self._iter_partition_keys(index, directory):
+                            index.keys.update(keys)
+                self._dedup_rewrite = True
+                # Les doublons écartés auparavant ne sont plus connus
+                self._shared_unknown = set(self.manifest['repositories'])
+                self._shared_dirty = set(shared or {})
+            self._dedup_index = index
+        return self._dedup_index
+
+    def _iter_partition_keys(self, index, directory, rows=None):
+        """
+        Produit les clés de dédoublonnage des commits d'une partition.
+
+        Args:
+            index: L'index (qui détermine les clés calculées).
+            directory: Le répertoire de la partition, relatif au magasin.
+            rows: Les indices des lignes concernées, ou None pour toutes.
+
+        Returns:
+            Un générateur de tuples de clés.
+        """
+        import numpy as np
+
+        columns, messages = self._read_partition(directory, mmap_mode='r')
+        indices = range(len(messages)) if rows is None else rows
+        hashes = columns['hash']
+        if index.mode != 'content':
+            for i in indices:
+                yield (index.hash_key(hashes[i].decode('ascii')),)
+            return
+        authors = self.manifest['authors']
+        author_codes = columns['author']
+        minutes = np.datetime_as_string(np.asarray(columns['date']), unit='m')
+        for i in indices:
+            yield index.commit_keys(
+                hashes[i].decode('ascii'),
+                authors[author_codes[i]],
+                minutes[i].replace('T', ' '),
+                messages[i].decode('utf-8')
+            )
+
+    def lost_keys(self, removed_keys):
+        """
+        Retourne, parmi des commits supprimés, ceux qui ne sont plus présents dans le magasin.
+
+        Args:
+            removed_keys: Les clés des commits supprimés (voir removed_keys).
+
+        Returns:
+            La liste des clés des commits dont aucune clé n'est plus dans l'index.
+        """
+        index = self.get_dedup_index()
+        if index is None:
+            return []
+        return [keys for keys in removed_keys if not any(key in index.keys for key in keys)]
+
+    def sharing_repositories(self, keys):
+        """
+        Retourne les dépôts dont des commits ont été écartés comme doublons de certains commits.
+
+        Ces dépôts contiennent peut-être encore des commits disparus du magasin : ils doivent
+        être relus entièrement pour les y ajouter de nouveau.
+
+        Args:
+            keys: Les clés des commits (voir lost_keys).
+
+        Returns:
+            La liste triée des dépôts concernés (y compris ceux dont les doublons ne sont pas connus).
+        """
+        if not keys or self.get_dedup_index() is None:
+            return []
+        wanted = {key for commit_keys in keys for key in commit_keys}
+        repositories = {repo for repo, shared in self._shared.items() if not shared.isdisjoint(wanted)}
+        return sorted(repositories | self._shared_unknown)
+
+    def _save_dedup_index(self):
+        """
+        Écrit les clés nouvelles de l'index dans un segment référencé par le manifeste, ou toutes
+        les clés en un seul segment après une suppression, une reconstruction ou au-delà de
+        MAX_DEDUP_SEGMENTS segments.
+        """
+        meta = self.manifest.get('dedup')
+        index = self._dedup_index
+        if self.dedup == 'off' or index is None:
+            if self.dedup == 'off' and meta:
+                # L'index n'est plus tenu à jour : il sera reconstruit s'il est réactivé
+                self._obsolete_files.extend(meta['segments'])
+                self._obsolete_files.extend(meta.get('shared', {}).values())
+                del self.manifest['dedup']
+            return
+        shared = dict(meta.get('shared', {})) if meta else {}
+        for repo_path in self._shared_dirty:
+            if repo_path in shared:
+                self._obsolete_files.append(shared.pop(repo_path))
+            if self._shared.get(repo_path):
+                shared[repo_path] = f"{self.DEDUP_DIR}/shared-{self.manifest['version']}-{self._repository_codes[repo_path]}.bin"
+                write_keys(os.path.join(self.path, shared[repo_path]), self._shared[repo_path])
+        self._shared_dirty = set()
+        segments = list(meta['segments']) if meta and not self._dedup_rewrite else []
+        segment = f"{self.DEDUP_DIR}/{self.manifest['version']}.bin"
+        if not segments or len(segments) >= self.MAX_DEDUP_SEGMENTS:
+            if meta:
+                self._obsolete_files.extend(meta['segments'])
+            index.write_segment(os.path.join(self.path, segment), complete=True)
+            segments = [segment]
+        elif index.pending:
+            index.write_segment(os.path.join(self.path, segment))
+            segments.append(segment)
+        self.manifest['dedup'] = {
+            'mode': self.dedup,
+            'segments': segments,
+            'shared': shared,
+            'unknown': sorted(self._shared_unknown)
+        }
+        self._dedup_rewrite = False
+
+    def _code(self, codes, values, value):
+        """Retourne le code d'une valeur dictionnaire, en l'ajoutant si nécessaire."""
+        code = codes.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            codes[value] = code
+        return code
+
+    def append(self, repo_path, records):
+        """
+        Ajoute des commits d'un dépôt au magasin.
+
+        Les commits sont lus par lots de flush_rows commits au plus. Les doublons d'un lot sont
+        écartés en bloc par l'index de dédoublonnage (même hash, ou même contenu en mode
+        'content'), leurs clés étant mémorisées pour ce dépôt ; sans index, un commit déjà présent
+        pour ce dépôt est écarté. Les commits restants sont regroupés par mois et ajoutés aux
+        partitions concernées (voir _merge). Le manifeste n'est écrit qu'à l'appel de save().
+
+        Args:
+            repo_path: Le chemin du dépôt d'origine des commits.
+            records: Un itérable de CommitRecord.
+
+        Returns:
+            Le nombre de commits effectivement ajoutés.
+        """
+        # Index chargé (ou reconstruit) avant d'enregistrer un nouveau dépôt : ses doublons seront connus
+        index = self.get_dedup_index()
+        repo_code = self._code(self._repository_codes, self.manifest['repositories'], repo_path)
+        batch = []
+        added = 0
+        self.duplicates = 0
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.flush_rows:
+                added += self._append_batch(repo_path, repo_code, index, batch)
+                batch = []
+        added += self._append_batch(repo_path, repo_code, index, batch)
+        return added
+
+    def _append_batch(self, repo_path, repo_code, index, records):
+        """
+        Dédoublonne un lot de commits d'un dépôt et l'ajoute aux partitions.
+
+        Returns:
+            Le nombre de commits ajoutés.
+        """
+        import numpy as np
+
+        if not records:
+            return 0
+        hashes = [record.hash for record in records]
+        dates = np.array([record.date for record in records], dtype='datetime64[m]')
+        authors = [record.author for record in records]
+        messages = [record.message for record in records]
+        rows = np.arange(len(records))
+        if index is not None:
+            key_columns = (index.hash_keys(hashes),)
+            if index.mode == 'content':
+                minutes = np.char.replace(np.datetime_as_string(dates, unit='m'), 'T', ' ').tolist()
+                key_columns += (index.content_keys(authors, minutes, messages),)
+            new = index.add_batch(key_columns)
+            if not new.all():
+                self.duplicates += int((~new).sum())
+                self._shared.setdefault(repo_path, set()).update(
+                    key for column in key_columns for key in column[~new].tolist()
+                )
+                self._shared_dirty.add(repo_path)
+                rows = np.flatnonzero(new)
+        if not len(rows):
+            return 0
+
+        author_codes = self._author_codes
+        author_values = self.manifest['authors']
+        columns = {
+            'hash': np.array([hashes[i].encode('ascii') for i in rows.tolist()], dtype=np.bytes_),
+            'date': dates[rows],
+            'author': np.array([self._code(author_codes, author_values, authors[i]) for i in rows.tolist()], dtype=np.int32),
+            'repo': np.full(len(rows), repo_code, dtype=np.int32)
+        }
+        encoded = [messages[i].encode('utf-8') for i in rows.tolist()]
+        return self._merge(columns, encoded, check_existing=index is None)
+
+    def _merge(self, columns, messages, check_existing=False):
+        """
+        Ajoute des commits aux partitions de leurs mois : un nouveau lot par mois, sans réécrire
+        les lignes déjà présentes (sauf au-delà de MAX_PARTITION_RUNS lots).
+
+        Args:
+            columns: Les colonnes {nom: tableau NumPy} des commits.
+            messages: La liste des messages en octets.
+            check_existing: True pour écarter les commits déjà présents (même dépôt, même hash) ;
+                inutile avec l'index de dédoublonnage, qui les a déjà écartés.
+
+        Returns:
+            Le nombre de commits ajoutés (hors doublons).
+        """
+        import numpy as np
+
+        added = 0
+        months = np.datetime_as_string(columns['date'].astype('datetime64[M]'))
+        for month in np.unique(months).tolist():
+            rows = np.flatnonzero(months == month)
+            partition = self.manifest['partitions'].get(month)
+            if check_existing:
+                # Écarter les commits déjà présents (même dépôt, même hash), dans le mois ou le lot
+                seen = set()
+                for directory in self.partition_dirs(partition) if partition else []:
+                    existing, _ = self._read_partition(directory, mmap_mode='r', messages=False)
+                    seen.update(zip(existing['repo'].tolist(), existing['hash'].tolist()))
+                keep = []
+                for i, key in zip(rows.tolist(), zip(columns['repo'][rows].tolist(), columns['hash'][rows].tolist())):
+                    if key not in seen:
+                        seen.add(key)
+                        keep.append(i)
+                rows = np.array(keep, dtype=np.intp)
+            if not len(rows):
+                continue
+            added += len(rows)
+            new = {name: values[rows] for name, values in columns.items()}
+            new_messages = [messages[i] for i in rows.tolist()]
+            if partition is None:
+                self._write_partition(month, new, new_messages)
+            elif len(partition.get('runs', [])) >= self.MAX_PARTITION_RUNS:
+                # Trop de lots : la partition est réécrite en un seul répertoire
+                existing, existing_messages = self._read_month(partition)
+                new = {name: np.concatenate([existing[name], values]) for name, values in new.items()}
+                self._write_partition(month, new, existing_messages + new_messages)
+            else:
+                self._append_run(month, new, new_messages)
+        return added
+
+    def remove_repository(self, repo_path):
+        """
+        Supprime du magasin tous les commits d'un dépôt.
+
+        Args:
+            repo_path: Le chemin du dépôt.
+
+        Returns:
+            Le nombre de commits supprimés.
+        """
+        import numpy as np
+
+        repo_code = self._repository_codes.get(repo_path)
+        if repo_code is None:
+            return 0
+        index = self.get_dedup_index()
+        removed = 0
+        self.removed_keys = []
+        if index is not None:
+            # Les doublons du dépôt seront de nouveau mémorisés s'il est relu
+            self._shared.pop(repo_path, None)
+            self._shared_unknown.discard(repo_path)
+            self._shared_dirty.add(repo_path)
+        for month, partition in list(self.manifest['partitions'].items()):
+            affected = False
+            for directory in self.partition_dirs(partition):
+                repos = np.load(os.path.join(self.path, directory, 'repo.npy'), mmap_mode='r')
+                removed_rows = np.flatnonzero(np.asarray(repos == repo_code))
+                if not len(removed_rows):
+                    continue
+                affected = True
+                if index is not None:
+                    # Les commits supprimés pourront être ingérés de nouveau (depuis un autre dépôt)
+                    for keys in self._iter_partition_keys(index, directory, removed_rows.tolist()):
+                        index.discard(keys)
+                        self.removed_keys.append(keys)
+                    self._dedup_rewrite = True
+            if not affected:
+                continue
+            columns, messages = self._read_month(partition)
+            keep = columns['repo'] != repo_code
+            removed += int((~keep).sum())
+            kept_indices = np.flatnonzero(keep)
+            columns = {name: values[kept_indices] for name, values in columns.items()}
+            self._write_partition(month, columns, [messages[i] for i in kept_indices.tolist()])
+        return removed
+
+    def _read_partition(self, directory, start=None, stop=None, mmap_mode=None, messages=True):
+        """
+        Lit les colonnes d'une partition ou d'un lot (éventuellement une tranche de lignes).
+
+        Args:
+            directory: Le répertoire de la partition, relatif au magasin.
+            start: Indice de la première ligne lue.
+            stop: Indice suivant la dernière ligne lue.
+            mmap_mode: 'r' pour lire les colonnes en mémoire mappée.
+            messages: False pour ne pas lire les messages (liste vide).
+
+        Returns:
+            Un tuple (colonnes {nom: tableau NumPy}, liste des messages en octets).
+        """
+        import numpy as np
+
+        partition_path = os.path.join(self.path, directory)
+        rows = slice(start, stop)
+        columns = {
+            name: np.load(os.path.join(partition_path, f'{name}.npy'), mmap_mode=mmap_mode)[rows]
+            for name in ('hash', 'date', 'author', 'repo')
+        }
+        if not messages:
+            return columns, []
+        offsets = np.load(os.path.join(partition_path, 'message_offsets.npy'), mmap_mode=mmap_mode)
+        offsets = np.asarray(offsets[slice(start, None if stop is None else stop + 1)])
+        blob_path = os.path.join(partition_path, 'message.bin')
+        messages = []
+        if len(offsets) > 1 and offsets[-1] > offsets[0]:
+            blob = np.memmap(blob_path, dtype=np.uint8, mode='r')
+            data = bytes(blob[offsets[0]:offsets[-1]])
+            relative = (offsets - offsets[0]).tolist()
+            messages = [data[relative[i]:relative[i + 1]] for i in range(len(relative) - 1)]
+        elif len(offsets) > 1:
+            messages = [b''] * (len(offsets) - 1)
+        return columns, messages
+
+    def _read_month(self, partition):
+        """
+        Lit toutes les lignes d'une partition et de ses lots.
+
+        Returns:
+            Un tuple (colonnes {nom: tableau NumPy}, liste des messages en octets).
+        """
+        import numpy as np
+
+        parts = [self._read_partition(directory) for directory in self.partition_dirs(partition)]
+        if len(parts) == 1:
+            return parts[0]
+        columns = {name: np.concatenate([part[0][name] for part in parts]) for name in parts[0][0]}
+        return columns, [message for part in parts for message in part[1]]
+
+    def _write_directory(self, month, columns, messages):
+        """
+        Écrit des lignes, triées par date, dans un nouveau répertoire de partition.
+
+        Returns:
+            Un tuple (répertoire relatif au magasin, colonnes triées).
+        """
+        import numpy as np
+
+        # Tri déterministe : date, puis dépôt, puis hash
+        order = np.lexsort((columns['hash'], columns['repo'], columns['date']))
+        columns = {name: np.ascontiguousarray(values[order]) for name, values in columns.items()}
+        messages = [messages[i] for i in order.tolist()]
+
+        generation = self.manifest['version'] + 1
+        directory = f'{month}.{generation}'
+        suffix = 0
+        while os.path.exists(os.path.join(self.path, directory)):
+            suffix += 1
+            directory = f'{month}.{generation}-{suffix}'
+        partition_path = os.path.join(self.path, directory)
+        os.makedirs(partition_path)
+
+        for name, values in columns.items():
+            np.save(os.path.join(partition_path, f'{name}.npy'), values)
+        offsets = np.zeros(len(messages) + 1, dtype=np.int64)
+        np.cumsum([len(message) for message in messages], out=offsets[1:])
+        np.save(os.path.join(partition_path, 'message_offsets.npy'), offsets)
+        with open(os.path.join(partition_path, 'message.bin'), 'wb') as f:
+            f.write(b''.join(messages))
+        return directory, columns
+
+    def _write_partition(self, month, columns, messages):
+        """
+        Écrit une nouvelle génération de partition, triée par date, et la référence dans le
+        manifeste ; l'ancienne partition et ses lots sont supprimés à la sauvegarde.
+
+        Args:
+            month: Le mois de la partition (AAAA-MM).
+            columns: Les colonnes {nom: tableau NumPy}.
+            messages: La liste des messages en octets.
+        """
+        previous = self.manifest['partitions'].pop(month, None)
+        if previous:
+            self._obsolete_dirs.extend(self.partition_dirs(previous))
+        if len(columns['date']) == 0:
+            return
+        directory, columns = self._write_directory(month, columns, messages)
+        self.manifest['partitions'][month] = {
+            'dir': directory,
+            'rows': len(messages),
+            'min': str(columns['date'][0]),
+            'max': str(columns['date'][-1])
+        }
+
+    def _append_run(self, month, columns, messages):
+        """
+        Ajoute des lignes à une partition existante dans un nouveau lot, sans la réécrire.
+
+        Args:
+            month: Le mois de la partition (AAAA-MM).
+            columns: Les colonnes {nom: tableau NumPy} des lignes ajoutées.
+            messages: La liste de leurs messages en octets.
+        """
+        partition = self.manifest['partitions'][month]
+        directory, columns = self._write_directory(month, columns, messages)
+        partition.setdefault('runs', []).append({'dir': directory, 'rows': len(messages)})
+        partition['rows'] += len(messages)
+        partition['min'] = min(partition['min'], str(columns['date'][0]))
+        partition['max'] = max(partition['max'], str(columns['date'][-1]))
+
+    def iter_dataframes(self, date_from=None, date_to=None):
+        """
+        Produit les commits d'une période, un DataFrame pandas par partition.
+
+        Seules les partitions qui chevauchent la période sont ouvertes, et seule la tranche de
+        lignes correspondante y est lue.
+
+        Args:
+            date_from: Premier jour inclus (date), ou None.
+            date_to: Dernier jour inclus (date), ou None.
+
+        Returns:
+            Un générateur de DataFrames avec les colonnes hash, author, date, message et repo.
+        """
+        import numpy as np
+        import pandas as pd
+
+        lower = np.datetime64(date_from, 'm') if date_from else None
+        # Borne exclusive calculée en NumPy : date.max + 1 jour déborderait en datetime
+        upper = (np.datetime64(date_to, 'D') + np.timedelta64(1, 'D')).astype('datetime64[m]') if date_to else None
+        month_from = date_from.strftime('%Y-%m') if date_from else None
+        month_to = date_to.strftime('%Y-%m') if date_to else None
+
+        authors = np.array(self.manifest['authors'], dtype=object)
+        repositories = np.array(self.manifest['repositories'], dtype=object)
+        for month in sorted(self.manifest['partitions']):
+            if (month_from and month < month_from) or (month_to and month > month_to):
+                continue
+            parts = []
+            for directory in self.partition_dirs(self.manifest['partitions'][month]):
+                dates = np.load(os.path.join(self.path, directory, 'date.npy'), mmap_mode='r')
+                start = int(np.searchsorted(dates, lower, side='left')) if lower is not None else 0
+                stop = int(np.searchsorted(dates, upper, side='left')) if upper is not None else len(dates)
+                if start < stop:
+                    parts.append(self._read_partition(directory, start, stop, mmap_mode='r'))
+            if not parts:
+                continue
+            columns, messages = parts[0]
+            if len(parts) > 1:
+                # Lots fusionnés dans l'ordre d'une partition réécrite : date, dépôt, hash
+                columns = {name: np.concatenate([np.asarray(part[0][name]) for part in parts]) for name in columns}
+                messages = [message for part in parts for message in part[1]]
+                order = np.lexsort((columns['hash'], columns['repo'], columns['date']))
+                columns = {name: values[order] for name, values in columns.items()}
+                messages = [messages[i] for i in order.tolist()]
+            yield pd.DataFrame({
+                'hash': [value.decode('ascii') for value in columns['hash'].tolist()],
+                'author': authors[np.asarray(columns['author'])],
+                'date': np.asarray(columns['date']).astype('datetime64[ns]'),
+                'message': [message.decode('utf-8') for message in messages],
+                'repo': repositories[np.asarray(columns['repo'])]
+            })
+
+    def load_dataframe(self, date_from=None, date_to=None):
+        """
+        Charge les commits d'une période dans un DataFrame pandas.
+
+        Args:
+            date_from: Premier jour inclus (date), ou None.
+            date_to: Dernier jour inclus (date), ou None.
+
+        Returns:
+            Un DataFrame avec les colonnes hash, author, date, message et repo.
+        """
+        import pandas as pd
+
+        frames = list(self.iter_dataframes(date_from, date_to))
+        if not frames:
+            return pd.DataFrame({
+                'hash': pd.Series(dtype=object),
+                'author': pd.Series(dtype=object),
+                'date': pd.Series(dtype='datetime64[ns]'),
+                'message': pd.Series(dtype=object),
+                'repo': pd.Series(dtype=object)
+            })
+        return pd.concat(frames, ignore_index=True)
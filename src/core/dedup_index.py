@@ -0,0 +1,225 @@
+import os
+import re
+from array import array
+from functools import lru_cache
+from hashlib import blake2b
+
+
+# Début d'un hash dont les 64 premiers bits servent de clé
+HEX_PREFIX = re.compile(r'[0-9a-fA-F]{16}')
+
+# Modes de dédoublonnage : aucun, par hash de commit, ou par hash et par contenu
+# (auteur, date à la minute, sujet : rattrape les cherry-picks et les commits rebasés)
+DEDUP_MODES = ('off', 'hash', 'content')
+
+
+def read_keys(path):
+    """Lit un fichier de clés de 64 bits (segment)."""
+    keys = array('Q')
+    with open(path, 'rb') as f:
+        keys.frombytes(f.read())
+    return keys
+
+
+def write_keys(path, keys):
+    """Écrit des clés de 64 bits dans un fichier (segment)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(array('Q', keys).tobytes())
+
+
+@lru_cache(maxsize=None)
+def hex_digit_table():
+    """
+    Retourne les tables de conversion des hashs en clés.
+
+    Returns:
+        Un tuple (valeur de chaque octet en chiffre hexadécimal, -1 s'il n'en est pas un ;
+        décalage de chacun des 16 premiers chiffres dans une clé de 64 bits).
+    """
+    import numpy as np
+
+    digits = np.full(256, -1, dtype=np.int16)
+    for value, char in enumerate(b'0123456789abcdef'):
+        digits[char] = value
+    for value, char in enumerate(b'ABCDEF', 10):
+        digits[char] = value
+    return digits, np.arange(60, -1, -4, dtype=np.uint64)
+
+
+class DedupIndex:
+    """
+    Index des commits déjà ingérés dans un magasin, pour écarter les doublons à l'ingestion.
+
+    Chaque commit est représenté par une ou deux clés de 64 bits : celle de son hash et, en mode
+    'content', l'empreinte BLAKE2b du triplet (auteur, date à la minute, sujet). Un commit
+    dont une clé est déjà connue est un doublon ; le test est un accès à un ensemble, en O(1).
+
+    L'index est persisté en segments binaires ajoutés à chaque sauvegarde (les clés nouvelles
+    seulement), ou réécrit en un seul segment (write_segment(complete=True)).
+    """
+
+    KEY_BYTES = 8
+
+    def __init__(self, mode='hash'):
+        """
+        Initialise un index vide.
+
+        Args:
+            mode: Le mode de dédoublonnage ('hash' ou 'content').
+        """
+        self.mode = mode
+        self.keys = set()
+        self.pending = array('Q')  # Clés ajoutées depuis la dernière écriture d'un segment
+
+    @classmethod
+    def digest(cls, text):
+        """Retourne l'empreinte de 64 bits d'un texte."""
+        return int.from_bytes(blake2b(text.encode('utf-8'), digest_size=cls.KEY_BYTES).digest(), 'little')
+
+    def hash_key(self, commit_hash):
+        """
+        Retourne la clé d'un hash de commit : ses 64 premiers bits s'il est complet (un hash SHA
+        est déjà uniformément réparti), sinon son empreinte.
+        """
+        if HEX_PREFIX.match(commit_hash):
+            return int(commit_hash[:16], 16)
+        return self.digest('h' + commit_hash)
+
+    def commit_keys(self, commit_hash, author=None, minute=None, subject=None):
+        """
+        Retourne les clés d'un commit.
+
+        Args:
+            commit_hash: Le hash du commit.
+            author: Le nom de l'auteur.
+            minute: La date du commit à la minute ('AAAA-MM-JJ HH:MM').
+            subject: Le sujet du commit.
+            (author, minute et subject ne servent qu'en mode 'content'.)
+
+        Returns:
+            Un tuple d'une ou deux clés.
+        """
+        if self.mode == 'content':
+            return (self.hash_key(commit_hash), self.digest(f'c{author}\x1f{minute}\x1f{subject}'))
+        return (self.hash_key(commit_hash),)
+
+    def hash_keys(self, hashes):
+        """
+        Retourne les clés de hashs de commits, calculées en bloc (mêmes valeurs que hash_key).
+
+        Args:
+            hashes: Les hashs des commits.
+
+        Returns:
+            Un tableau NumPy uint64.
+        """
+        import numpy as np
+
+        # 16 premiers caractères de chaque hash, convertis chiffre par chiffre (-1 : pas hexadécimal)
+        table, shifts = hex_digit_table()
+        raw = np.array([commit_hash.encode('utf-8') for commit_hash in hashes], dtype='S').astype('S16')
+        digits = table[raw.view(np.uint8).reshape(len(raw), 16)]
+        complete = (digits >= 0).all(axis=1)
+        keys = (digits.astype(np.uint64) << shifts).sum(axis=1, dtype=np.uint64)
+        keys[~complete] = 0
+        # Hash court ou non hexadécimal : son empreinte
+        for i in np.flatnonzero(~complete).tolist():
+            keys[i] = self.digest('h' + hashes[i])
+        return keys
+
+    def content_keys(self, authors, minutes, subjects):
+        """
+        Retourne les clés de contenu de commits (voir commit_keys).
+
+        Args:
+            authors: Les noms des auteurs.
+            minutes: Les dates des commits à la minute ('AAAA-MM-JJ HH:MM').
+            subjects: Les sujets des commits.
+
+        Returns:
+            Un tableau NumPy uint64.
+        """
+        import numpy as np
+
+        return np.fromiter(
+            (self.digest(f'c{author}\x1f{minute}\x1f{subject}') for author, minute, subject in zip(authors, minutes, subjects)),
+            dtype=np.uint64, count=len(authors)
+        )
+
+    def add_batch(self, key_columns):
+        """
+        Ajoute les clés d'un lot de commits ; le résultat est celui d'appels successifs à add.
+
+        Les clés déjà connues sont trouvées par une intersection d'ensembles ; seuls les commits
+        du lot qui partagent une clé entre eux sont examinés un par un, dans l'ordre.
+
+        Args:
+            key_columns: Les tableaux uint64 des clés du lot, de même longueur : les clés de hash,
+                puis en mode 'content' les clés de contenu.
+
+        Returns:
+            Un tableau booléen : True pour un commit nouveau, False pour un doublon.
+        """
+        import numpy as np
+
+        count = len(key_columns[0])
+        known = self.keys.intersection(key for column in key_columns for key in column.tolist())
+        new = np.ones(count, dtype=bool)
+        if known:
+            known = np.fromiter(known, dtype=np.uint64, count=len(known))
+            for column in key_columns:
+                new &= ~np.isin(column, known)
+
+        # Clés présentes plusieurs fois parmi les commits nouveaux : ordre du lot
+        candidates = np.concatenate([column[new] for column in key_columns])
+        values, counts = np.unique(candidates, return_counts=True)
+        repeated = values[counts > 1]
+        sequential = np.zeros(count, dtype=bool)
+        for column in key_columns:
+            sequential |= np.isin(column, repeated)
+        sequential &= new
+
+        direct = new & ~sequential
+        for column in key_columns:
+            self.keys.update(column[direct].tolist())
+            self.pending.extend(column[direct].tolist())
+        for i in np.flatnonzero(sequential).tolist():
+            new[i] = self.add(tuple(int(column[i]) for column in key_columns))
+        return new
+
+    def add(self, keys):
+        """
+        Ajoute les clés d'un commit s'il n'est pas déjà connu.
+
+        Args:
+            keys: Les clés du commit (voir commit_keys).
+
+        Returns:
+            True si le commit est nouveau, False si c'est un doublon.
+        """
+        for key in keys:
+            if key in self.keys:
+                return False
+        self.keys.update(keys)
+        self.pending.extend(keys)
+        return True
+
+    def discard(self, keys):
+        """Retire des clés (commits supprimés du magasin)."""
+        self.keys.difference_update(keys)
+
+    def load_segment(self, path):
+        """Ajoute à l'index les clés d'un segment."""
+        self.keys.update(read_keys(path))
+
+    def write_segment(self, path, complete=False):
+        """
+        Écrit un segment de clés ; les clés en attente sont ensuite oubliées.
+
+        Args:
+            path: Le fichier du segment.
+            complete: True pour écrire toutes les clés de l'index, False pour les clés en attente.
+        """
+        write_keys(path, self.keys if complete else self.pending)
+        self.pending = array('Q')
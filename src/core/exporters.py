@@ -0,0 +1,151 @@
+import csv
+import importlib.util
+import json
+from abc import ABC, abstractmethod
+
+
+# Colonnes des formats à plat : une ligne par créneau de ticket
+FLAT_COLUMNS = ['author', 'day', 'code', 'duration', 'start', 'end', 'message']
+
+
+def iter_flat_rows(timesheets):
+    """
+    Produit une ligne par créneau de ticket.
+
+    Args:
+        timesheets: Un itérable de (auteur, {jour: [tickets]}) ; l'auteur peut être vide.
+
+    Returns:
+        Un générateur de tuples dans l'ordre de FLAT_COLUMNS (durée en secondes).
+    """
+    for author, durees_par_journee in timesheets:
+        for journee, tickets in durees_par_journee.items():
+            day = str(journee)
+            for t in tickets:
+                yield (
+                    author or '',
+                    day,
+                    t['ticket'],
+                    t['duree'].total_seconds(),
+                    t['debut'].strftime('%H:%M'),
+                    t['fin'].strftime('%H:%M'),
+                    t['message']
+                )
+
+
+def iter_chunks(rows, size):
+    """Regroupe les lignes par paquets de size lignes."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class FlatExporter(ABC):
+    """
+    Exportateur à plat : écrit les créneaux de tickets par paquets de lignes.
+
+    Classe abstraite : chaque format définit write (et is_available s'il a des dépendances optionnelles).
+    """
+
+    extension = ''
+    label = ''
+
+    def __init__(self, chunk_rows=50000):
+        """
+        Initialise l'exportateur.
+
+        Args:
+            chunk_rows: Le nombre de lignes écrites à la fois.
+        """
+        self.chunk_rows = chunk_rows
+
+    @classmethod
+    def is_available(cls):
+        """Indique si les dépendances de l'exportateur sont installées."""
+        return True
+
+    @abstractmethod
+    def write(self, output_file, timesheets):
+        """
+        Écrit les feuilles de temps dans un fichier.
+
+        Args:
+            output_file: Le chemin du fichier de sortie.
+            timesheets: Un itérable de (auteur, {jour: [tickets]}).
+        """
+
+
+class NdjsonExporter(FlatExporter):
+    """JSON délimité par des sauts de ligne : un objet par créneau de ticket."""
+
+    extension = 'ndjson'
+    label = 'NDJSON'
+
+    def write(self, output_file, timesheets):
+        with open(output_file, 'w', encoding='utf-8', newline='\n') as fp:
+            for chunk in iter_chunks(iter_flat_rows(timesheets), self.chunk_rows):
+                fp.write(''.join(
+                    json.dumps(dict(zip(FLAT_COLUMNS, row)), ensure_ascii=False) + '\n'
+                    for row in chunk
+                ))
+
+
+class CsvExporter(FlatExporter):
+    """CSV à plat avec ligne d'en-tête."""
+
+    extension = 'csv'
+    label = 'CSV'
+
+    def write(self, output_file, timesheets):
+        with open(output_file, 'w', encoding='utf-8', newline='') as fp:
+            writer = csv.writer(fp)
+            writer.writerow(FLAT_COLUMNS)
+            for chunk in iter_chunks(iter_flat_rows(timesheets), self.chunk_rows):
+                writer.writerows(chunk)
+
+
+class ParquetExporter(FlatExporter):
+    """Parquet en colonnes (nécessite pyarrow) : un groupe de lignes par paquet."""
+
+    extension = 'parquet'
+    label = 'Parquet'
+
+    @classmethod
+    def is_available(cls):
+        return importlib.util.find_spec('pyarrow') is not None
+
+    def write(self, output_file, timesheets):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("L'export Parquet nécessite le paquet pyarrow")
+        schema = pa.schema([
+            ('author', pa.string()),
+            ('day', pa.string()),
+            ('code', pa.string()),
+            ('duration', pa.float64()),
+            ('start', pa.string()),
+            ('end', pa.string()),
+            ('message', pa.string())
+        ])
+        with pq.ParquetWriter(output_file, schema) as writer:
+            for chunk in iter_chunks(iter_flat_rows(timesheets), self.chunk_rows):
+                columns = list(zip(*chunk))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+
+
+# Exportateurs à plat disponibles, par format ; un nouveau format s'ajoute ici
+FLAT_EXPORTERS = {
+    NdjsonExporter.extension: NdjsonExporter,
+    CsvExporter.extension: CsvExporter,
+    ParquetExporter.extension: ParquetExporter
+}
@@ -0,0 +1,81 @@
+from collections import namedtuple
+from datetime import datetime
+
+
+# Séparateurs de contrôle. Git refuse NUL dans un message ; US peut figurer dans un sujet,
+# le sujet étant le dernier champ il n'est pas découpé (split limité à 3)
+FIELD_SEPARATOR = b'\x1f'
+RECORD_SEPARATOR = b'\x00'
+
+# Format passé à git log -z : champs séparés par US (0x1f), commits terminés par NUL. Le hash est
+# complet : un hash abrégé n'a pas la même longueur d'un dépôt à l'autre (dédoublonnage des forks)
+LOG_FORMAT = 'tformat:%H%x1f%an%x1f%ad%x1f%s'
+DATE_FORMAT = '%Y-%m-%d %H:%M'
+
+CommitRecord = namedtuple('CommitRecord', ['hash', 'author', 'date', 'message'])
+
+
+def parse_commit_record(raw):
+    """
+    Décode un enregistrement brut produit par git log au format LOG_FORMAT.
+
+    Args:
+        raw: Les octets d'un commit, sans le séparateur d'enregistrement.
+
+    Returns:
+        Un CommitRecord, ou None si l'enregistrement est incomplet ou mal formé.
+    """
+    fields = raw.strip(b'\n').split(FIELD_SEPARATOR, 3)
+    if len(fields) != 4:
+        return None
+    commit_hash, author, date, message = (field.decode('utf-8', errors='replace') for field in fields)
+    try:
+        date = datetime.fromisoformat(date)
+    except ValueError:
+        return None
+    return CommitRecord(commit_hash, author, date, message)
+
+
+def iter_commit_records(stream, chunk_size=64 * 1024):
+    """
+    Lit un flux git log par blocs et produit les commits au fil de l'eau.
+
+    Seul le commit en cours de lecture est conservé en mémoire, quelle que soit la taille
+    de l'historique.
+
+    Args:
+        stream: Un flux binaire (par exemple la sortie standard de git log -z).
+        chunk_size: La taille des blocs lus.
+
+    Returns:
+        Un générateur de CommitRecord.
+    """
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        records = (pending + chunk).split(RECORD_SEPARATOR)
+        pending = records.pop()
+        for raw in records:
+            record = parse_commit_record(raw)
+            if record is not None:
+                yield record
+    if pending.strip():
+        record = parse_commit_record(pending)
+        if record is not None:
+            yield record
+
+
+def format_commit_record(record):
+    """
+    Encode un commit dans le format produit par git log -z avec LOG_FORMAT.
+
+    Args:
+        record: Un CommitRecord.
+
+    Returns:
+        Les octets de l'enregistrement, séparateur final compris.
+    """
+    fields = (record.hash, record.author, record.date.strftime(DATE_FORMAT), record.message)
+    return FIELD_SEPARATOR.join(field.encode('utf-8') for field in fields) + RECORD_SEPARATOR
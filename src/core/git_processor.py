@@ -1,8 +1,28 @@
 import subprocess
 import csv
+import functools
 import os
-from datetime import datetime
-import pandas as pd
+import shlex
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, date
+
+from src.core.commit_store import CommitStore
+from src.core.git_query import GitQuery, missing_intervals, merge_intervals
+from src.core.git_log_stream import LOG_FORMAT, DATE_FORMAT, CommitRecord, iter_commit_records, format_commit_record
+from src.core.rollup_store import RollupStore
+from src.core.watermark_store import WatermarkStore
+from src.utils.profiling import profiler
+
+
+class GitCommandError(Exception):
+    """Erreur levée lorsqu'une commande Git échoue ou dépasse son délai."""
+
+
+class OperationCancelled(Exception):
+    """Erreur levée lorsqu'une opération est annulée par l'utilisateur."""
 
 
 class GitProcessor:
@@ -16,60 +36,789 @@ class GitProcessor:
             config: L'objet de configuration contenant les informations nécessaires.
         """
         self.config = config
+        self.store_path = "git_store"
+        # Format d'échange des logs : séparateur d'un octet (US) et dates en secondes epoch
+        self.log_file = "git_logs.log"
+        self.log_separator = '\x1f'
+        # Ancien format CSV des logs, conservé pour la migration
         self.logs_file = "git_logs.csv"
         self.delimiter = '›'
+        self.extraction_results = []
+        self._cancel_event = threading.Event()
+        self._processes = set()
+        self._processes_lock = threading.Lock()
+        # Git ne doit jamais attendre une saisie (identifiants, phrase de passe SSH) : il échoue à la place
+        self.git_env = dict(os.environ, GIT_TERMINAL_PROMPT='0', GCM_INTERACTIVE='never')
+        self.git_env.setdefault('GIT_SSH_COMMAND', 'ssh -o BatchMode=yes')
+    
+    def cancel(self):
+        """Annule l'extraction en cours en interrompant les processus Git actifs."""
+        self._cancel_event.set()
+        with self._processes_lock:
+            processes = list(self._processes)
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+    
+    def is_cancelled(self):
+        """Indique si l'annulation de l'opération en cours a été demandée."""
+        return self._cancel_event.is_set()
+    
+    def _start_git_process(self, args, **kwargs):
+        """Lance un processus Git et le référence pour pouvoir l'interrompre en cas d'annulation."""
+        if self._cancel_event.is_set():
+            raise GitCommandError("Extraction annulée")
+        process = subprocess.Popen(args, env=self.git_env, **kwargs)
+        with self._processes_lock:
+            self._processes.add(process)
+        return process
     
-    def run_git_command(self, repo_path, command):
+    def _forget_git_process(self, process):
+        """Retire un processus Git terminé de la liste des processus actifs."""
+        with self._processes_lock:
+            self._processes.discard(process)
+    
+    def run_git_command(self, repo_path, command, input_data=None, deadline=None):
         """
         Exécute une commande Git dans le répertoire spécifié.
         
         Args:
             repo_path: Le chemin du dépôt Git.
             command: La commande Git à exécuter.
+            input_data: Texte optionnel transmis sur l'entrée standard de la commande.
+            deadline: Instant (time.monotonic()) au-delà duquel la commande est interrompue.
             
         Returns:
             Le résultat de la commande.
         """
-        full_command = f"git -C {repo_path} {command}"
-        process = subprocess.Popen(full_command, stdout=subprocess.PIPE, shell=True)
-        output = process.communicate()[0].strip()
-        return output.decode("utf-8")
+        return self.run_git_command_with_status(repo_path, command, input_data, deadline)[1]
     
-    def extract_git_logs(self, output_file=None):
+    def run_git_command_with_status(self, repo_path, command, input_data=None, deadline=None):
         """
-        Extrait les logs Git de tous les dépôts configurés.
+        Exécute une commande Git et retourne aussi son code de retour et sa sortie d'erreur.
+        
+        La commande est lancée sans shell, ce qui permet de l'interrompre proprement à l'expiration
+        du délai et de gérer les chemins de dépôt contenant des espaces.
         
         Args:
-            output_file: Le fichier de sortie pour les logs Git.
+            repo_path: Le chemin du dépôt Git.
+            command: La commande Git à exécuter.
+            input_data: Texte optionnel transmis sur l'entrée standard de la commande.
+            deadline: Instant (time.monotonic()) au-delà duquel la commande est interrompue.
             
         Returns:
-            Le chemin du fichier contenant les logs Git.
+            Un tuple (code de retour, sortie standard, sortie d'erreur).
+            
+        Raises:
+            GitCommandError: Si le délai est dépassé.
+        """
+        args = ['git', '-C', str(repo_path)] + shlex.split(command)
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                raise GitCommandError(f"Délai dépassé avant 'git {command}' dans {repo_path}")
+        process = self._start_git_process(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL
+        )
+        stdin_bytes = input_data.encode("utf-8") if input_data is not None else None
+        try:
+            output, errors = process.communicate(stdin_bytes, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise GitCommandError(f"Délai dépassé pour 'git {command}' dans {repo_path}")
+        finally:
+            self._forget_git_process(process)
+        if self._cancel_event.is_set():
+            raise GitCommandError("Extraction annulée")
+        return (
+            process.returncode,
+            output.strip().decode("utf-8"),
+            errors.strip().decode("utf-8", errors="replace")
+        )
+    
+    def get_watermarks_file(self, store_path):
+        """Retourne le fichier des marqueurs d'extraction associé à un magasin de commits."""
+        return os.path.join(store_path, "watermarks.json")
+    
+    def get_commit_store(self, store_path=None):
+        """Retourne le magasin de commits (par défaut celui de self.store_path)."""
+        return CommitStore(store_path or self.store_path, dedup=self.config.get_dedup_mode())
+    
+    def get_rollup_store(self, store_path=None):
+        """Retourne les tables d'agrégats du magasin de commits (par défaut celui de self.store_path)."""
+        return RollupStore(store_path or self.store_path)
+    
+    def get_ref_tips(self, repo_path, deadline=None):
         """
-        output_file = output_file or self.logs_file
+        Retourne les hashs des extrémités de toutes les références du dépôt (équivalent de --all).
         
-        # Si le fichier existe déjà, le supprimer
-        if os.path.exists(output_file):
-            os.remove(output_file)
+        Args:
+            repo_path: Le chemin du dépôt Git.
+            deadline: Instant (time.monotonic()) au-delà duquel la commande est interrompue.
+            
+        Returns:
+            Une liste triée de hashs.
+        """
+        with profiler.span('git refs', repo=repo_path):
+            refs = self.run_git_command(repo_path, 'for-each-ref --format="%(objectname)"', deadline=deadline)
+            head = self.run_git_command(repo_path, 'rev-parse --verify --quiet HEAD', deadline=deadline)
+        tips = set(refs.split()) | set(head.split())
+        return sorted(tips)
+    
+    def get_remote_tracking_tips(self, repo_path, remote, deadline=None):
+        """
+        Retourne les extrémités des branches distantes suivies localement pour un dépôt distant.
         
-        # Mettre à jour chaque dépôt avant d'extraire les logs
-        for repo_path in self.config.get_repositories():
-            # Faire un git pull pour mettre à jour le dépôt
-            self.run_git_command(repo_path, 'pull')
-            # Extraire les logs de toutes les branches (--all)
-            command = f'log --all --pretty=format:"%h{self.delimiter}%an{self.delimiter}%ad{self.delimiter}%s" --date=format:"%Y-%m-%d %H:%M"'
-            logs = self.run_git_command(repo_path, command)
-            
-            # Écrire les logs dans le fichier
-            write_mode = 'a' if os.path.exists(output_file) else 'w'
-            with open(output_file, write_mode, newline='', encoding='utf-8') as f:
-                f.write(logs)
-                if logs:  # Ajouter une nouvelle ligne si les logs ne sont pas vides
-                    f.write('\n')
+        Args:
+            repo_path: Le chemin du dépôt Git.
+            remote: Le nom du dépôt distant.
+            deadline: Instant (time.monotonic()) au-delà duquel la commande est interrompue.
+            
+        Returns:
+            Un dictionnaire {'refs/heads/<branche>': hash}, comparable à la sortie de git ls-remote --heads.
+        """
+        prefix = f'refs/remotes/{remote}/'
+        output = self.run_git_command(
+            repo_path, f'for-each-ref --format="%(refname) %(objectname)" {shlex.quote(prefix)}', deadline=deadline
+        )
+        tips = {}
+        for line in output.splitlines():
+            refname, _, objectname = line.partition(' ')
+            branch = refname[len(prefix):]
+            if branch != 'HEAD':
+                tips[f'refs/heads/{branch}'] = objectname
+        return tips
+    
+    def fetch_repository(self, repo_path, deadline=None):
+        """
+        Met à jour les branches distantes suivies (git fetch) sans toucher à la copie de travail.
         
-        # Nettoyer les lignes problématiques
-        self.clean_logs_file(output_file)
+        Pour chaque dépôt distant, git ls-remote compare d'abord ses branches aux branches suivies
+        localement : le fetch n'est lancé que si une extrémité a changé. Un dépôt distant injoignable
+        n'empêche pas l'extraction, qui lit alors les références déjà présentes.
         
-        return output_file
+        Args:
+            repo_path: Le chemin du dépôt Git.
+            deadline: Instant (time.monotonic()) au-delà duquel les commandes sont interrompues.
+            
+        Returns:
+            Un dictionnaire : 'fetched' et 'skipped' (noms des dépôts distants mis à jour et inchangés)
+            et 'errors' (messages des dépôts distants en échec).
+            
+        Raises:
+            GitCommandError: Si le délai est dépassé ou l'extraction annulée.
+        """
+        status = {'fetched': [], 'skipped': [], 'errors': []}
+        for remote in self.run_git_command(repo_path, 'remote', deadline=deadline).split():
+            quoted = shlex.quote(remote)
+            with profiler.span('git ls-remote', repo=repo_path, remote=remote):
+                returncode, output, _ = self.run_git_command_with_status(
+                    repo_path, f'ls-remote --heads {quoted}', deadline=deadline
+                )
+            if returncode == 0:
+                remote_tips = {}
+                for line in output.splitlines():
+                    objectname, _, refname = line.partition('\t')
+                    remote_tips[refname] = objectname
+                if remote_tips == self.get_remote_tracking_tips(repo_path, remote, deadline):
+                    status['skipped'].append(remote)
+                    continue
+            
+            with profiler.span('git fetch', repo=repo_path, remote=remote):
+                returncode, _, errors = self.run_git_command_with_status(
+                    repo_path, f'fetch --prune --quiet {quoted}', deadline=deadline
+                )
+            if returncode == 0:
+                status['fetched'].append(remote)
+            else:
+                message = errors.splitlines()[0] if errors else f"git fetch a échoué (code {returncode})"
+                status['errors'].append(f"{remote} : {message}")
+        return status
+    
+    def is_history_rewritten(self, repo_path, previous_tips, deadline=None):
+        """
+        Indique si des commits extraits précédemment ne sont plus atteignables depuis les références.
+        
+        C'est le cas après un rebase, un push forcé ou la suppression d'une branche : une extraction
+        incrémentale ne suffit plus et le dépôt doit être relu entièrement.
+        
+        Args:
+            repo_path: Le chemin du dépôt Git.
+            previous_tips: Les extrémités des références lors de la dernière extraction.
+            deadline: Instant (time.monotonic()) au-delà duquel la commande est interrompue.
+            
+        Returns:
+            True si l'historique a été réécrit (ou si les anciens commits n'existent plus).
+        """
+        if not previous_tips:
+            return False
+        with profiler.span('git rev-list', repo=repo_path):
+            returncode, output, _ = self.run_git_command_with_status(
+                repo_path, 'rev-list --count --stdin --not --all', '\n'.join(previous_tips) + '\n', deadline
+            )
+        if returncode != 0:
+            return True
+        try:
+            return int(output) > 0
+        except ValueError:
+            return True
+    
+    def iter_git_log(self, repo_path, exclude_tips=None, deadline=None, query_args=None):
+        """
+        Lit les logs Git d'un dépôt, sur toutes les branches (--all) par défaut, au fil de l'eau.
+        
+        La sortie de git log est découpée par des séparateurs de contrôle (-z), si bien qu'un sujet
+        de commit contenant '›' ou un retour à la ligne ne peut plus corrompre les enregistrements.
+        
+        Args:
+            repo_path: Le chemin du dépôt Git.
+            exclude_tips: Extrémités dont les commits atteignables sont exclus (extraction incrémentale).
+            deadline: Instant (time.monotonic()) au-delà duquel la commande est interrompue.
+            query_args: Options de filtrage et références (voir GitQuery.to_git_args) remplaçant --all.
+            
+        Returns:
+            Un générateur de CommitRecord.
+            
+        Raises:
+            GitCommandError: Si git log échoue ou dépasse le délai.
+        """
+        args = ['git', '-C', str(repo_path), 'log', '-z', f'--pretty={LOG_FORMAT}', f'--date=format:{DATE_FORMAT}']
+        args.extend(query_args or ['--all'])
+        negative_revs = None
+        if exclude_tips:
+            # Les commits déjà extraits sont exclus via des révisions négatives lues sur l'entrée standard
+            args.append('--stdin')
+            negative_revs = ''.join(f'^{tip}\n' for tip in exclude_tips).encode('utf-8')
+        
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                raise GitCommandError(f"Délai dépassé avant 'git log' dans {repo_path}")
+        
+        with tempfile.TemporaryFile() as errors:
+            process = self._start_git_process(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=errors,
+                stdin=subprocess.PIPE if negative_revs is not None else subprocess.DEVNULL
+            )
+            timer = threading.Timer(timeout, process.kill) if timeout is not None else None
+            if timer:
+                timer.start()
+            try:
+                if negative_revs is not None:
+                    process.stdin.write(negative_revs)
+                    process.stdin.close()
+                yield from iter_commit_records(process.stdout)
+                returncode = process.wait()
+            finally:
+                if timer:
+                    timer.cancel()
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                process.stdout.close()
+                self._forget_git_process(process)
+            
+            if self._cancel_event.is_set():
+                raise GitCommandError("Extraction annulée")
+            
+            if deadline is not None and returncode != 0 and time.monotonic() >= deadline:
+                raise GitCommandError(f"Délai dépassé pour 'git log' dans {repo_path}")
+            if returncode != 0:
+                errors.seek(0)
+                message = errors.read().decode('utf-8', errors='replace').strip()
+                raise GitCommandError(message or f"git log a échoué dans {repo_path}")
+    
+    def spool_commit_records(self, records, spool, repo_path=None):
+        """
+        Écrit des commits dans un fichier temporaire binaire et retourne leur nombre.
+        
+        Args:
+            records: Un itérable de CommitRecord (lu au fil de git log).
+            spool: Un fichier binaire ouvert en écriture.
+            repo_path: Le dépôt lu, pour l'instrumentation.
+            
+        Returns:
+            Le nombre de commits écrits.
+        """
+        count = 0
+        with profiler.span('git log', repo=repo_path) as span:
+            position = spool.tell()
+            for record in records:
+                spool.write(format_commit_record(record))
+                count += 1
+            span.set(rows=count, bytes=spool.tell() - position)
+        return count
+    
+    def extract_repository(self, repo_path, watermark=None, timeout=None, offline=False):
+        """
+        Met à jour un dépôt et lit ses nouveaux commits. Conçu pour être exécuté dans un thread.
+        
+        Le dépôt est mis à jour par git fetch (voir fetch_repository) : seules les branches distantes
+        suivies changent, jamais la copie de travail. Les commits lus sont écrits au fil de l'eau dans
+        un fichier temporaire ('spool'), de sorte que la mémoire utilisée ne dépend pas de la taille
+        de l'historique.
+        
+        Args:
+            repo_path: Le chemin du dépôt Git.
+            watermark: Le marqueur de la dernière extraction de ce dépôt, ou None.
+            timeout: Durée maximale en secondes accordée à l'ensemble des commandes du dépôt.
+            offline: True pour lire les références existantes sans contacter les dépôts distants.
+            
+        Returns:
+            Un dictionnaire décrivant le résultat : 'repository', 'success', 'error', 'duration',
+            'tips', 'commits' (nombre de nouveaux commits), 'spool', 'full_rescan', 'unchanged'
+            et 'fetch' (résultat de fetch_repository, None hors ligne).
+        """
+        start = time.monotonic()
+        deadline = start + timeout if timeout else None
+        result = {
+            'repository': repo_path,
+            'success': False,
+            'error': None,
+            'duration': 0.0,
+            'tips': [],
+            'commits': 0,
+            'spool': None,
+            'full_rescan': False,
+            'unchanged': False,
+            'fetch': None
+        }
+        spool = tempfile.TemporaryFile()
+        try:
+            if not offline:
+                result['fetch'] = self.fetch_repository(repo_path, deadline)
+            tips = self.get_ref_tips(repo_path, deadline)
+            result['tips'] = tips
+            
+            if watermark and not self.is_history_rewritten(repo_path, watermark['tips'], deadline):
+                if tips == watermark['tips']:
+                    result['unchanged'] = True  # Aucune référence n'a bougé
+                else:
+                    records = self.iter_git_log(repo_path, watermark['tips'], deadline)
+                    result['commits'] = self.spool_commit_records(records, spool, repo_path)
+            else:
+                result['full_rescan'] = True
+                records = self.iter_git_log(repo_path, deadline=deadline)
+                result['commits'] = self.spool_commit_records(records, spool, repo_path)
+            result['success'] = True
+        except (GitCommandError, OSError) as e:
+            result['error'] = str(e)
+        
+        if result['success'] and result['commits']:
+            spool.seek(0)
+            result['spool'] = spool
+        else:
+            spool.close()
+        result['duration'] = time.monotonic() - start
+        return result
+    
+    def run_repository_jobs(self, job, repositories, watermarks, *args, progress=None):
+        """
+        Exécute une tâche d'extraction par dépôt dans un pool de threads.
+        
+        Args:
+            job: La méthode exécutée pour chaque dépôt (repo_path, *args, watermark, timeout).
+            repositories: Les chemins des dépôts.
+            watermarks: Les marqueurs d'extraction du magasin cible.
+            *args: Arguments supplémentaires transmis à la tâche après le chemin du dépôt.
+            progress: Fonction optionnelle appelée (étape, courant, total, message) à la fin de chaque dépôt.
+            
+        Returns:
+            Les résultats, dans l'ordre des dépôts.
+            
+        Raises:
+            OperationCancelled: Si l'extraction a été annulée entre-temps.
+        """
+        timeout = self.config.get_git_timeout()
+        max_workers = max(1, min(self.config.get_max_workers(), len(repositories) or 1))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(job, repo_path, *args, watermarks.get(repo_path), timeout): repo_path
+                for repo_path in repositories
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                if progress:
+                    result = future.result()
+                    status = "OK" if result['success'] else f"échec ({result['error']})"
+                    progress('extraction', done, len(futures), f"{futures[future]} : {status}")
+            results = [future.result() for future in futures]
+        
+        if self._cancel_event.is_set():
+            for result in results:
+                if result['spool'] is not None:
+                    result['spool'].close()
+            raise OperationCancelled("Extraction annulée")
+        return results
+    
+    def extract_git_logs(self, store_path=None, progress=None, offline=None):
+        """
+        Extrait les logs Git de tous les dépôts configurés dans le magasin de commits.
+        
+        L'extraction est incrémentale : seuls les commits non atteignables depuis les références
+        mémorisées lors de l'extraction précédente sont lus et ajoutés au magasin existant.
+        Un dépôt dont l'historique a été réécrit est relu entièrement.
+        
+        Les dépôts sont mis à jour (git fetch) et lus en parallèle (nombre de workers et délai par
+        dépôt configurables). L'échec d'un dépôt n'interrompt pas les autres : le résultat de chaque
+        dépôt est disponible dans self.extraction_results, et les nouveaux commits sont fusionnés
+        dans l'ordre de la configuration pour que le magasin produit soit déterministe.
+        
+        Args:
+            store_path: Le répertoire du magasin de commits.
+            progress: Fonction optionnelle appelée (étape, courant, total, message) au fil de l'extraction.
+            offline: True pour ne pas contacter les dépôts distants (par défaut selon la configuration).
+            
+        Returns:
+            Le chemin du magasin de commits.
+            
+        Raises:
+            OperationCancelled: Si l'extraction est annulée (cancel()) ; le magasin n'est pas modifié.
+        """
+        self._cancel_event.clear()
+        store_path = store_path or self.store_path
+        self.migrate_legacy_logs(store_path)
+        store = self.get_commit_store(store_path)
+        watermarks = WatermarkStore(self.get_watermarks_file(store_path))
+        
+        # Sans magasin, les marqueurs ne décrivent plus rien : extraction complète
+        if not store.exists():
+            watermarks.clear()
+        
+        repositories = self.config.get_repositories()
+        self.forget_removed_repositories(store, watermarks, repositories)
+        
+        if offline is None:
+            offline = self.config.get_offline_mode()
+        job = functools.partial(self.extract_repository, offline=offline)
+        # Les dépôts relus pour retrouver des commits perdus viennent d'être mis à jour
+        rescan_job = functools.partial(self.extract_repository, offline=True)
+        self.extraction_results = self.run_and_merge_jobs(
+            job, repositories, store, watermarks, progress=progress, rescan_job=rescan_job
+        )
+        
+        return store_path
+    
+    def forget_removed_repositories(self, store, watermarks, repositories):
+        """
+        Supprime du magasin les commits des dépôts retirés de la configuration.
+        
+        Avec le dédoublonnage, un commit partagé avec un dépôt retiré n'était conservé qu'une fois,
+        sous ce dépôt : les seuls dépôts dont des commits avaient été écartés comme doublons des
+        commits supprimés perdent leur marqueur, et seront relus entièrement.
+        
+        Args:
+            store: Le magasin de commits.
+            watermarks: Les marqueurs d'extraction associés au magasin.
+            repositories: Les dépôts configurés.
+        """
+        removed_keys = []
+        for repo_path in watermarks.repositories():
+            if repo_path not in repositories:
+                store.remove_repository(repo_path)
+                removed_keys.extend(store.removed_keys)
+                watermarks.remove(repo_path)
+        for repo_path in store.sharing_repositories(store.lost_keys(removed_keys)):
+            watermarks.remove(repo_path)
+    
+    def run_and_merge_jobs(self, job, repositories, store, watermarks, *args, progress=None, rescan_job=None):
+        """
+        Lit les dépôts (voir run_repository_jobs) puis fusionne leurs commits dans le magasin.
+        
+        Avec le dédoublonnage, un commit commun à plusieurs dépôts n'est conservé qu'une fois, sous
+        le premier dépôt qui l'a apporté. Si la relecture complète d'un dépôt (historique réécrit)
+        fait disparaître des commits du magasin, les seuls dépôts dont ces commits avaient été
+        écartés comme doublons (voir CommitStore.sharing_repositories) sont relus entièrement,
+        avec rescan_job, et fusionnés à leur tour. Les autres dépôts restent incrémentaux.
+        
+        Args:
+            job: La méthode exécutée pour chaque dépôt (voir run_repository_jobs).
+            repositories: Les chemins des dépôts.
+            store: Le magasin de commits.
+            watermarks: Les marqueurs d'extraction associés au magasin.
+            *args: Arguments supplémentaires transmis à la tâche.
+            progress: Fonction optionnelle appelée (étape, courant, total, message).
+            rescan_job: La méthode exécutée pour relire un dépôt (par défaut, job).
+            
+        Returns:
+            Les résultats par dépôt, dans l'ordre des dépôts (ceux de la relecture pour les dépôts relus).
+        """
+        results = self.run_repository_jobs(job, repositories, watermarks, *args, progress=progress)
+        if progress:
+            progress('fusion', 0, 1, "Fusion des commits dans le magasin")
+        lost = self.merge_extraction_results(store, watermarks, results)
+        rescanned = {result['repository'] for result in results if result['success'] and result['full_rescan']}
+        
+        while lost:
+            sharing = set(store.sharing_repositories(lost))
+            pending = [repo_path for repo_path in repositories if repo_path in sharing and repo_path not in rescanned]
+            if not pending:
+                break
+            for repo_path in pending:
+                watermarks.remove(repo_path)
+            rescanned.update(pending)
+            retry = self.run_repository_jobs(rescan_job or job, pending, watermarks, *args, progress=progress)
+            if progress:
+                progress('fusion', 0, 1, "Fusion des commits retrouvés dans le magasin")
+            lost = self.merge_extraction_results(store, watermarks, retry)
+            
+            retried = {result['repository']: result for result in retry}
+            for position, result in enumerate(results):
+                again = retried.get(result['repository'])
+                if again is not None:
+                    if again.get('fetch') is None:
+                        again['fetch'] = result.get('fetch')
+                    results[position] = again
+        return results
+    
+    def merge_extraction_results(self, store, watermarks, results):
+        """
+        Fusionne les commits lus par les workers dans le magasin, dans l'ordre des résultats,
+        puis sauvegarde le magasin et les marqueurs.
+        
+        Les commits des dépôts relus entièrement sont tous supprimés avant le premier ajout : avec
+        le dédoublonnage, un commit ne peut ainsi pas être écarté comme doublon d'une ligne qui
+        disparaît ensuite avec un autre dépôt.
+        
+        Args:
+            store: Le magasin de commits.
+            watermarks: Les marqueurs d'extraction associés au magasin.
+            results: Les résultats par dépôt (voir extract_repository).
+            
+        Returns:
+            Les clés des commits supprimés par les relectures complètes et absents des dépôts
+            relus (voir CommitStore.lost_keys ; toujours vide sans dédoublonnage).
+        """
+        removed_keys = []
+        for result in results:
+            if result['success'] and not result['unchanged'] and result['full_rescan']:
+                store.remove_repository(result['repository'])
+                removed_keys.extend(store.removed_keys)
+        
+        for result in results:
+            spool = result.pop('spool')
+            repo_path = result['repository']
+            if not result['success'] or result['unchanged']:
+                if spool is not None:
+                    spool.close()
+                continue  # Le marqueur précédent reste valable
+            watermark = watermarks.get(repo_path)
+            commits = 0
+            if not result['full_rescan'] and watermark:
+                commits = watermark['commits']
+            if spool is not None:
+                with spool, profiler.span('store append', repo=repo_path) as span:
+                    appended = store.append(repo_path, iter_commit_records(spool))
+                    span.set(rows=appended, duplicates=store.duplicates)
+                    commits += appended
+            watermarks.set(repo_path, result['tips'], commits, result.get('intervals'))
+        
+        with profiler.span('store save'):
+            store.save()
+            watermarks.save()
+        
+        return store.lost_keys(removed_keys)
+    
+    def get_query_store_path(self, query, store_path=None):
+        """Retourne le répertoire du magasin de commits dédié au périmètre d'une requête."""
+        return os.path.join(store_path or self.store_path, 'queries', query.scope_key())
+    
+    def extract_query_repository(self, repo_path, query, watermark=None, timeout=None):
+        """
+        Lit les commits d'un dépôt correspondant à une requête, en ne sollicitant git que pour
+        les périodes pas encore extraites et pour les commits apparus depuis.
+        
+        Une période est lue jusqu'à la première période déjà extraite, ou jusqu'au dernier commit :
+        un commit réécrit après la fin de la période demandée (date de commit postérieure à sa
+        date d'auteur) est ainsi vu. Les périodes couvertes s'étendent donc toujours jusqu'à
+        date.max.
+        
+        Args:
+            repo_path: Le chemin du dépôt Git.
+            query: La requête (GitQuery).
+            watermark: Le marqueur de ce dépôt dans le magasin de la requête, ou None.
+            timeout: Durée maximale en secondes accordée à l'ensemble des commandes du dépôt.
+            
+        Returns:
+            Un dictionnaire de résultat (voir extract_repository), complété par 'intervals',
+            les périodes désormais couvertes.
+        """
+        start = time.monotonic()
+        deadline = start + timeout if timeout else None
+        since, _ = query.bounds()
+        result = {
+            'repository': repo_path,
+            'success': False,
+            'error': None,
+            'duration': 0.0,
+            'tips': [],
+            'commits': 0,
+            'spool': None,
+            'full_rescan': False,
+            'unchanged': False,
+            'intervals': []
+        }
+        spool = tempfile.TemporaryFile()
+        try:
+            tips = self.get_ref_tips(repo_path, deadline)
+            result['tips'] = tips
+            covered = [
+                (date.fromisoformat(first), date.fromisoformat(last))
+                for first, last in (watermark or {}).get('intervals') or []
+            ]
+            # Une période bornée (magasin antérieur) a pu manquer des commits réécrits : elle est relue
+            covered = [(first, last) for first, last in covered if last == date.max]
+            
+            if watermark and tips != watermark['tips']:
+                if self.is_history_rewritten(repo_path, watermark['tips'], deadline):
+                    result['full_rescan'] = True
+                    covered = []
+                elif covered:
+                    # Compléter les périodes déjà couvertes avec les commits apparus depuis. Seuls les
+                    # nouveaux commits sont parcourus : la période n'est pas filtrée par git, pour ne pas
+                    # manquer un commit récent dont la date d'auteur est ancienne (rebase, cherry-pick).
+                    records = self.iter_git_log(repo_path, watermark['tips'], deadline, query.to_git_args())
+                    result['commits'] += self.spool_commit_records(records, spool, repo_path)
+            
+            gaps = missing_intervals(covered, since, date.max)
+            for first, last in gaps:
+                records = self.iter_git_log(repo_path, deadline=deadline, query_args=query.to_git_args(first, last))
+                result['commits'] += self.spool_commit_records(records, spool, repo_path)
+            
+            result['unchanged'] = not gaps and watermark is not None and tips == watermark['tips']
+            result['intervals'] = [
+                (first.isoformat(), last.isoformat())
+                for first, last in merge_intervals(covered + [(since, date.max)])
+            ]
+            result['success'] = True
+        except (GitCommandError, OSError) as e:
+            result['error'] = str(e)
+        
+        if result['success'] and result['commits']:
+            spool.seek(0)
+            result['spool'] = spool
+        else:
+            spool.close()
+        result['duration'] = time.monotonic() - start
+        return result
+    
+    def extract_query(self, query, store_path=None, progress=None):
+        """
+        Extrait les commits correspondant à une requête, filtrés par git lui-même.
+        
+        Les auteurs, la période et les références de la requête deviennent des options de git log
+        (--author, --since/--until, références), si bien que git élague les commits en C. Les
+        commits lus sont conservés dans un magasin propre au périmètre de la requête (auteurs et
+        références) avec les périodes déjà couvertes : une requête dont la période chevauche une
+        requête précédente ne relance git que pour les périodes manquantes. Les dépôts ne sont
+        pas mis à jour (git fetch) dans ce mode.
+        
+        Args:
+            query: La requête (GitQuery).
+            store_path: Le répertoire du magasin de commits principal.
+            progress: Fonction optionnelle appelée (étape, courant, total, message) au fil de l'extraction.
+            
+        Returns:
+            Le chemin du magasin de commits de la requête.
+            
+        Raises:
+            OperationCancelled: Si l'extraction est annulée (cancel()) ; le magasin n'est pas modifié.
+        """
+        self._cancel_event.clear()
+        query_store_path = self.get_query_store_path(query, store_path)
+        store = self.get_commit_store(query_store_path)
+        watermarks = WatermarkStore(self.get_watermarks_file(query_store_path))
+        if not store.exists():
+            watermarks.clear()
+        
+        repositories = self.config.get_repositories()
+        self.forget_removed_repositories(store, watermarks, repositories)
+        
+        self.extraction_results = self.run_and_merge_jobs(
+            self.extract_query_repository, repositories, store, watermarks, query, progress=progress
+        )
+        
+        return query_store_path
+    
+    def build_query(self, date_from=None, date_to=None):
+        """
+        Retourne la requête des commits d'une période pour les auteurs configurés.
+        
+        Args:
+            date_from: Premier jour inclus (date), ou None.
+            date_to: Dernier jour inclus (date), ou None.
+            
+        Returns:
+            La GitQuery (tous les auteurs si aucun n'est configuré).
+        """
+        return GitQuery(authors=self.config.get_authors(), since=date_from, until=date_to)
+    
+    def get_query_store(self, query, store_path=None):
+        """Retourne le magasin de commits dédié au périmètre d'une requête."""
+        return self.get_commit_store(self.get_query_store_path(query, store_path))
+    
+    def load_query_dataframe(self, query, store_path=None, progress=None):
+        """
+        Charge dans un DataFrame pandas les commits correspondant à une requête.
+        
+        Les périodes déjà extraites pour le même périmètre sont réutilisées sans relancer git.
+        
+        Args:
+            query: La requête (GitQuery).
+            store_path: Le répertoire du magasin de commits principal.
+            progress: Fonction optionnelle appelée (étape, courant, total, message) au fil de l'extraction.
+            
+        Returns:
+            Un DataFrame pandas contenant les logs Git, trié par date.
+        """
+        query_store_path = self.extract_query(query, store_path, progress)
+        with profiler.span('store load') as span:
+            df = self.get_commit_store(query_store_path).load_dataframe(query.since, query.until)
+            if query.authors:
+                df = df[df['author'].isin(query.authors)]
+            df = df.sort_values(by=['date'], kind='stable')
+            span.set(rows=len(df))
+        return df
+    
+    def get_failed_repositories(self):
+        """Retourne les résultats des dépôts en échec lors de la dernière extraction."""
+        return [result for result in self.extraction_results if not result['success']]
+    
+    def get_fetch_errors(self):
+        """
+        Retourne les dépôts distants qui n'ont pas pu être contactés lors de la dernière extraction
+        (leurs commits ont été lus depuis les références déjà présentes).
+        
+        Returns:
+            Une liste de tuples (dépôt, message).
+        """
+        return [
+            (result['repository'], error)
+            for result in self.extraction_results if result['success'] and result.get('fetch')
+            for error in result['fetch']['errors']
+        ]
+    
+    def clean_rows(self, lines):
+        """
+        Filtre des lignes de logs en ne conservant que celles qui ont exactement 4 colonnes.
+        
+        Args:
+            lines: Un itérable de lignes de logs.
+            
+        Returns:
+            Un générateur de lignes découpées en colonnes.
+        """
+        reader = csv.reader(lines, delimiter=self.delimiter)
+        for row in reader:
+            if len(row) == 4:  # Conserver uniquement les lignes avec 4 colonnes
+                yield row
     
     def clean_logs_file(self, logs_file):
         """
@@ -78,47 +827,245 @@ class GitProcessor:
         Args:
             logs_file: Le fichier de logs à nettoyer.
         """
-        clean_rows = []
+        with profiler.span('clean_logs_file') as span:
+            # Lire toutes les lignes du fichier
+            with open(logs_file, 'r', newline='', encoding='utf-8') as csvfile:
+                clean_rows = list(self.clean_rows(csvfile))
+            
+            # Réécrire le fichier avec les lignes nettoyées
+            with open(logs_file, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile, delimiter=self.delimiter)
+                writer.writerows(clean_rows)
+                span.set(rows=len(clean_rows), bytes=csvfile.tell())
+    
+    def export_git_logs(self, output_file=None, date_from=None, date_to=None, store_path=None):
+        """
+        Exporte les commits du magasin dans un fichier de logs au format d'échange.
         
-        # Lire toutes les lignes du fichier
-        with open(logs_file, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.reader(csvfile, delimiter=self.delimiter)
-            for row in reader:
-                if len(row) == 4:  # Conserver uniquement les lignes avec 4 colonnes
-                    clean_rows.append(row)
+        Une ligne par commit : hash, auteur, date (secondes epoch de l'heure locale de l'auteur)
+        et message, séparés par le caractère de contrôle US (0x1f). Ce format se relit avec les
+        moteurs rapides de pandas (C ou pyarrow), contrairement à l'ancien CSV délimité par '›'.
         
-        # Réécrire le fichier avec les lignes nettoyées
-        with open(logs_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile, delimiter=self.delimiter)
-            writer.writerows(clean_rows)
+        Args:
+            output_file: Le fichier de sortie.
+            date_from: Premier jour inclus (date), ou None pour ne pas borner.
+            date_to: Dernier jour inclus (date), ou None pour ne pas borner.
+            store_path: Le répertoire du magasin de commits.
+            
+        Returns:
+            Le chemin du fichier de logs.
+        """
+        output_file = output_file or self.log_file
+        forbidden = f'[{self.log_separator}\r\n]'
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            for df in self.get_commit_store(store_path).iter_dataframes(date_from, date_to):
+                epochs = df['date'].astype('int64') // 10**9
+                authors = df['author'].str.replace(forbidden, ' ', regex=True)
+                messages = df['message'].str.replace(forbidden, ' ', regex=True)
+                for row in zip(df['hash'], authors, epochs.astype(str), messages):
+                    f.write(self.log_separator.join(row))
+                    f.write('\n')
+        return output_file
     
-    def load_git_logs_dataframe(self, logs_file=None):
+    def is_legacy_logs_file(self, logs_file):
+        """Indique si un fichier de logs est à l'ancien format CSV délimité par '›'."""
+        with open(logs_file, 'rb') as f:
+            first_line = f.readline()
+        return self.log_separator.encode('ascii') not in first_line
+    
+    def read_logs_file(self, logs_file):
         """
-        Charge les logs Git dans un DataFrame pandas.
+        Lit un fichier de logs (format d'échange ou ancien CSV) dans un DataFrame pandas.
+        
+        Le format d'échange est lu par le moteur pyarrow s'il est installé, sinon par le moteur C,
+        avec des types explicites et une conversion vectorisée des dates epoch.
         
         Args:
-            logs_file: Le fichier contenant les logs Git.
+            logs_file: Le fichier de logs.
             
         Returns:
-            Un DataFrame pandas contenant les logs Git.
+            Un DataFrame avec les colonnes hash, author, date et message.
         """
-        logs_file = logs_file or self.logs_file
+        if self.is_legacy_logs_file(logs_file):
+            return self.read_legacy_logs_file(logs_file)
+        
+        options = {
+            'sep': self.log_separator,
+            'header': None,
+            'names': ['hash', 'author', 'date', 'message'],
+            'dtype': {'hash': str, 'author': str, 'date': 'int64', 'message': str},
+            'quotechar': '\x1e',  # Aucun guillemet : les messages sont lus tels quels
+            'keep_default_na': False,
+            'encoding': 'utf-8'
+        }
+        import pandas as pd
+        try:
+            import pyarrow  # noqa: F401
+            options['engine'] = 'pyarrow'
+        except ImportError:
+            options.update(engine='c', quoting=csv.QUOTE_NONE, lineterminator='\n')
+        with profiler.span('read_csv', engine=options['engine']) as span:
+            df = pd.read_csv(logs_file, **options)
+            df['date'] = pd.to_datetime(df['date'], unit='s')
+            span.set(rows=len(df), bytes=os.path.getsize(logs_file))
+        return df
+    
+    def read_legacy_logs_file(self, logs_file=None):
+        """
+        Lit un fichier de logs à l'ancien format CSV délimité par '›'.
+        
+        Args:
+            logs_file: Le fichier CSV des logs.
+            
+        Returns:
+            Un DataFrame avec les colonnes hash, author, date et message.
+        """
+        import pandas as pd
+        with profiler.span('read_csv', engine='python') as span:
+            df = pd.read_csv(
+                logs_file or self.logs_file,
+                names=['hash', 'author', 'date', 'message'],
+                dtype={'hash': str, 'author': str, 'message': str},  # Un hash abrégé peut ne contenir que des chiffres
+                parse_dates=['date'],
+                delimiter=self.delimiter,
+                keep_default_na=False,  # Un message « NA » reste un message
+                engine='python'  # Nécessaire pour les délimiteurs multi-caractères
+            )
+            span.set(rows=len(df))
+        return df
+    
+    def import_logs_file(self, logs_file=None, store_path=None):
+        """
+        Importe un fichier de logs (format d'échange ou ancien CSV) dans le magasin de commits.
         
-        # Charger les données dans un DataFrame
-        df = pd.read_csv(
-            logs_file,
-            names=['hash', 'author', 'date', 'message'],
-            parse_dates=['date'],
-            delimiter=self.delimiter,
-            engine='python'  # Nécessaire pour les délimiteurs multi-caractères
+        Les commits importés sont rattachés à un dépôt portant le nom du fichier, ce qui permet de
+        migrer un ancien git_logs.csv dont les dépôts d'origine ne sont plus disponibles. Les hashs
+        abrégés de l'ancien format sont complétés depuis les dépôts configurés (voir
+        resolve_commit_hashes) : une extraction ultérieure reconnaît alors ces commits comme doublons.
+        
+        Args:
+            logs_file: Le fichier de logs à importer.
+            store_path: Le répertoire du magasin de commits.
+            
+        Returns:
+            Le nombre de commits importés.
+        """
+        logs_file = logs_file or self.logs_file
+        df = self.read_logs_file(logs_file)
+        hashes = df['hash'].astype(str)
+        full_hashes = self.resolve_commit_hashes(sorted(set(hashes[hashes.str.len() < 40])))
+        if full_hashes:
+            df['hash'] = hashes.map(lambda commit_hash: full_hashes.get(commit_hash, commit_hash))
+        store = self.get_commit_store(store_path)
+        store.remove_repository(logs_file)
+        records = (
+            CommitRecord(str(commit_hash), str(author), date.to_pydatetime(), str(message))
+            for commit_hash, author, date, message in zip(df['hash'], df['author'], df['date'], df['message'])
         )
+        count = store.append(logs_file, records)
+        store.save()
+        return count
+    
+    def resolve_commit_hashes(self, short_hashes):
+        """
+        Complète des hashs de commit abrégés (%h) en les recherchant dans les dépôts configurés.
         
-        # Filtrer par auteur
-        authors = self.config.get_authors()
-        if authors:
-            df = df[df['author'].isin(authors)]
+        Args:
+            short_hashes: Les hashs abrégés.
+            
+        Returns:
+            Un dictionnaire {hash abrégé: hash complet} des hashs trouvés sans ambiguïté.
+        """
+        resolved = {}
+        pending = list(short_hashes)
+        for repo_path in self.config.get_repositories():
+            if not pending:
+                break
+            try:
+                returncode, output, _ = self.run_git_command_with_status(
+                    repo_path, 'cat-file "--batch-check=%(objectname) %(objecttype)"', '\n'.join(pending) + '\n'
+                )
+            except (GitCommandError, OSError):
+                continue
+            if returncode != 0:
+                continue
+            # Une ligne par hash demandé, dans l'ordre : '<hash complet> commit', ou '<hash> missing'
+            for short_hash, line in zip(pending, output.splitlines()):
+                objectname, _, objecttype = line.partition(' ')
+                if objecttype == 'commit':
+                    resolved[short_hash] = objectname
+            pending = [short_hash for short_hash in pending if short_hash not in resolved]
+        return resolved
+    
+    def migrate_legacy_logs(self, store_path=None):
+        """
+        Importe l'ancien fichier de logs (git_logs.csv) dans le magasin de commits s'il est encore vide.
+        
+        Le fichier n'est pas supprimé ; une fois le magasin écrit, il n'est plus relu.
         
-        # Trier par date (du plus ancien au plus récent)
-        df = df.sort_values(by=['date'])
+        Args:
+            store_path: Le répertoire du magasin de commits.
+            
+        Returns:
+            Le nombre de commits importés (0 s'il n'y a rien à migrer).
+        """
+        if self.get_commit_store(store_path).exists() or not os.path.exists(self.logs_file):
+            return 0
+        with profiler.span('legacy import') as span:
+            count = self.import_logs_file(self.logs_file, store_path)
+            span.set(rows=count)
+        return count
+    
+    def load_git_logs_dataframe(self, date_from=None, date_to=None, store_path=None):
+        """
+        Charge les logs Git du magasin principal dans un DataFrame pandas.
         
-        return df 
\ No newline at end of file
+        Seules les partitions du magasin qui chevauchent la période demandée sont lues. Voir
+        load_commits pour lire les commits de la période dans Git selon la configuration.
+        
+        Args:
+            date_from: Premier jour inclus (date), ou None pour ne pas borner.
+            date_to: Dernier jour inclus (date), ou None pour ne pas borner.
+            store_path: Le répertoire du magasin de commits.
+            
+        Returns:
+            Un DataFrame pandas contenant les logs Git.
+        """
+        self.migrate_legacy_logs(store_path)
+        with profiler.span('store load') as span:
+            df = self.get_commit_store(store_path).load_dataframe(date_from, date_to)
+            
+            # Filtrer par auteur
+            authors = self.config.get_authors()
+            if authors:
+                df = df[df['author'].isin(authors)]
+            
+            # Trier par date (du plus ancien au plus récent)
+            df = df.sort_values(by=['date'], kind='stable')
+            span.set(rows=len(df))
+        
+        return df
+    
+    def load_commits(self, date_from=None, date_to=None, store_path=None, progress=None):
+        """
+        Charge les commits d'une période, pour les auteurs configurés, dans un DataFrame pandas.
+        
+        Avec le filtrage par Git (voir Config.get_git_filtering), les auteurs et la période sont
+        transmis à git log et seules les périodes pas encore lues le sont (voir
+        load_query_dataframe) ; sinon les commits sont lus dans le magasin principal, rempli
+        par extract_git_logs.
+        
+        Args:
+            date_from: Premier jour inclus (date), ou None pour ne pas borner.
+            date_to: Dernier jour inclus (date), ou None pour ne pas borner.
+            store_path: Le répertoire du magasin de commits principal.
+            progress: Fonction optionnelle appelée (étape, courant, total, message) au fil de l'extraction.
+            
+        Returns:
+            Un tuple (DataFrame des commits trié par date, magasin de commits lu).
+        """
+        if self.config.get_git_filtering():
+            query = self.build_query(date_from, date_to)
+            df = self.load_query_dataframe(query, store_path, progress)
+            return df, self.get_query_store(query, store_path)
+        return self.load_git_logs_dataframe(date_from, date_to, store_path), self.get_commit_store(store_path)
@@ -0,0 +1,113 @@
+import hashlib
+import json
+from datetime import date, timedelta
+
+
+class GitQuery:
+    """Requête d'extraction poussée vers git : auteurs, période et références."""
+
+    def __init__(self, authors=None, since=None, until=None, refs=None):
+        """
+        Initialise la requête.
+
+        Args:
+            authors: Les noms d'auteurs recherchés (tous si vide).
+            since: Premier jour inclus (date), ou None.
+            until: Dernier jour inclus (date), ou None.
+            refs: Les références à parcourir (toutes les branches, --all, si vide).
+        """
+        self.authors = sorted(set(authors or []))
+        self.since = since
+        self.until = until
+        self.refs = list(refs or [])
+
+    def scope_key(self):
+        """
+        Retourne la clé du périmètre de la requête (auteurs et références, sans la période).
+
+        Deux requêtes de même périmètre partagent les commits déjà extraits, quelle que soit
+        leur période.
+        """
+        data = json.dumps({'authors': self.authors, 'refs': sorted(self.refs)}, sort_keys=True)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+    def to_git_args(self, since=None, until=None):
+        """
+        Traduit la requête en arguments de git log pour une période donnée.
+
+        git filtre sur la date de commit, dans le fuseau local, alors que les timesheets utilisent
+        la date d'auteur : la période est élargie d'un jour de chaque côté et le filtrage exact est
+        refait après lecture. La date de commit d'un commit réécrit (amend, rebase, cherry-pick)
+        peut suivre de loin sa date d'auteur : une borne de fin n'est sûre que si les commits
+        postérieurs ont déjà été lus (voir GitProcessor.extract_query_repository).
+        Les auteurs sont recherchés comme chaînes fixes ; le filtrage exact est aussi refait après.
+
+        Args:
+            since: Premier jour inclus de la période extraite, ou None.
+            until: Dernier jour inclus de la période extraite, ou None.
+
+        Returns:
+            La liste des arguments (options de filtrage puis références).
+        """
+        args = []
+        if self.authors:
+            args.append('--fixed-strings')
+            args.extend(f'--author={author}' for author in self.authors)
+        if since and since > date.min + timedelta(days=1):
+            args.append(f'--since={(since - timedelta(days=1)).isoformat()} 00:00:00')
+        if until and until < date.max - timedelta(days=1):
+            args.append(f'--until={(until + timedelta(days=1)).isoformat()} 23:59:59')
+        args.extend(self.refs or ['--all'])
+        return args
+
+    def bounds(self):
+        """Retourne la période de la requête sous forme de bornes (date.min/date.max si ouvertes)."""
+        return self.since or date.min, self.until or date.max
+
+
+def missing_intervals(covered, since, until):
+    """
+    Retourne les sous-périodes de [since, until] qui ne sont pas couvertes.
+
+    Args:
+        covered: Une liste triée et fusionnée de périodes (début, fin) inclusives.
+        since: Premier jour de la période demandée.
+        until: Dernier jour de la période demandée.
+
+    Returns:
+        La liste des périodes (début, fin) à extraire.
+    """
+    gaps = []
+    current = since
+    for start, end in covered:
+        if end < current:
+            continue
+        if start > until:
+            break
+        if start > current:
+            gaps.append((current, start - timedelta(days=1)))
+        if end >= until:
+            return gaps
+        current = end + timedelta(days=1)
+    if current <= until:
+        gaps.append((current, until))
+    return gaps
+
+
+def merge_intervals(intervals):
+    """
+    Fusionne des périodes (début, fin) inclusives qui se chevauchent ou se touchent.
+
+    Args:
+        intervals: Un itérable de périodes.
+
+    Returns:
+        La liste triée des périodes fusionnées.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and (start <= merged[-1][1] or start - timedelta(days=1) <= merged[-1][1]):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
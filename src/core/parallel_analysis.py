@@ -0,0 +1,313 @@
+"""
+Analyse des tickets répartie par journées sur un pool de processus.
+
+Les journées étant indépendantes, les commits (triés par date) sont découpés en lots de
+journées consécutives, de tailles comparables, analysés chacun dans un processus de calcul.
+Les lots et leurs résultats circulent sous forme de tableaux NumPy compacts (dates et durées en
+entiers, chaînes en octets concaténés ou en codes de dictionnaire) plutôt que de DataFrames ou
+de listes de dictionnaires sérialisés, puis les résultats sont fusionnés dans l'ordre des lots.
+"""
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+# Nombre de lots par processus : les journées n'ont pas toutes autant de commits, les lots
+# plus petits que la part de chaque processus équilibrent la charge
+CHUNKS_PER_PROCESS = 4
+
+
+class AnalysisSettings:
+    """
+    Paramètres d'analyse transmis aux processus de calcul à la place de la configuration.
+
+    Expose les accesseurs de Config lus par TicketAnalyzer et WorkCalendar.from_config (motif de
+    ticket, moteur, heures par jour, plages et calendrier de travail), sans fichier, verrou ni
+    écriture différée : un processus de calcul ne construit pas de Config.
+    """
+
+    def __init__(self, config):
+        """
+        Copie les paramètres d'analyse d'une configuration.
+
+        Args:
+            config: L'objet de configuration.
+        """
+        self.ticket_pattern = config.get_ticket_pattern()
+        self.analysis_engine = config.get_analysis_engine()
+        self.work_hours_per_day = config.get_work_hours_per_day()
+        self.work_periods = copy.deepcopy(config.get_work_periods())
+        self.work_calendar = copy.deepcopy(config.get_work_calendar())
+
+    def get_ticket_pattern(self):
+        """Retourne le motif de ticket."""
+        return self.ticket_pattern
+
+    def get_analysis_engine(self):
+        """Retourne le moteur d'analyse."""
+        return self.analysis_engine
+
+    def get_analysis_processes(self):
+        """Retourne 1 : un processus de calcul ne répartit pas à nouveau sa part."""
+        return 1
+
+    def get_work_hours_per_day(self):
+        """Retourne le nombre d'heures de travail par jour."""
+        return self.work_hours_per_day
+
+    def get_work_periods(self):
+        """Retourne les plages horaires de travail (matin et après-midi)."""
+        return self.work_periods
+
+    def get_work_calendar(self):
+        """Retourne le calendrier de travail."""
+        return self.work_calendar
+
+
+def encode_strings(values):
+    """
+    Encode des chaînes en octets UTF-8 concaténés.
+
+    Returns:
+        Un tuple (octets, tableau des offsets de début, complété par la longueur totale).
+    """
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return b''.join(encoded), offsets
+
+
+def decode_strings(blob, offsets):
+    """Décode les chaînes encodées par encode_strings."""
+    positions = offsets.tolist()
+    return [blob[positions[i]:positions[i + 1]].decode('utf-8') for i in range(len(positions) - 1)]
+
+
+def factorize(values):
+    """
+    Encode des valeurs (chaînes ou None) en codes de dictionnaire.
+
+    Returns:
+        Un tuple (codes int32, -1 pour None ; liste des valeurs distinctes).
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    return codes.astype(np.int32), list(uniques)
+
+
+def unfactorize(codes, uniques):
+    """Décode les valeurs encodées par factorize (None pour le code -1)."""
+    return [uniques[code] if code >= 0 else None for code in codes.tolist()]
+
+
+def split_days(dates, chunks):
+    """
+    Découpe des dates triées en lots de journées consécutives, de tailles comparables.
+
+    Args:
+        dates: Les dates des commits (datetime64[ns], triées).
+        chunks: Le nombre de lots souhaité.
+
+    Returns:
+        La liste des tranches (début, fin) d'indices de chaque lot ; une journée n'est jamais coupée.
+    """
+    days = dates.astype('datetime64[D]')
+    day_starts = np.flatnonzero(np.append(True, days[1:] != days[:-1]))
+    targets = np.linspace(0, len(dates), chunks + 1)[1:-1]
+    cuts = np.unique(day_starts[np.minimum(np.searchsorted(day_starts, targets), len(day_starts) - 1)])
+    bounds = [0] + [int(cut) for cut in cuts if cut > 0] + [len(dates)]
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def pack_commits(df):
+    """
+    Convertit les commits en tableaux compacts pour les processus de calcul.
+
+    Args:
+        df: Un DataFrame pandas contenant les logs Git, trié par date.
+
+    Returns:
+        Le dictionnaire des colonnes : dates (datetime64[ns]), messages (octets et offsets),
+        codes et dictionnaires des auteurs et des dépôts.
+    """
+    blob, offsets = encode_strings(df['message'].tolist())
+    packed = {'date': df['date'].to_numpy(dtype='datetime64[ns]'), 'message': (blob, offsets)}
+    for column in ('author', 'repo'):
+        packed[column] = factorize(df[column].tolist()) if column in df else None
+    return packed
+
+
+def slice_commits(packed, start, stop):
+    """Retourne les lignes [start, stop) de commits compacts (les dictionnaires sont conservés)."""
+    blob, offsets = packed['message']
+    chunk = {
+        'date': packed['date'][start:stop],
+        'message': (blob[offsets[start]:offsets[stop]], offsets[start:stop + 1] - offsets[start])
+    }
+    for column in ('author', 'repo'):
+        if packed[column] is not None:
+            codes, uniques = packed[column]
+            chunk[column] = (codes[start:stop], uniques)
+    return chunk
+
+
+def unpack_commits(chunk):
+    """Reconstruit le DataFrame des commits d'un lot."""
+    # dtype object : une colonne de chaînes vide resterait sinon en float64
+    data = {'date': chunk['date'], 'message': pd.Series(decode_strings(*chunk['message']), dtype=object)}
+    for column in ('author', 'repo'):
+        if column in chunk:
+            data[column] = pd.Series(unfactorize(*chunk[column]), dtype=object)
+    return pd.DataFrame(data)
+
+
+def slots_from_infos(infos_par_journee):
+    """
+    Convertit des infos par journée (moteur 'loop') en colonnes de créneaux.
+
+    Returns:
+        Un tuple (journées, colonnes des créneaux ; voir TicketAnalyzer.infos_from_slots).
+    """
+    journees = list(infos_par_journee)
+    slots = [t for tickets in infos_par_journee.values() for t in tickets]
+    counts = [len(tickets) for tickets in infos_par_journee.values()]
+    return journees, {
+        'day': np.repeat(np.array(journees, dtype='datetime64[D]'), counts).astype('datetime64[ns]'),
+        'ticket': [t['ticket'] for t in slots],
+        'duree': pd.to_timedelta([t['duree'] for t in slots]).to_numpy(dtype='timedelta64[ns]'),
+        'debut': pd.to_datetime([t['debut'] for t in slots]).to_numpy(dtype='datetime64[ns]'),
+        'fin': pd.to_datetime([t['fin'] for t in slots]).to_numpy(dtype='datetime64[ns]'),
+        'erreur': np.array([bool(t['erreur']) for t in slots], dtype=bool),
+        'message': [t['message'] for t in slots],
+        'author': [t.get('author') for t in slots],
+        'repo': [t.get('repo') for t in slots]
+    }
+
+
+def pack_results(journees, slots):
+    """
+    Convertit des colonnes de créneaux en tableaux compacts (chaînes en octets ou en codes).
+
+    Returns:
+        Le dictionnaire des colonnes : journées, puis une ligne par créneau (journée, ticket, durée,
+        début, fin, erreur, message, auteur, dépôt) ; None à la place des créneaux s'il n'y en a aucun.
+    """
+    if slots is None or not len(slots['day']):
+        return {'days': journees, 'slots': None}
+    return {
+        'days': journees,
+        'slots': {
+            'day': slots['day'],
+            'ticket': factorize(slots['ticket']),
+            'duree': slots['duree'],
+            'debut': slots['debut'],
+            'fin': slots['fin'],
+            'erreur': np.asarray(slots['erreur'], dtype=bool),
+            'message': encode_strings(slots['message']),
+            'author': factorize(slots['author']),
+            'repo': factorize(slots['repo'])
+        }
+    }
+
+
+def unpack_results(packed):
+    """
+    Décode les résultats compacts d'un lot.
+
+    Returns:
+        Un tuple (journées, colonnes des créneaux ou None).
+    """
+    slots = packed['slots']
+    if slots is None:
+        return packed['days'], None
+    return packed['days'], {
+        'day': slots['day'],
+        'ticket': unfactorize(*slots['ticket']),
+        'duree': slots['duree'],
+        'debut': slots['debut'],
+        'fin': slots['fin'],
+        'erreur': slots['erreur'],
+        'message': decode_strings(*slots['message']),
+        'author': unfactorize(*slots['author']),
+        'repo': unfactorize(*slots['repo'])
+    }
+
+
+def concat_slots(results):
+    """
+    Concatène les créneaux de lots successifs.
+
+    Args:
+        results: Les tuples (journées, colonnes des créneaux ou None) des lots, dans l'ordre.
+
+    Returns:
+        Un tuple (journées, colonnes des créneaux ou None).
+    """
+    journees = [journee for days, _ in results for journee in days]
+    parts = [slots for _, slots in results if slots is not None]
+    if not parts:
+        return journees, None
+    slots = {}
+    for column in parts[0]:
+        if isinstance(parts[0][column], np.ndarray):
+            slots[column] = np.concatenate([part[column] for part in parts])
+        else:
+            slots[column] = [value for part in parts for value in part[column]]
+    return journees, slots
+
+
+def analyze_chunk(settings, engine, chunk):
+    """
+    Analyse un lot de journées (exécuté dans un processus de calcul).
+
+    Args:
+        settings: Les paramètres d'analyse (AnalysisSettings).
+        engine: Le moteur d'analyse ('vectorized' ou 'loop').
+        chunk: Les commits compacts du lot (voir slice_commits).
+
+    Returns:
+        Les créneaux du lot, compacts (voir pack_results) : le moteur vectorisé les produit
+        directement en colonnes, sans construire de dictionnaires.
+    """
+    from src.core.ticket_analyzer import TicketAnalyzer
+    from src.core.work_calendar import WorkCalendar
+
+    ticket_analyzer = TicketAnalyzer(settings)
+    df = unpack_commits(chunk)
+    if engine == 'loop':
+        return pack_results(*slots_from_infos(ticket_analyzer.extract_tickets_loop(df, WorkCalendar.from_config(settings))))
+    return pack_results(*ticket_analyzer.vectorized_slots(df, WorkCalendar.from_config(settings)))
+
+
+def analyze_parallel(config, df, engine, processes):
+    """
+    Analyse les tickets en répartissant les journées sur un pool de processus.
+
+    Args:
+        config: L'objet de configuration.
+        df: Un DataFrame pandas contenant les logs Git.
+        engine: Le moteur d'analyse ('vectorized' ou 'loop').
+        processes: Le nombre de processus.
+
+    Returns:
+        Le dictionnaire des infos par journée (voir TicketAnalyzer.extract_tickets_from_dataframe).
+    """
+    df = df[df['date'].notna()].sort_values(by=['date'], kind='stable')
+    packed = pack_commits(df)
+    chunks = [slice_commits(packed, start, stop) for start, stop in split_days(packed['date'], processes * CHUNKS_PER_PROCESS)]
+
+    from src.core.ticket_analyzer import TicketAnalyzer
+
+    if not chunks:
+        return {}
+    # spawn : les processus ne dupliquent pas les threads (interface, pool Git) du parent
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(processes, len(chunks)), mp_context=context) as executor:
+        # map rend les résultats dans l'ordre des lots, donc des journées
+        settings = AnalysisSettings(config)
+        results = [unpack_results(packed_results) for packed_results in
+                   executor.map(analyze_chunk, [settings] * len(chunks), [engine] * len(chunks), chunks)]
+    # Les dictionnaires ne sont construits qu'une fois, sur les colonnes de tous les lots
+    return TicketAnalyzer.infos_from_slots(*concat_slots(results))
@@ -0,0 +1,439 @@
+import json
+import os
+from datetime import date, timedelta
+
+from src.core.analysis_cache import AnalysisCache
+from src.core.work_calendar import WorkCalendar
+from src.utils.profiling import profiler
+
+
+# Niveaux d'agrégation (journée, semaine commençant le lundi, mois) et dimensions des tables
+ROLLUP_LEVELS = ('day', 'week', 'month')
+ROLLUP_DIMENSIONS = ('author', 'ticket', 'repo')
+
+
+def period_start(journee, level):
+    """
+    Retourne le premier jour de la période (journée, semaine ou mois) qui contient une journée.
+
+    Args:
+        journee: La journée (date).
+        level: Le niveau d'agrégation (voir ROLLUP_LEVELS).
+
+    Returns:
+        La date de début de la période.
+    """
+    if level == 'week':
+        return journee - timedelta(days=journee.weekday())
+    if level == 'month':
+        return journee.replace(day=1)
+    return journee
+
+
+def month_bounds(month):
+    """Retourne le premier et le dernier jour d'un mois (AAAA-MM)."""
+    first_day = date.fromisoformat(f'{month}-01')
+    return first_day, period_start(first_day + timedelta(days=31), 'month') - timedelta(days=1)
+
+
+class RollupStore:
+    """
+    Tables d'agrégats du temps passé, matérialisées à côté du magasin de commits.
+
+    Trois tables (journée, semaine, mois) donnent la durée ajustée par période, auteur, ticket
+    et dépôt. Chaque auteur est analysé séparément, comme pour les feuilles de temps de l'équipe.
+    Les tables sont des colonnes NumPy (début de période, codes d'auteur, de ticket et de dépôt,
+    secondes), enregistrées avec leurs dictionnaires dans un seul fichier .npz remplacé de façon
+    atomique. Le même fichier conserve les créneaux de chaque ticket (journée, début, fin, durée,
+    auteur, dépôt), triés par ticket puis par journée, dont est tiré l'index des tickets (voir
+    ticket_index) sans relancer l'analyse.
+
+    La mise à jour est incrémentale : seuls les mois dont la partition du magasin a changé depuis
+    le dernier calcul (nouvelle génération, mois ajouté ou supprimé), ou dont les plages de travail
+    ont changé (calendrier de travail), sont réanalysés ; leurs journées sont remplacées, puis les
+    semaines et les mois qui les contiennent sont recalculés à partir de la table des journées.
+    Un changement des autres paramètres d'analyse (motif de ticket, heures par jour, auteurs)
+    provoque un recalcul complet.
+    """
+
+    FILE = 'rollups.npz'
+    FORMAT_VERSION = 3
+    COLUMNS = ('period', 'author', 'ticket', 'repo', 'seconds')
+    SLOT_COLUMNS = ('day', 'start', 'end', 'seconds', 'author', 'ticket', 'repo')
+
+    def __init__(self, store_path):
+        """
+        Initialise les tables d'agrégats d'un magasin de commits.
+
+        Args:
+            store_path: Le répertoire du magasin de commits.
+        """
+        self.store_path = store_path
+        self.path = os.path.join(store_path, self.FILE)
+        self._load()
+
+    def _reset(self, scope=None):
+        """Vide les tables et les dictionnaires."""
+        import numpy as np
+
+        self.scope = scope
+        self.partitions = {}  # mois -> version de la partition analysée (voir CommitStore.partition_versions)
+        self.calendars = {}  # mois -> clé des plages de travail de ses journées (voir calendar_key)
+        self.authors, self.tickets, self.repos = [], [], []
+        self.tables = {
+            level: {
+                'period': np.array([], dtype='datetime64[D]'),
+                'author': np.array([], dtype=np.int32),
+                'ticket': np.array([], dtype=np.int32),
+                'repo': np.array([], dtype=np.int32),
+                'seconds': np.array([], dtype=np.float64)
+            }
+            for level in ROLLUP_LEVELS
+        }
+        self.slots = {
+            'day': np.array([], dtype='datetime64[D]'),
+            'start': np.array([], dtype='datetime64[ns]'),
+            'end': np.array([], dtype='datetime64[ns]'),
+            'seconds': np.array([], dtype=np.float64),
+            'author': np.array([], dtype=np.int32),
+            'ticket': np.array([], dtype=np.int32),
+            'repo': np.array([], dtype=np.int32)
+        }
+
+    def _load(self):
+        """Charge les tables depuis le disque (vides si le fichier est absent, illisible ou d'un autre format)."""
+        import numpy as np
+
+        self._reset()
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('format') != self.FORMAT_VERSION:
+                    return
+                tables = {
+                    level: {column: data[f'{level}_{column}'] for column in self.COLUMNS}
+                    for level in ROLLUP_LEVELS
+                }
+                slots = {column: data[f'slot_{column}'] for column in self.SLOT_COLUMNS}
+        except (OSError, ValueError, KeyError):
+            return
+        self.scope = meta['scope']
+        self.partitions = meta['partitions']
+        self.calendars = meta['calendars']
+        self.authors, self.tickets, self.repos = meta['authors'], meta['tickets'], meta['repos']
+        self.tables = tables
+        self.slots = slots
+
+    def exists(self):
+        """Indique si les tables d'agrégats ont déjà été calculées."""
+        return os.path.exists(self.path)
+
+    def save(self):
+        """Écrit les tables et leurs dictionnaires dans un fichier temporaire, puis le renomme."""
+        import numpy as np
+
+        meta = {
+            'format': self.FORMAT_VERSION,
+            'scope': self.scope,
+            'partitions': self.partitions,
+            'calendars': self.calendars,
+            'authors': self.authors,
+            'tickets': self.tickets,
+            'repos': self.repos
+        }
+        arrays = {'meta': np.array(json.dumps(meta))}
+        for level, table in self.tables.items():
+            for column, values in table.items():
+                arrays[f'{level}_{column}'] = values
+        for column, values in self.slots.items():
+            arrays[f'slot_{column}'] = values
+        os.makedirs(self.store_path, exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def scope_key(config):
+        """
+        Retourne la clé des paramètres d'analyse dont dépendent toutes les tables (le calendrier
+        de travail est suivi mois par mois, voir calendar_key).
+        """
+        return AnalysisCache.scope_key(
+            ticket_pattern=config.get_ticket_pattern(),
+            work_hours=config.get_work_hours_per_day(),
+            authors=sorted(config.get_authors())
+        )
+
+    @staticmethod
+    def calendar_key(calendar, month):
+        """
+        Retourne la clé des plages de travail des journées d'un mois.
+
+        La clé porte sur les plages effectives de chaque journée, pas sur la configuration : une
+        exception datée ne change que la clé de son mois, et une configuration équivalente
+        (plages réordonnées, work_periods recopiées dans work_calendar) ne change aucune clé.
+
+        Args:
+            calendar: Le calendrier de travail (WorkCalendar).
+            month: Le mois (AAAA-MM).
+
+        Returns:
+            La clé (hexadécimal).
+        """
+        first_day, last_day = month_bounds(month)
+        days = (first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1))
+        return AnalysisCache.scope_key(periods=[calendar.periods(day) for day in days])
+
+    def update(self, git_processor, ticket_analyzer, progress=None):
+        """
+        Met à jour les tables à partir du magasin de commits, en ne réanalysant que les mois modifiés
+        (partition du magasin ou plages de travail).
+
+        Args:
+            git_processor: Le processeur Git (magasin de commits et filtre des auteurs).
+            ticket_analyzer: L'analyseur de tickets.
+            progress: Fonction (étape, courant, total, message) signalant l'avancement, ou None.
+
+        Returns:
+            La liste des mois recalculés (AAAA-MM), vide si les tables étaient à jour.
+        """
+        progress = progress or (lambda *args: None)
+        scope = self.scope_key(ticket_analyzer.config)
+        if scope != self.scope:
+            self._reset(scope)
+
+        store = git_processor.get_commit_store(self.store_path)
+        partitions = store.partition_versions()
+        calendar = WorkCalendar.from_config(ticket_analyzer.config)
+        calendars = {month: self.calendar_key(calendar, month) for month in partitions}
+        months = sorted(
+            month for month in set(partitions) | set(self.partitions)
+            if partitions.get(month) != self.partitions.get(month)
+            or calendars.get(month) != self.calendars.get(month)
+        )
+        if not months:
+            return []
+
+        with profiler.span('rollups update', months=len(months)) as span:
+            rows = []
+            slots = []
+            for done, month in enumerate(months):
+                progress('agrégats', done, len(months), f"Agrégats : {month}")
+                if month in partitions:
+                    month_rows, month_slots = self._analyze_month(git_processor, ticket_analyzer, month)
+                    rows.extend(month_rows)
+                    slots.extend(month_slots)
+            self._replace_months(months, rows, slots)
+            self.partitions = partitions
+            self.calendars = calendars
+            self.save()
+            progress('agrégats', len(months), len(months), "")
+            span.set(rows=len(rows))
+        return months
+
+    def _analyze_month(self, git_processor, ticket_analyzer, month):
+        """
+        Analyse les commits d'un mois, auteur par auteur.
+
+        Returns:
+            Un tuple (lignes (journée, auteur, ticket, dépôt, secondes) de la table des journées,
+            créneaux (journée, début, fin, secondes, auteur, ticket, dépôt)).
+        """
+        first_day, last_day = month_bounds(month)
+        df = git_processor.load_git_logs_dataframe(first_day, last_day, store_path=self.store_path)
+        totals = {}
+        slots = []
+        for _, group in df.groupby('author', sort=True):
+            durees_par_journee = ticket_analyzer.adjust_durations(ticket_analyzer.extract_tickets_from_dataframe(group))
+            for journee, tickets in durees_par_journee.items():
+                for t in tickets:
+                    seconds = t['duree'].total_seconds()
+                    key = (journee, t.get('author'), t['ticket'], t.get('repo'))
+                    totals[key] = totals.get(key, 0.0) + seconds
+                    slots.append((journee, t['debut'], t['fin'], seconds, t.get('author'), t['ticket'], t.get('repo')))
+        return [key + (seconds,) for key, seconds in totals.items()], slots
+
+    def _code(self, values, codes, value):
+        """Retourne le code d'une valeur dictionnaire, en l'ajoutant si nécessaire."""
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def _replace_months(self, months, rows, slots=()):
+        """
+        Remplace les journées et les créneaux des mois recalculés, puis recalcule les semaines et
+        les mois concernés.
+
+        Args:
+            months: Les mois recalculés (AAAA-MM).
+            rows: Les nouvelles lignes (journée, auteur, ticket, dépôt, secondes) de ces mois.
+            slots: Les nouveaux créneaux (journée, début, fin, secondes, auteur, ticket, dépôt) de ces mois.
+        """
+        import numpy as np
+
+        codes = [{value: code for code, value in enumerate(values)} for values in (self.authors, self.tickets, self.repos)]
+        new = {
+            'period': np.array([row[0] for row in rows], dtype='datetime64[D]'),
+            'author': np.array([self._code(self.authors, codes[0], row[1] or '') for row in rows], dtype=np.int32),
+            'ticket': np.array([self._code(self.tickets, codes[1], row[2]) for row in rows], dtype=np.int32),
+            'repo': np.array([self._code(self.repos, codes[2], row[3] or '') for row in rows], dtype=np.int32),
+            'seconds': np.array([row[4] for row in rows], dtype=np.float64)
+        }
+
+        # Table des journées : les journées des mois recalculés sont remplacées
+        month_values = np.array(months, dtype='datetime64[M]')
+        days = self.tables['day']
+        keep = ~np.isin(days['period'].astype('datetime64[M]'), month_values)
+        self.tables['day'] = self._sorted({column: np.concatenate([days[column][keep], new[column]]) for column in self.COLUMNS})
+
+        # Créneaux des tickets : ceux des mois recalculés sont remplacés
+        new_slots = {
+            'day': np.array([slot[0] for slot in slots], dtype='datetime64[D]'),
+            'start': np.array([np.datetime64(slot[1], 'ns') for slot in slots], dtype='datetime64[ns]'),
+            'end': np.array([np.datetime64(slot[2], 'ns') for slot in slots], dtype='datetime64[ns]'),
+            'seconds': np.array([slot[3] for slot in slots], dtype=np.float64),
+            'author': np.array([self._code(self.authors, codes[0], slot[4] or '') for slot in slots], dtype=np.int32),
+            'ticket': np.array([self._code(self.tickets, codes[1], slot[5]) for slot in slots], dtype=np.int32),
+            'repo': np.array([self._code(self.repos, codes[2], slot[6] or '') for slot in slots], dtype=np.int32)
+        }
+        keep = ~np.isin(self.slots['day'].astype('datetime64[M]'), month_values)
+        merged = {column: np.concatenate([self.slots[column][keep], new_slots[column]]) for column in self.SLOT_COLUMNS}
+        order = np.lexsort((merged['author'], merged['start'], merged['day'], merged['ticket']))
+        self.slots = {column: values[order] for column, values in merged.items()}
+
+        # Semaines et mois qui chevauchent les mois recalculés, agrégés à partir des journées
+        for level in ('week', 'month'):
+            affected = np.unique(np.concatenate([
+                self._period_starts(np.arange(first_day, last_day + timedelta(days=1), dtype='datetime64[D]'), level)
+                for first_day, last_day in map(month_bounds, months)
+            ]))
+            table = self.tables[level]
+            keep = ~np.isin(table['period'], affected)
+            days = self.tables['day']
+            periods = self._period_starts(days['period'], level)
+            selected = np.isin(periods, affected)
+            rows = {column: days[column][selected] for column in self.COLUMNS}
+            rows['period'] = periods[selected]
+            aggregated = self._aggregate(rows)
+            self.tables[level] = self._sorted({column: np.concatenate([table[column][keep], aggregated[column]]) for column in self.COLUMNS})
+
+    def _period_starts(self, days, level):
+        """Retourne le début de la période de chaque journée (tableau datetime64[D])."""
+        import numpy as np
+
+        if level == 'week':
+            # Le 1er janvier 1970 est un jeudi : décalage de 3 jours pour compter depuis le lundi
+            return days - (days.astype(np.int64) + 3) % 7
+        if level == 'month':
+            return days.astype('datetime64[M]').astype('datetime64[D]')
+        return days
+
+    def _aggregate(self, table):
+        """Somme les secondes des lignes de même (période, auteur, ticket, dépôt)."""
+        import numpy as np
+
+        if len(table['period']) == 0:
+            return table
+        table = self._sorted(table)
+        keys = np.stack([table['period'].astype(np.int64), table['author'], table['ticket'], table['repo']])
+        starts = np.flatnonzero(np.append(True, (keys[:, 1:] != keys[:, :-1]).any(axis=0)))
+        aggregated = {column: table[column][starts] for column in ('period', 'author', 'ticket', 'repo')}
+        aggregated['seconds'] = np.add.reduceat(table['seconds'], starts)
+        return aggregated
+
+    def _sorted(self, table):
+        """Trie les lignes par période, auteur, ticket et dépôt."""
+        import numpy as np
+
+        order = np.lexsort((table['repo'], table['ticket'], table['author'], table['period']))
+        return {column: values[order] for column, values in table.items()}
+
+    def totals(self, level='month', by='author', date_from=None, date_to=None, author=None, ticket=None, repo=None):
+        """
+        Retourne le temps passé par période et par valeur d'une dimension.
+
+        Args:
+            level: Le niveau d'agrégation (voir ROLLUP_LEVELS).
+            by: La dimension du regroupement (voir ROLLUP_DIMENSIONS).
+            date_from: Premier jour inclus (la période qui le contient est entière), ou None.
+            date_to: Dernier jour inclus, ou None.
+            author: Ne compter que cet auteur, ou None.
+            ticket: Ne compter que ce ticket, ou None.
+            repo: Ne compter que ce dépôt, ou None.
+
+        Returns:
+            Une liste de tuples (début de période, valeur, durée), par période puis par durée décroissante.
+        """
+        import numpy as np
+
+        table = self.tables[level]
+        mask = np.ones(len(table['period']), dtype=bool)
+        if date_from is not None:
+            mask &= table['period'] >= np.datetime64(period_start(date_from, level), 'D')
+        if date_to is not None:
+            mask &= table['period'] <= np.datetime64(date_to, 'D')
+        for column, values, value in (('author', self.authors, author), ('ticket', self.tickets, ticket), ('repo', self.repos, repo)):
+            if value is not None:
+                mask &= table[column] == (values.index(value) if value in values else -1)
+
+        values = {'author': self.authors, 'ticket': self.tickets, 'repo': self.repos}[by]
+        aggregated = self._aggregate({
+            'period': table['period'][mask],
+            'author': table[by][mask],
+            'ticket': np.zeros(int(mask.sum()), dtype=np.int32),
+            'repo': np.zeros(int(mask.sum()), dtype=np.int32),
+            'seconds': table['seconds'][mask]
+        })
+        result = [
+            (period, values[code], timedelta(seconds=seconds))
+            for period, code, seconds in zip(
+                aggregated['period'].tolist(), aggregated['author'].tolist(), aggregated['seconds'].tolist()
+            )
+        ]
+        result.sort(key=lambda row: (row[0], -row[2].total_seconds()))
+        return result
+
+    def ticket_index(self, date_from=None, date_to=None, author=None):
+        """
+        Construit l'index des tickets à partir des créneaux enregistrés.
+
+        Args:
+            date_from: Premier jour inclus, ou None.
+            date_to: Dernier jour inclus, ou None.
+            author: Ne garder que les créneaux de cet auteur, ou None.
+
+        Returns:
+            Le TicketIndex des créneaux de la période.
+        """
+        import numpy as np
+
+        from src.core.ticket_index import TicketIndex, TicketSlot
+
+        slots = self.slots
+        mask = np.ones(len(slots['day']), dtype=bool)
+        if date_from is not None:
+            mask &= slots['day'] >= np.datetime64(date_from, 'D')
+        if date_to is not None:
+            mask &= slots['day'] <= np.datetime64(date_to, 'D')
+        if author is not None:
+            mask &= slots['author'] == (self.authors.index(author) if author in self.authors else -1)
+
+        index = TicketIndex()
+        for day, start, end, seconds, author_code, ticket_code, repo_code in zip(
+            slots['day'][mask].tolist(),
+            slots['start'][mask].astype('datetime64[us]').tolist(),
+            slots['end'][mask].astype('datetime64[us]').tolist(),
+            slots['seconds'][mask].tolist(),
+            slots['author'][mask].tolist(),
+            slots['ticket'][mask].tolist(),
+            slots['repo'][mask].tolist()
+        ):
+            # Créneaux triés par ticket puis par journée : chaque liste de l'index reste chronologique
+            index.add_slot(self.tickets[ticket_code], TicketSlot(
+                day, start, end, timedelta(seconds=seconds), self.repos[repo_code] or None, self.authors[author_code] or None
+            ))
+        return index
@@ -0,0 +1,118 @@
+import json
+from textwrap import indent
+
+
+class JsonArrayWriter:
+    """
+    Écrit un tableau JSON élément par élément, avec la mise en forme de
+    json.dump(indent=4, sort_keys=True, default=str) : seul l'élément en cours est en mémoire.
+
+    Usage :
+        with JsonArrayWriter(fp) as writer:
+            for item in items:
+                writer.write(item)
+    """
+
+    INDENT = 4
+
+    def __init__(self, fp, level=0):
+        """
+        Initialise l'écrivain.
+
+        Args:
+            fp: Le fichier texte de sortie.
+            level: Le niveau d'imbrication du tableau (0 pour un tableau racine).
+        """
+        self.fp = fp
+        self.prefix = ' ' * (self.INDENT * (level + 1))
+        self.closing = ' ' * (self.INDENT * level)
+        self.count = 0
+
+    def __enter__(self):
+        self.fp.write('[')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def begin_item(self):
+        """Écrit le séparateur et l'indentation précédant un élément (pour un élément écrit à la main)."""
+        self.fp.write(',\n' if self.count else '\n')
+        self.fp.write(self.prefix)
+        self.count += 1
+
+    def write(self, item):
+        """Écrit un élément du tableau."""
+        self.begin_item()
+        text = json.dumps(item, indent=self.INDENT, sort_keys=True, default=str)
+        self.fp.write(indent(text, self.prefix)[len(self.prefix):])
+
+    def close(self):
+        """Termine le tableau."""
+        self.fp.write(f'\n{self.closing}]' if self.count else ']')
+
+
+def escape_attribute(value):
+    """Échappe une valeur d'attribut XML (comme xml.dom.minidom)."""
+    return (value.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('"', '&quot;').replace('>', '&gt;'))
+
+
+class XmlStreamWriter:
+    """
+    Écrit un document XML élément par élément, avec la mise en forme de
+    minidom.toprettyxml(indent="   ") : seul l'élément en cours est en mémoire.
+
+    Un élément sans enfant est écrit sous forme auto-fermante (<tag/>) ; l'ouverture d'un élément
+    n'est donc terminée qu'à l'arrivée de son premier enfant ou de sa fermeture.
+    """
+
+    def __init__(self, fp, indent="   "):
+        """
+        Initialise l'écrivain.
+
+        Args:
+            fp: Le fichier texte de sortie.
+            indent: L'indentation ajoutée à chaque niveau.
+        """
+        self.fp = fp
+        self.indent = indent
+        self.stack = []  # [nom, a des enfants] des éléments ouverts
+
+    def start_document(self):
+        """Écrit la déclaration XML."""
+        self.fp.write('<?xml version="1.0" ?>\n')
+
+    def _open_parent(self):
+        """Termine la balise ouvrante du parent lorsqu'il reçoit son premier enfant."""
+        if self.stack and not self.stack[-1][1]:
+            self.fp.write('>\n')
+            self.stack[-1][1] = True
+
+    def start_element(self, name, attributes=None):
+        """
+        Ouvre un élément.
+
+        Args:
+            name: Le nom de l'élément.
+            attributes: Les attributs (dans l'ordre d'écriture), ou None.
+        """
+        self._open_parent()
+        self.fp.write(f'{self.indent * len(self.stack)}<{name}')
+        for key, value in (attributes or {}).items():
+            self.fp.write(f' {key}="{escape_attribute(value)}"')
+        self.stack.append([name, False])
+
+    def end_element(self):
+        """Ferme l'élément ouvert le plus récent."""
+        name, has_children = self.stack.pop()
+        if has_children:
+            self.fp.write(f'{self.indent * len(self.stack)}</{name}>\n')
+        else:
+            self.fp.write('/>\n')
+
+    def element(self, name, attributes=None):
+        """Écrit un élément sans enfant."""
+        self.start_element(name, attributes)
+        self.end_element()
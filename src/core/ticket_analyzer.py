@@ -1,5 +1,18 @@
+import hashlib
+import math
+import os
 import re
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+from src.core.work_calendar import WorkCalendar
+from src.utils.profiling import profiler
+
+
+# Nombre de commits à partir duquel l'analyse peut être répartie sur un pool de processus
+# (en deçà, le démarrage des processus, qui importent pandas, coûte plus que l'analyse : environ
+# une seconde par processus, contre une quinzaine de ms pour 1000 commits en séquentiel ; voir
+# benchmarks/pipeline.py --processes N --parallel-sizes ...)
+PARALLEL_MIN_COMMITS = 100000
 
 
 class TicketAnalyzer:
@@ -15,36 +28,142 @@ class TicketAnalyzer:
         self.config = config
         self.ticket_pattern = re.compile(config.get_ticket_pattern())
     
-    def extract_tickets_from_dataframe(self, df):
+    def extract_tickets_from_dataframe(self, df, engine=None, processes=None):
         """
         Extrait les tickets et calcule le temps passé à partir d'un DataFrame.
         
+        Au-delà de PARALLEL_MIN_COMMITS commits, et si plusieurs processus sont configurés, les
+        journées sont réparties sur un pool de processus (voir parallel_analysis).
+        
+        Args:
+            df: Un DataFrame pandas contenant les logs Git.
+            engine: Le moteur d'analyse ('vectorized' ou 'loop'), par défaut celui de la configuration.
+            processes: Le nombre de processus d'analyse, par défaut celui de la configuration.
+            
+        Returns:
+            Un dictionnaire des infos par journée et par ticket : durée, heure de début, heure de fin,
+            auteur et dépôt du commit (None si le DataFrame n'a pas ces colonnes). Si un ticket chevauche une pause (déjeuner, par exemple), il est découpé en un créneau
+            par plage de travail. Les journées non travaillées du calendrier sont ignorées.
+        """
+        engine = engine or self.config.get_analysis_engine()
+        calendar = WorkCalendar.from_config(self.config)
+        # Au-delà du nombre de cœurs, les processus se partagent le calcul sans l'accélérer
+        processes = min(processes or self.config.get_analysis_processes(), os.cpu_count() or 1)
+        with profiler.span('extract_tickets', engine=engine, rows=len(df)) as span:
+            if processes > 1 and len(df) >= PARALLEL_MIN_COMMITS:
+                from src.core.parallel_analysis import analyze_parallel
+                
+                span.set(processes=processes)
+                return analyze_parallel(self.config, df, engine, processes)
+            if engine == 'loop':
+                return self.extract_tickets_loop(df, calendar)
+            return self.extract_tickets_vectorized(df, calendar)
+    
+    def day_digests(self, df, engine=None, calendar=None):
+        """
+        Calcule l'empreinte de chaque journée : ses commits (hash, auteur, date, message, dépôt,
+        dans l'ordre d'analyse) et les paramètres qui influent sur son résultat (motif de ticket,
+        plages de travail du jour, heures par jour, moteur).
+        
         Args:
             df: Un DataFrame pandas contenant les logs Git.
+            engine: Le moteur d'analyse, par défaut celui de la configuration.
+            calendar: Le calendrier de travail (par défaut, celui de la configuration).
             
         Returns:
-            Un dictionnaire des infos par journée et par ticket : durée, heure de début, heure de fin.
-            Si un ticket chevauche la pause déjeuner, il est dupliqué (avant et après la pause).
-        """
-        work_periods = self.config.get_work_periods()
-        morning_start = work_periods['morning']['start']
-        morning_end = work_periods['morning']['end']
-        afternoon_start = work_periods['afternoon']['start']
-        afternoon_end = work_periods['afternoon']['end']
+            Le dictionnaire {journée: empreinte} des journées qui ont des commits.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        engine = engine or self.config.get_analysis_engine()
+        calendar = calendar or WorkCalendar.from_config(self.config)
+        df = df[df['date'].notna()].sort_values(by=['date'], kind='stable')
+        if df.empty:
+            return {}
+        columns = [column for column in ('hash', 'author', 'date', 'message', 'repo') if column in df]
+        row_hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+        days = df['date'].dt.normalize().to_numpy()
+        starts = np.flatnonzero(np.append(True, days[1:] != days[:-1]))
+        stops = np.append(starts[1:], len(days))
+        settings = f"{self.ticket_pattern.pattern}\x1f{self.config.get_work_hours_per_day()}\x1f{engine}"
+        digests = {}
+        for journee, start, stop in zip(pd.DatetimeIndex(days[starts]).date, starts, stops):
+            digest = hashlib.blake2b(row_hashes[start:stop].tobytes(), digest_size=16)
+            digest.update(f"{journee}\x1f{calendar.periods(journee)}\x1f{settings}".encode('utf-8'))
+            digests[journee] = digest.hexdigest()
+        return digests
+    
+    def analyze_days(self, df, day_cache, engine=None, progress=None):
+        """
+        Analyse les tickets et ajuste les durées en ne traitant que les journées absentes du cache.
+        
+        Chaque journée ne dépend que de ses commits et des paramètres d'analyse : une journée dont
+        l'empreinte (voir day_digests) est déjà en cache reprend son résultat ; les autres
+        (typiquement la journée en cours après une extraction incrémentale) sont analysées puis
+        ajustées, et leur résultat est inséré à sa place.
+        
+        Args:
+            df: Un DataFrame pandas contenant les logs Git.
+            day_cache: Le cache des résultats par journée (DayResultCache).
+            engine: Le moteur d'analyse, par défaut celui de la configuration.
+            progress: Fonction (journées à analyser, journées de la période) appelée avant l'analyse, ou None.
+            
+        Returns:
+            Le dictionnaire des durées ajustées par journée (voir extract_tickets_from_dataframe).
+        """
+        engine = engine or self.config.get_analysis_engine()
+        calendar = WorkCalendar.from_config(self.config)
+        with profiler.span('day digests', rows=len(df)) as span:
+            digests = self.day_digests(df, engine, calendar)
+            known, missing = day_cache.lookup(digests)
+            span.set(days=len(digests), changed=len(missing))
+        if progress is not None:
+            progress(len(missing), len(digests))
+        
+        fresh = {}
+        if missing:
+            changed = df[df['date'].dt.date.isin(set(missing))]
+            fresh = self.adjust_durations(self.extract_tickets_from_dataframe(changed, engine))
+            day_cache.update({journee: digests[journee] for journee in missing}, fresh)
+        
+        # Journées dans l'ordre chronologique ; les journées non travaillées (None) sont écartées
+        durees_par_journee = {}
+        for journee in digests:
+            tickets = known[journee] if journee in known else fresh.get(journee)
+            if tickets is not None:
+                durees_par_journee[journee] = tickets
+        return durees_par_journee
+    
+    def extract_tickets_loop(self, df, calendar=None):
+        """
+        Moteur d'analyse historique : parcourt les commits jour par jour, un par un.
+        
+        Args:
+            df: Un DataFrame pandas contenant les logs Git.
+            calendar: Le calendrier de travail (par défaut, celui de la configuration).
+            
+        Returns:
+            Le dictionnaire des infos par journée (voir extract_tickets_from_dataframe).
+        """
+        calendar = calendar or WorkCalendar.from_config(self.config)
         infos_par_journee = {}
-        df = df.sort_values(by=['date'])
+        df = df.sort_values(by=['date'], kind='stable')
         for journee, group in df.groupby(df['date'].dt.date):
-            commits = list(group.sort_values(by=['date']).itertuples(index=False))
-            heure_debut_journee = datetime.combine(journee, datetime.strptime(morning_start, '%H:%M').time())
-            heure_fin_matin = datetime.combine(journee, datetime.strptime(morning_end, '%H:%M').time())
-            heure_debut_aprem = datetime.combine(journee, datetime.strptime(afternoon_start, '%H:%M').time())
-            heure_fin_journee = datetime.combine(journee, datetime.strptime(afternoon_end, '%H:%M').time())
+            bounds = calendar.bounds(journee)
+            if not bounds:
+                continue
+            commits = list(group.sort_values(by=['date'], kind='stable').itertuples(index=False))
+            heure_debut_journee = bounds[0][0]
+            heure_fin_journee = bounds[-1][1]
             heure_courante = heure_debut_journee
             infos_par_journee[journee] = []
             tickets_du_jour = []
             for row in commits:
                 commit_subject = getattr(row, 'message')
                 commit_date = getattr(row, 'date')
+                author = getattr(row, 'author', None)
+                repo = getattr(row, 'repo', None)
                 match = self.ticket_pattern.search(commit_subject)
                 if not match:
                     continue
@@ -53,46 +172,26 @@ class TicketAnalyzer:
                     continue
                 heure_debut = heure_courante
                 heure_fin = commit_date
-                erreur = False
                 try:
-                    if heure_debut < heure_fin_matin and heure_fin > heure_fin_matin:
-                        # Première partie : matin
-                        duree1 = heure_fin_matin - heure_debut
-                        if duree1.total_seconds() < 0:
-                            duree1 = timedelta(0)
-                            erreur = True
-                        duree2 = heure_fin - heure_debut_aprem
-                        if duree2.total_seconds() < 0:
-                            duree2 = timedelta(0)
-                            erreur = True
-                        infos_par_journee[journee].append({
-                            'ticket': ticket_code,
-                            'duree': duree1,
-                            'debut': heure_debut,
-                            'fin': heure_fin_matin,
-                            'erreur': erreur,
-                            'message': commit_subject
-                        })
-                        infos_par_journee[journee].append({
-                            'ticket': ticket_code,
-                            'duree': duree2,
-                            'debut': heure_debut_aprem,
-                            'fin': heure_fin,
-                            'erreur': erreur,
-                            'message': commit_subject
-                        })
-                    else:
-                        duree = heure_fin - heure_debut
+                    # Un créneau par plage de travail traversée
+                    creneaux = []
+                    erreur = False
+                    for debut, fin in calendar.split(heure_debut, heure_fin, bounds):
+                        duree = fin - debut
                         if duree.total_seconds() < 0:
                             duree = timedelta(0)
                             erreur = True
+                        creneaux.append((duree, debut, fin))
+                    for duree, debut, fin in creneaux:
                         infos_par_journee[journee].append({
                             'ticket': ticket_code,
                             'duree': duree,
-                            'debut': heure_debut,
-                            'fin': heure_fin,
+                            'debut': debut,
+                            'fin': fin,
                             'erreur': erreur,
-                            'message': commit_subject
+                            'message': commit_subject,
+                            'author': author,
+                            'repo': repo
                         })
                 except Exception:
                     infos_par_journee[journee].append({
@@ -101,7 +200,9 @@ class TicketAnalyzer:
                         'debut': heure_debut,
                         'fin': heure_fin,
                         'erreur': True,
-                        'message': commit_subject
+                        'message': commit_subject,
+                        'author': author,
+                        'repo': repo
                     })
                 heure_courante = heure_fin
                 tickets_du_jour.append(ticket_code)
@@ -122,6 +223,214 @@ class TicketAnalyzer:
                         dernier['erreur'] = True
         return infos_par_journee
     
+    def extract_ticket_codes(self, messages):
+        """
+        Extrait le code de ticket (première correspondance du pattern) de chaque message.
+        
+        Args:
+            messages: Une Series pandas de messages de commit.
+            
+        Returns:
+            Une Series des codes de ticket (NaN si aucun ticket).
+        """
+        pattern = self.ticket_pattern.pattern
+        # Les références arrière numérotées seraient décalées par le groupe englobant
+        if re.search(r'\\[1-9]', pattern):
+            return messages.map(lambda message: self._search_ticket(message))
+        # Les options globales en ligne ((?i)...) doivent rester en tête du pattern
+        options = re.match(r'(?:\(\?[aiLmsux]+\))*', pattern).group(0)
+        # Le groupe englobant capture la correspondance complète (équivalent de match.group(0))
+        return messages.str.extract(f'{options}({pattern[len(options):]})', flags=self.ticket_pattern.flags, expand=True)[0]
+    
+    def _search_ticket(self, message):
+        """Retourne le code de ticket d'un message, ou NaN."""
+        match = self.ticket_pattern.search(message) if isinstance(message, str) else None
+        return match.group(0) if match else math.nan
+    
+    def extract_tickets_vectorized(self, df, calendar=None):
+        """
+        Moteur d'analyse vectorisé : mêmes résultats que extract_tickets_loop, calculés sur tout
+        le DataFrame à la fois (extraction des tickets, dédoublonnage par jour, enchaînement des
+        créneaux et découpe aux pauses par masques).
+        
+        Args:
+            df: Un DataFrame pandas contenant les logs Git.
+            calendar: Le calendrier de travail (par défaut, celui de la configuration).
+            
+        Returns:
+            Le dictionnaire des infos par journée (voir extract_tickets_from_dataframe).
+        """
+        return self.infos_from_slots(*self.vectorized_slots(df, calendar))
+    
+    def vectorized_slots(self, df, calendar=None):
+        """
+        Calcule les créneaux du moteur vectorisé sous forme de colonnes, sans construire les
+        dictionnaires (voir infos_from_slots).
+        
+        Args:
+            df: Un DataFrame pandas contenant les logs Git.
+            calendar: Le calendrier de travail (par défaut, celui de la configuration).
+            
+        Returns:
+            Un tuple (journées travaillées ayant des commits, dans l'ordre ; colonnes des créneaux
+            ou None s'il n'y en a aucun).
+        """
+        import numpy as np
+        import pandas as pd
+        
+        calendar = calendar or WorkCalendar.from_config(self.config)
+        
+        df = df[df['date'].notna()].sort_values(by=['date'], kind='stable')
+        dates = df['date'].reset_index(drop=True)
+        days = dates.dt.normalize()
+        
+        # Plages de chaque journée distincte ; les journées non travaillées sont écartées
+        unique_days = days.drop_duplicates()
+        day_periods = {journee: calendar.periods(journee) for journee in unique_days.dt.date}
+        working = days.dt.date.map(lambda journee: bool(day_periods[journee])).to_numpy(dtype=bool)
+        dates = dates[working].reset_index(drop=True)
+        days = days[working].reset_index(drop=True)
+        messages = df['message'].reset_index(drop=True)[working].reset_index(drop=True)
+        authors, repos = (
+            df[column].reset_index(drop=True)[working].reset_index(drop=True) if column in df else None
+            for column in ('author', 'repo')
+        )
+        
+        # Toutes les journées travaillées ayant des commits apparaissent, même sans ticket
+        journees = days.drop_duplicates().dt.date.tolist()
+        
+        # Première occurrence de chaque ticket dans la journée
+        tickets = self.extract_ticket_codes(messages)
+        commits = pd.DataFrame({
+            'day': days,
+            'date': dates,
+            'ticket': tickets,
+            'message': messages,
+            'author': authors,
+            'repo': repos
+        })
+        commits = commits[commits['ticket'].notna()]
+        commits = commits[~commits.duplicated(subset=['day', 'ticket'])]
+        if commits.empty:
+            return journees, None
+        
+        # Tables des plages (une ligne par profil de journée, complétées par une borne inatteignable)
+        profiles = sorted(set(day_periods[journee] for journee in journees))
+        profile_index = {profile: index for index, profile in enumerate(profiles)}
+        width = max(len(profile) for profile in profiles)
+        never = np.timedelta64(7 * 24 * 60, 'm').astype('timedelta64[ns]')
+        starts = np.full((len(profiles), width), never)
+        ends = np.full((len(profiles), width), never)
+        for index, periods in enumerate(profiles):
+            for column, (start, end) in enumerate(periods):
+                starts[index, column] = self._minutes_offset(start)
+                ends[index, column] = self._minutes_offset(end)
+        day_start = starts[:, 0]
+        day_end = np.array([ends[index, len(periods) - 1] for index, periods in enumerate(profiles)])
+        
+        # Chaque ticket commence à la fin du précédent (ou au début de la journée)
+        day = commits['day'].to_numpy()
+        profile = commits['day'].dt.date.map(lambda journee: profile_index[day_periods[journee]]).to_numpy(dtype=np.intp)
+        fin = commits['date'].to_numpy()
+        debut = commits.groupby('day')['date'].shift(1).to_numpy(copy=True)
+        first_ticket = np.isnat(debut)
+        debut[first_ticket] = day[first_ticket] + day_start[profile[first_ticket]]
+        zero = np.timedelta64(0, 'ns')
+        
+        # Pauses traversées : fins de plage (hors dernière) comprises strictement entre début et fin
+        lengths = np.array([len(periods) for periods in profiles])
+        inner_ends = np.where(np.arange(width) < lengths[:, None] - 1, ends, never)
+        row_ends = day[:, None] + inner_ends[profile]
+        first = (row_ends <= debut[:, None]).sum(axis=1)
+        crossed = np.maximum((row_ends < fin[:, None]).sum(axis=1) - first, 0)
+        
+        # Un créneau par plage traversée : coupé à la fin de la plage, repris au début de la suivante
+        repeats = crossed + 1
+        index = np.repeat(np.arange(len(repeats)), repeats)
+        piece = np.arange(len(index)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        slot_day = day[index]
+        slot_profile = profile[index]
+        column = np.minimum(first[index] + piece, width - 1)
+        slot_debut = np.where(piece == 0, debut[index], slot_day + starts[slot_profile, column])
+        slot_fin = np.where(piece == crossed[index], fin[index], slot_day + ends[slot_profile, column])
+        slot_duree = slot_fin - slot_debut
+        
+        # Un créneau de durée négative met tout le ticket en erreur
+        negative = slot_duree < zero
+        erreur = np.add.reduceat(negative.astype(np.intp), np.cumsum(repeats) - repeats) > 0
+        slot_erreur = erreur[index]
+        slot_duree = np.maximum(slot_duree, zero)
+        
+        # Forcer l'heure de fin du dernier ticket de chaque journée à la fin de la journée
+        last = np.append(slot_day[1:] != slot_day[:-1], True)
+        fin_journee = slot_day + day_end[slot_profile]
+        forced = last & (slot_fin < fin_journee)
+        duree_forcee = fin_journee - slot_debut
+        slot_erreur = slot_erreur | (forced & (duree_forcee < zero))
+        slot_duree = np.where(forced, np.maximum(duree_forcee, zero), slot_duree)
+        slot_fin = np.where(forced, fin_journee, slot_fin)
+        
+        return journees, {
+            'day': slot_day,
+            'ticket': commits['ticket'].to_numpy()[index],
+            'duree': slot_duree,
+            'debut': slot_debut,
+            'fin': slot_fin,
+            'erreur': slot_erreur,
+            'message': commits['message'].to_numpy()[index],
+            'author': commits['author'].to_numpy()[index],
+            'repo': commits['repo'].to_numpy()[index]
+        }
+    
+    @staticmethod
+    def infos_from_slots(journees, slots):
+        """
+        Construit le dictionnaire des infos par journée à partir de colonnes de créneaux.
+        
+        Args:
+            journees: Les journées travaillées ayant des commits, dans l'ordre.
+            slots: Les colonnes des créneaux (journée, ticket, durée, début, fin, erreur, message,
+                auteur, dépôt), triés par journée, ou None.
+                
+        Returns:
+            Le dictionnaire des infos par journée (voir extract_tickets_from_dataframe) ; les dates
+            et durées sont des Timestamp et des Timedelta.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        infos_par_journee = {journee: [] for journee in journees}
+        if slots is None:
+            return infos_par_journee
+        for journee, ticket, duree_slot, debut_slot, fin_slot, erreur_slot, message, author, repo in zip(
+            pd.Series(slots['day']).dt.date,
+            slots['ticket'],
+            pd.Series(slots['duree']).tolist(),
+            pd.Series(slots['debut']).tolist(),
+            pd.Series(slots['fin']).tolist(),
+            np.asarray(slots['erreur']).tolist(),
+            slots['message'],
+            list(slots['author']),
+            list(slots['repo'])
+        ):
+            infos_par_journee[journee].append({
+                'ticket': ticket,
+                'duree': duree_slot,
+                'debut': debut_slot,
+                'fin': fin_slot,
+                'erreur': erreur_slot,
+                'message': message,
+                'author': author,
+                'repo': repo
+            })
+        return infos_par_journee
+    
+    def _minutes_offset(self, minutes):
+        """Convertit un nombre de minutes depuis minuit en décalage numpy."""
+        import numpy as np
+        
+        return np.timedelta64(minutes, 'm').astype('timedelta64[ns]')
+    
     def adjust_durations(self, durees_par_journee):
         """
         Ajuste les durées pour que le total par jour soit égal au nombre d'heures de travail configuré.
@@ -133,15 +442,16 @@ class TicketAnalyzer:
             Un dictionnaire des durées ajustées par journée et par ticket.
         """
         work_hours = self.config.get_work_hours_per_day()
-        for tickets in durees_par_journee.values():
-            total_duree = sum((t['duree'] for t in tickets), timedelta())
-            duree_diff = timedelta(hours=work_hours) - total_duree
-            num_tickets = len(tickets)
-            if num_tickets == 0:
-                continue
-            duree_adjust = duree_diff / num_tickets
-            for t in tickets:
-                t['duree'] += duree_adjust
+        with profiler.span('adjust_durations', rows=len(durees_par_journee)):
+            for tickets in durees_par_journee.values():
+                total_duree = sum((t['duree'] for t in tickets), timedelta())
+                duree_diff = timedelta(hours=work_hours) - total_duree
+                num_tickets = len(tickets)
+                if num_tickets == 0:
+                    continue
+                duree_adjust = duree_diff / num_tickets
+                for t in tickets:
+                    t['duree'] += duree_adjust
         return durees_par_journee
     
     def filter_valid_days(self, durees_par_journee):
@@ -0,0 +1,150 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import timedelta
+
+
+# Créneau d'un ticket : journée, heures de début et de fin, durée (ajustée), dépôt et auteur du commit
+TicketSlot = namedtuple('TicketSlot', ['day', 'start', 'end', 'duration', 'repo', 'author'])
+
+
+class TicketIndex:
+    """
+    Index inversé des résultats d'analyse : code de ticket -> créneaux, triés par journée.
+
+    Construit une fois à partir des durées par journée (ou des créneaux enregistrés avec les
+    tables d'agrégats, voir RollupStore.ticket_index), il répond aux questions par ticket (total,
+    historique, dépôts et auteurs) et au classement des tickets sur une période, sans relancer
+    l'analyse ni parcourir les listes de toutes les journées : la période d'un ticket est
+    retrouvée par recherche dichotomique dans ses journées.
+    """
+
+    def __init__(self):
+        self.slots = {}  # ticket -> [TicketSlot] dans l'ordre des journées
+        self.days = {}  # ticket -> [journée de chaque créneau], pour la recherche dichotomique
+
+    @classmethod
+    def from_durations(cls, durees_par_journee):
+        """
+        Construit l'index à partir des durées par journée.
+
+        Args:
+            durees_par_journee: Le dictionnaire {journée: [tickets]} issu de l'analyse.
+
+        Returns:
+            Le TicketIndex.
+        """
+        index = cls()
+        for journee in sorted(durees_par_journee):
+            index.add_day(journee, durees_par_journee[journee])
+        return index
+
+    def add_day(self, journee, tickets):
+        """
+        Ajoute les créneaux d'une journée (les journées doivent être ajoutées dans l'ordre).
+
+        Args:
+            journee: La journée.
+            tickets: Les créneaux de la journée (dicts).
+        """
+        for t in tickets:
+            self.add_slot(t['ticket'], TicketSlot(journee, t['debut'], t['fin'], t['duree'], t.get('repo'), t.get('author')))
+
+    def add_slot(self, ticket, slot):
+        """
+        Ajoute un créneau (les créneaux d'un ticket doivent être ajoutés dans l'ordre des journées).
+
+        Args:
+            ticket: Le code du ticket.
+            slot: Le TicketSlot.
+        """
+        self.slots.setdefault(ticket, []).append(slot)
+        self.days.setdefault(ticket, []).append(slot.day)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, ticket):
+        return ticket in self.slots
+
+    def tickets(self):
+        """Retourne les codes de ticket indexés, triés."""
+        return sorted(self.slots)
+
+    def slots_for(self, ticket, date_from=None, date_to=None):
+        """
+        Retourne les créneaux d'un ticket sur une période.
+
+        Args:
+            ticket: Le code du ticket.
+            date_from: Premier jour inclus, ou None.
+            date_to: Dernier jour inclus, ou None.
+
+        Returns:
+            La liste des TicketSlot, dans l'ordre chronologique.
+        """
+        slots = self.slots.get(ticket, [])
+        days = self.days.get(ticket, [])
+        start = bisect_left(days, date_from) if date_from is not None else 0
+        stop = bisect_right(days, date_to) if date_to is not None else len(days)
+        return slots[start:stop]
+
+    def total(self, ticket, date_from=None, date_to=None):
+        """Retourne le temps passé sur un ticket (timedelta) sur une période."""
+        return sum((slot.duration for slot in self.slots_for(ticket, date_from, date_to)), timedelta())
+
+    def history(self, ticket, date_from=None, date_to=None):
+        """
+        Retourne le temps passé sur un ticket, journée par journée.
+
+        Returns:
+            Une liste de tuples (journée, durée), dans l'ordre chronologique.
+        """
+        history = []
+        for slot in self.slots_for(ticket, date_from, date_to):
+            if history and history[-1][0] == slot.day:
+                history[-1] = (slot.day, history[-1][1] + slot.duration)
+            else:
+                history.append((slot.day, slot.duration))
+        return history
+
+    def totals(self, date_from=None, date_to=None):
+        """
+        Retourne le temps passé par ticket sur une période.
+
+        Returns:
+            Un dictionnaire {ticket: durée} (les tickets sans créneau sur la période sont omis).
+        """
+        totals = {}
+        for ticket in self.slots:
+            slots = self.slots_for(ticket, date_from, date_to)
+            if slots:
+                totals[ticket] = sum((slot.duration for slot in slots), timedelta())
+        return totals
+
+    def top(self, n=10, date_from=None, date_to=None):
+        """
+        Retourne les tickets qui ont occupé le plus de temps sur une période.
+
+        Args:
+            n: Le nombre de tickets.
+            date_from: Premier jour inclus, ou None.
+            date_to: Dernier jour inclus, ou None.
+
+        Returns:
+            Une liste de tuples (ticket, durée), par durée décroissante.
+        """
+        return heapq.nlargest(n, self.totals(date_from, date_to).items(), key=lambda item: item[1])
+
+    def contributors(self, ticket, date_from=None, date_to=None):
+        """
+        Retourne le temps passé sur un ticket par auteur et par dépôt.
+
+        Returns:
+            Un dictionnaire {(auteur, dépôt): durée}.
+        """
+        contributors = {}
+        for slot in self.slots_for(ticket, date_from, date_to):
+            key = (slot.author, slot.repo)
+            contributors[key] = contributors.get(key, timedelta()) + slot.duration
+        return contributors
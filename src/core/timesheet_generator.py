@@ -1,9 +1,29 @@
 import json
-import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
 import os
 from datetime import datetime
 
+from src.core.exporters import FLAT_EXPORTERS
+from src.core.stream_writers import JsonArrayWriter, XmlStreamWriter
+from src.utils.profiling import profiler
+
+
+# Formats d'export documentaires (structure par journée), en plus des formats à plat de FLAT_EXPORTERS
+DOCUMENT_FORMATS = {'json': 'JSON', 'xml': 'XML'}
+
+
+def available_export_formats():
+    """
+    Retourne les formats d'export utilisables.
+    
+    Returns:
+        Un dictionnaire ordonné {format: libellé} (les formats dont les dépendances manquent sont omis).
+    """
+    formats = dict(DOCUMENT_FORMATS)
+    for export_format, exporter in FLAT_EXPORTERS.items():
+        if exporter.is_available():
+            formats[export_format] = exporter.label
+    return formats
+
 
 class TimesheetGenerator:
     """Classe pour générer des feuilles de temps à partir des données d'analyse de tickets."""
@@ -17,15 +37,150 @@ class TimesheetGenerator:
         """
         self.config = config
         self.export_path = self.config.get_export_path()
+    
+    def default_output_file(self, extension, name=None):
+        """
+        Retourne un nom de fichier horodaté dans le répertoire d'exportation.
+        
+        Le répertoire est créé ici, à la première exportation, et non au démarrage.
         
-        # Créer le répertoire d'exportation s'il n'existe pas
-        if not os.path.exists(self.export_path):
-            os.makedirs(self.export_path)
+        Args:
+            extension: L'extension du fichier (sans le point).
+            name: Un complément de nom (l'auteur, par exemple), ou None.
+            
+        Returns:
+            Le chemin du fichier de sortie.
+        """
+        os.makedirs(self.export_path, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = f"timesheet_{file_name_part(name)}" if name else "timesheet"
+        return os.path.join(self.export_path, f"{prefix}_{timestamp}.{extension}")
+    
+    def generate(self, export_format, durees_par_journee, output_file=None, author=None):
+        """
+        Génère la feuille de temps d'un auteur dans le format demandé.
+        
+        Args:
+            export_format: Le format ('json', 'xml' ou un format de FLAT_EXPORTERS).
+            durees_par_journee: Un dictionnaire {jour: [tickets]} où chaque ticket est un dict.
+            output_file: Le nom du fichier de sortie (par défaut horodaté dans le dossier d'exportation).
+            author: L'auteur (complète le nom de fichier par défaut et la colonne author des formats à plat).
+            
+        Returns:
+            Le chemin du fichier généré.
+        
+        Raises:
+            ValueError: Si le format est inconnu.
+        """
+        if output_file is None:
+            output_file = self.default_output_file(export_format, author)
+        if export_format == 'json':
+            return self.generate_json(durees_par_journee, output_file)
+        if export_format == 'xml':
+            return self.generate_xml(durees_par_journee, output_file)
+        with profiler.span('export', format=export_format) as span:
+            self.flat_exporter(export_format).write(output_file, [(author, durees_par_journee)])
+            span.set(bytes=os.path.getsize(output_file))
+        return output_file
+    
+    def generate_combined(self, export_format, durees_par_auteur, output_file=None):
+        """
+        Génère un fichier unique pour plusieurs auteurs dans le format demandé.
+        
+        Args:
+            export_format: Le format ('json', 'xml' ou un format de FLAT_EXPORTERS).
+            durees_par_auteur: Un dictionnaire {auteur: {jour: [tickets]}}.
+            output_file: Le nom du fichier de sortie (par défaut horodaté dans le dossier d'exportation).
+            
+        Returns:
+            Le chemin du fichier généré.
+        
+        Raises:
+            ValueError: Si le format est inconnu.
+        """
+        if output_file is None:
+            output_file = self.default_output_file(export_format, 'equipe')
+        if export_format == 'json':
+            return self.generate_combined_json(durees_par_auteur, output_file)
+        if export_format == 'xml':
+            return self.generate_combined_xml(durees_par_auteur, output_file)
+        with profiler.span('export', format=export_format) as span:
+            self.flat_exporter(export_format).write(output_file, durees_par_auteur.items())
+            span.set(bytes=os.path.getsize(output_file))
+        return output_file
+    
+    def flat_exporter(self, export_format):
+        """Retourne l'exportateur à plat d'un format."""
+        exporter = FLAT_EXPORTERS.get(export_format)
+        if exporter is None:
+            raise ValueError(f"Format d'export inconnu : {export_format}")
+        return exporter()
+    
+    def json_day(self, journee, tickets):
+        """
+        Convertit une journée en objet sérialisable en JSON.
+        
+        Args:
+            journee: La journée.
+            tickets: La liste des tickets de la journée (dicts).
+            
+        Returns:
+            Le dictionnaire {"day": ..., "tickets": [...]}.
+        """
+        day_data = {
+            "day": str(journee),
+            "tickets": []
+        }
+        for t in tickets:
+            duration = str(t['duree'].total_seconds())
+            day_data["tickets"].append({
+                "code": t['ticket'],
+                "duration": duration,
+                "start": t['debut'].strftime('%H:%M'),
+                "end": t['fin'].strftime('%H:%M'),
+                "message": t['message']
+            })
+        return day_data
+    
+    def write_json_days(self, fp, durees_par_journee, level=0):
+        """
+        Écrit le tableau JSON des journées, une journée à la fois.
+        
+        Args:
+            fp: Le fichier texte de sortie.
+            durees_par_journee: Un dictionnaire {jour: [tickets]} où chaque ticket est un dict.
+            level: Le niveau d'imbrication du tableau.
+        """
+        with JsonArrayWriter(fp, level) as writer:
+            for journee, tickets in durees_par_journee.items():
+                writer.write(self.json_day(journee, tickets))
+    
+    def write_xml_days(self, writer, durees_par_journee):
+        """
+        Écrit les journées et leurs tickets dans l'élément XML ouvert.
+        
+        Args:
+            writer: L'écrivain XML (XmlStreamWriter).
+            durees_par_journee: Un dictionnaire {jour: [tickets]} où chaque ticket est un dict.
+        """
+        for journee, tickets in durees_par_journee.items():
+            writer.start_element('day', {'date': str(journee)})
+            for t in tickets:
+                writer.element('ticket', {
+                    'code': t['ticket'],
+                    'duration': str(t['duree'].total_seconds()),
+                    'start': t['debut'].strftime('%H:%M'),
+                    'end': t['fin'].strftime('%H:%M'),
+                    'message': t['message']
+                })
+            writer.end_element()
     
     def generate_json(self, durees_par_journee, output_file=None):
         """
         Génère un fichier JSON à partir des durées par journée.
         
+        Le fichier est écrit journée par journée, sans construire le document en mémoire.
+        
         Args:
             durees_par_journee: Un dictionnaire {jour: [tickets]} où chaque ticket est un dict.
             output_file: Le nom du fichier de sortie.
@@ -34,33 +189,18 @@ class TimesheetGenerator:
             Le chemin du fichier JSON généré.
         """
         if output_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = os.path.join(self.export_path, f"timesheet_{timestamp}.json")
-        json_array = []
-        for journee, tickets in durees_par_journee.items():
-            day = str(journee)
-            day_data = {
-                "day": day,
-                "tickets": []
-            }
-            for t in tickets:
-                duration = str(t['duree'].total_seconds())
-                day_data["tickets"].append({
-                    "code": t['ticket'],
-                    "duration": duration,
-                    "start": t['debut'].strftime('%H:%M'),
-                    "end": t['fin'].strftime('%H:%M'),
-                    "message": t['message']
-                })
-            json_array.append(day_data)
-        with open(output_file, 'w', encoding='utf-8') as fp:
-            json.dump(json_array, fp, indent=4, sort_keys=True, default=str)
+            output_file = self.default_output_file('json')
+        with profiler.span('export', format='json') as span, open(output_file, 'w', encoding='utf-8') as fp:
+            self.write_json_days(fp, durees_par_journee)
+            span.set(rows=len(durees_par_journee), bytes=fp.tell())
         return output_file
     
     def generate_xml(self, durees_par_journee, output_file=None):
         """
         Génère un fichier XML à partir des durées par journée.
         
+        Le fichier est écrit journée par journée, sans construire le document en mémoire.
+        
         Args:
             durees_par_journee: Un dictionnaire {jour: [tickets]} où chaque ticket est un dict.
             output_file: Le nom du fichier de sortie.
@@ -69,19 +209,67 @@ class TimesheetGenerator:
             Le chemin du fichier XML généré.
         """
         if output_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = os.path.join(self.export_path, f"timesheet_{timestamp}.xml")
-        root = ET.Element('timesheet')
-        for journee, tickets in durees_par_journee.items():
-            day = ET.SubElement(root, 'day', date=str(journee))
-            for t in tickets:
-                ET.SubElement(day, 'ticket', 
-                    code=t['ticket'], 
-                    duration=str(t['duree'].total_seconds()), 
-                    start=t['debut'].strftime('%H:%M'), 
-                    end=t['fin'].strftime('%H:%M'),
-                    message=t['message'])
-        xmlstr = minidom.parseString(ET.tostring(root)).toprettyxml(indent="   ")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(xmlstr)
-        return output_file 
\ No newline at end of file
+            output_file = self.default_output_file('xml')
+        with profiler.span('export', format='xml') as span, open(output_file, 'w', encoding='utf-8') as fp:
+            writer = XmlStreamWriter(fp)
+            writer.start_document()
+            writer.start_element('timesheet')
+            self.write_xml_days(writer, durees_par_journee)
+            writer.end_element()
+            span.set(rows=len(durees_par_journee), bytes=fp.tell())
+        return output_file
+    
+    def generate_combined_json(self, durees_par_auteur, output_file=None):
+        """
+        Génère un fichier JSON unique pour plusieurs auteurs.
+        
+        Args:
+            durees_par_auteur: Un dictionnaire {auteur: {jour: [tickets]}}.
+            output_file: Le nom du fichier de sortie.
+            
+        Returns:
+            Le chemin du fichier JSON généré.
+        """
+        if output_file is None:
+            output_file = self.default_output_file('json', 'equipe')
+        with profiler.span('export', format='json') as span, open(output_file, 'w', encoding='utf-8') as fp:
+            with JsonArrayWriter(fp) as writer:
+                for author, durees_par_journee in durees_par_auteur.items():
+                    # Objet {"author": ..., "days": [...]} écrit à la main pour diffuser les journées
+                    writer.begin_item()
+                    fp.write(f'{{\n        "author": {json.dumps(author)},\n        "days": ')
+                    self.write_json_days(fp, durees_par_journee, level=2)
+                    fp.write('\n    }')
+            span.set(rows=len(durees_par_auteur), bytes=fp.tell())
+        return output_file
+    
+    def generate_combined_xml(self, durees_par_auteur, output_file=None):
+        """
+        Génère un fichier XML unique pour plusieurs auteurs (un élément timesheet par auteur).
+        
+        Args:
+            durees_par_auteur: Un dictionnaire {auteur: {jour: [tickets]}}.
+            output_file: Le nom du fichier de sortie.
+            
+        Returns:
+            Le chemin du fichier XML généré.
+        """
+        if output_file is None:
+            output_file = self.default_output_file('xml', 'equipe')
+        with profiler.span('export', format='xml') as span, open(output_file, 'w', encoding='utf-8') as fp:
+            writer = XmlStreamWriter(fp)
+            writer.start_document()
+            writer.start_element('timesheets')
+            for author, durees_par_journee in durees_par_auteur.items():
+                writer.start_element('timesheet', {'author': author})
+                self.write_xml_days(writer, durees_par_journee)
+                writer.end_element()
+            writer.end_element()
+            span.set(rows=len(durees_par_auteur), bytes=fp.tell())
+        return output_file
+
+
+def file_name_part(name):
+    """Rend un nom (d'auteur, par exemple) utilisable dans un nom de fichier."""
+    cleaned = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name.strip())
+    return cleaned.strip('_') or 'sans_nom'
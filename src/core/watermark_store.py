@@ -0,0 +1,76 @@
+import json
+import os
+
+
+class WatermarkStore:
+    """Classe pour mémoriser, par dépôt, l'état de la dernière extraction des logs Git."""
+
+    def __init__(self, path):
+        """
+        Initialise le magasin de marqueurs d'extraction.
+
+        Args:
+            path: Le fichier JSON dans lequel les marqueurs sont persistés.
+        """
+        self.path = path
+        self.watermarks = self._load()
+
+    def _load(self):
+        """Charge les marqueurs depuis le fichier JSON (vide si absent ou illisible)."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self):
+        """Sauvegarde les marqueurs de façon atomique (fichier temporaire puis renommage)."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.watermarks, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def repositories(self):
+        """Retourne la liste des dépôts pour lesquels un marqueur existe."""
+        return list(self.watermarks.keys())
+
+    def get(self, repo_path):
+        """
+        Retourne le marqueur d'un dépôt.
+
+        Args:
+            repo_path: Le chemin du dépôt Git.
+
+        Returns:
+            Un dictionnaire {'tips': [...], 'commits': n} ou None si le dépôt n'a jamais été extrait.
+        """
+        return self.watermarks.get(repo_path)
+
+    def set(self, repo_path, tips, commits, intervals=None):
+        """
+        Enregistre le marqueur d'un dépôt.
+
+        Args:
+            repo_path: Le chemin du dépôt Git.
+            tips: Les hashs des extrémités des références lors de l'extraction.
+            commits: Le nombre de commits de ce dépôt présents dans le magasin de commits.
+            intervals: Les périodes (début, fin) déjà extraites, pour un magasin de requête.
+        """
+        watermark = {
+            'tips': sorted(tips),
+            'commits': commits
+        }
+        if intervals is not None:
+            watermark['intervals'] = [list(interval) for interval in intervals]
+        self.watermarks[repo_path] = watermark
+
+    def remove(self, repo_path):
+        """Supprime le marqueur d'un dépôt."""
+        self.watermarks.pop(repo_path, None)
+
+    def clear(self):
+        """Supprime tous les marqueurs (l'extraction suivante sera complète)."""
+        self.watermarks = {}
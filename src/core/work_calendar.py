@@ -0,0 +1,152 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+
+def parse_time(hhmm):
+    """Convertit une heure 'HH:MM' en minutes depuis minuit."""
+    heure = datetime.strptime(hhmm, '%H:%M')
+    return heure.hour * 60 + heure.minute
+
+
+def parse_periods(periods):
+    """
+    Convertit une liste de plages ('HH:MM', 'HH:MM') en tuple trié de (début, fin) en minutes.
+
+    Raises:
+        ValueError: Si une plage est vide ou si deux plages se chevauchent.
+    """
+    parsed = sorted((parse_time(start), parse_time(end)) for start, end in periods)
+    for index, (start, end) in enumerate(parsed):
+        if end <= start:
+            raise ValueError(f"Plage horaire vide : {start // 60:02d}:{start % 60:02d}")
+        if index and start < parsed[index - 1][1]:
+            raise ValueError("Les plages horaires d'une journée ne doivent pas se chevaucher")
+    return tuple(parsed)
+
+
+class WorkCalendar:
+    """
+    Calendrier de travail : plages horaires de chaque jour de la semaine, jours non travaillés
+    et exceptions datées.
+
+    Les heures sont converties une fois pour toutes en minutes depuis minuit ; une journée est
+    décrite par un tuple trié de plages (début, fin), vide pour un jour non travaillé.
+    """
+
+    def __init__(self, periods, weekdays=None, non_working_days=None, overrides=None):
+        """
+        Initialise le calendrier.
+
+        Args:
+            periods: Les plages ('HH:MM', 'HH:MM') d'un jour travaillé ordinaire.
+            weekdays: Les plages propres à certains jours de la semaine {0 (lundi) à 6: [plages]}
+                (une liste vide rend le jour non travaillé).
+            non_working_days: Les dates non travaillées (date ou 'AAAA-MM-JJ').
+            overrides: Les plages propres à certaines dates {date ou 'AAAA-MM-JJ': [plages]}.
+        """
+        default = parse_periods(periods)
+        self.weekday_periods = [default] * 7
+        for weekday, weekday_periods in (weekdays or {}).items():
+            self.weekday_periods[int(weekday)] = parse_periods(weekday_periods)
+        self.overrides = {
+            self._to_date(day): parse_periods(day_periods)
+            for day, day_periods in (overrides or {}).items()
+        }
+        for day in non_working_days or []:
+            self.overrides[self._to_date(day)] = ()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Construit le calendrier à partir de la configuration.
+
+        Les plages matin et après-midi (work_periods) s'appliquent à tous les jours, sauf
+        indication contraire dans work_calendar.
+
+        Args:
+            config: L'objet de configuration.
+
+        Returns:
+            Un WorkCalendar.
+        """
+        work_periods = config.get_work_periods()
+        calendar = config.get_work_calendar()
+        periods = calendar.get('periods') or [
+            (work_periods['morning']['start'], work_periods['morning']['end']),
+            (work_periods['afternoon']['start'], work_periods['afternoon']['end'])
+        ]
+        return cls(
+            periods,
+            weekdays=calendar.get('weekdays'),
+            non_working_days=calendar.get('non_working_days'),
+            overrides=calendar.get('overrides')
+        )
+
+    @staticmethod
+    def _to_date(value):
+        """Convertit une date ou une chaîne 'AAAA-MM-JJ' en date."""
+        return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+    def periods(self, day):
+        """
+        Retourne les plages d'une journée.
+
+        Args:
+            day: La journée (date).
+
+        Returns:
+            Un tuple trié de (début, fin) en minutes depuis minuit, vide si la journée n'est pas travaillée.
+        """
+        override = self.overrides.get(day)
+        if override is not None:
+            return override
+        return self.weekday_periods[day.weekday()]
+
+    def is_working_day(self, day):
+        """Indique si une journée comporte au moins une plage de travail."""
+        return bool(self.periods(day))
+
+    def bounds(self, day):
+        """
+        Retourne les plages d'une journée en datetimes.
+
+        Args:
+            day: La journée (date).
+
+        Returns:
+            Une liste de (début, fin) en datetime, vide si la journée n'est pas travaillée.
+        """
+        midnight = datetime.combine(day, datetime.min.time())
+        return [
+            (midnight + timedelta(minutes=start), midnight + timedelta(minutes=end))
+            for start, end in self.periods(day)
+        ]
+
+    @staticmethod
+    def split(debut, fin, bounds):
+        """
+        Découpe un créneau (début, fin) aux pauses qu'il traverse.
+
+        Une pause est traversée quand le créneau commence avant la fin d'une plage et se termine
+        après celle-ci : le créneau est coupé à la fin de la plage et reprend au début de la
+        suivante. Les pauses traversées sont trouvées par recherche dichotomique sur les fins de
+        plages. Les morceaux ne sont pas bornés aux plages par ailleurs, et peuvent être de durée
+        négative (créneau incohérent, signalé en erreur par l'analyseur).
+
+        Args:
+            debut: Le début du créneau.
+            fin: La fin du créneau.
+            bounds: Les plages de la journée (voir bounds).
+
+        Returns:
+            La liste des morceaux (début, fin).
+        """
+        ends = [end for _, end in bounds[:-1]]
+        first = bisect_right(ends, debut)
+        last = bisect_left(ends, fin)
+        pieces = []
+        for index in range(first, last):
+            pieces.append((debut, ends[index]))
+            debut = bounds[index + 1][0]
+        pieces.append((debut, fin))
+        return pieces
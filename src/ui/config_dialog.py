@@ -80,7 +80,7 @@ class ConfigDialog(QDialog):
         
         self.config.set_export_path(self.export_path_edit.text())
         
-        # Sauvegarder la configuration
-        self.config.save_config()
+        # Sauvegarder la configuration (une seule écriture pour toutes les modifications)
+        self.config.flush()
         
         super().accept() 
\ No newline at end of file
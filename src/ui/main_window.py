@@ -1,19 +1,25 @@
 import sys
 import os
+import threading
+from datetime import timedelta
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QPushButton, QLabel, QTableWidget, QTableWidgetItem, QFileDialog,
+    QPushButton, QLabel, QTableView, QFileDialog,
     QTabWidget, QMessageBox, QHeaderView, QGroupBox, QFormLayout,
     QLineEdit, QListWidget, QListWidgetItem, QComboBox, QDateEdit,
-    QInputDialog
+    QInputDialog, QProgressBar, QCheckBox, QTableWidget, QTableWidgetItem, QSpinBox
 )
-from PyQt5.QtCore import Qt, QDate
-from PyQt5.QtGui import QIcon, QBrush, QColor, QFont
+from PyQt5.QtCore import Qt, QDate, QThreadPool, QTimer
+from PyQt5.QtGui import QIcon
 
-from src.core.git_processor import GitProcessor
-from src.core.ticket_analyzer import TicketAnalyzer
-from src.core.timesheet_generator import TimesheetGenerator
+from src.core.analysis_cache import AnalysisCache, DayResultCache
+from src.core.git_processor import GitProcessor, OperationCancelled
+from src.core.ticket_index import TicketIndex
+from src.core.timesheet_generator import available_export_formats
 from src.ui.config_dialog import ConfigDialog
+from src.ui.timesheet_model import TimesheetTableModel, format_duration
+from src.ui.workers import Worker
+from src.utils.profiling import profiler
 
 
 class MainWindow(QMainWindow):
@@ -24,10 +30,22 @@ class MainWindow(QMainWindow):
         
         self.config = config
         self.git_processor = GitProcessor(config)
-        self.ticket_analyzer = TicketAnalyzer(config)
-        self.timesheet_generator = TimesheetGenerator(config)
+        # Analyseur et générateur créés au premier usage (pandas et XML ne sont pas chargés au démarrage)
+        self._ticket_analyzer = None
+        self._timesheet_generator = None
+        self.store_available = False
+        self.analysis_cache = AnalysisCache(config.get_analysis_cache_size(), config.get_analysis_cache_dir() or None)
+        # Résultats par journée : après une extraction, seules les journées modifiées sont réanalysées
+        self.day_cache = DayResultCache(directory=config.get_analysis_cache_dir() or None)
         
         self.durees_par_journee = {}
+        self.ticket_index = TicketIndex()
+        
+        # Tâches longues (extraction, analyse) exécutées hors du thread de l'interface
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.current_worker = None
+        self.analysis_cancel_event = threading.Event()
         
         self.init_ui()
     
@@ -43,6 +61,8 @@ class MainWindow(QMainWindow):
         # Onglets
         tabs = QTabWidget()
         tabs.addTab(self.create_generation_tab(), "Génération de Timesheet")
+        tabs.addTab(self.create_tickets_tab(), "Tickets")
+        tabs.addTab(self.create_rollup_tab(), "Synthèse")
         tabs.addTab(self.create_configuration_tab(), "Configuration")
         
         main_layout.addWidget(tabs)
@@ -53,12 +73,53 @@ class MainWindow(QMainWindow):
         self.status_bar = self.statusBar()
         self.status_bar.showMessage("Prêt")
         
-        # Activer le bouton Analyser les tickets si le fichier git_logs.csv existe déjà
-        logs_file = self.git_processor.logs_file
-        if os.path.exists(logs_file):
-            self.btn_analyze_tickets.setEnabled(True)
+        # Progression des tâches en arrière-plan : durées mesurées, étape, barre et bouton d'annulation
+        self.profile_label = QLabel("")
+        self.stage_label = QLabel("")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.btn_cancel = QPushButton("Annuler")
+        self.btn_cancel.clicked.connect(self.cancel_current_task)
+        self.status_bar.addPermanentWidget(self.profile_label)
+        self.status_bar.addPermanentWidget(self.stage_label)
+        self.status_bar.addPermanentWidget(self.progress_bar)
+        self.status_bar.addPermanentWidget(self.btn_cancel)
+        self.set_task_running(False)
+        
+        # État du magasin de commits lu après le premier affichage de la fenêtre
+        QTimer.singleShot(0, self.refresh_store_status)
+    
+    @property
+    def ticket_analyzer(self):
+        """L'analyseur de tickets, créé (et pandas chargé) à la première analyse."""
+        if self._ticket_analyzer is None:
+            from src.core.ticket_analyzer import TicketAnalyzer
+            self._ticket_analyzer = TicketAnalyzer(self.config)
+        return self._ticket_analyzer
+    
+    @property
+    def timesheet_generator(self):
+        """Le générateur de feuilles de temps, créé à la première exportation."""
+        if self._timesheet_generator is None:
+            from src.core.timesheet_generator import TimesheetGenerator
+            self._timesheet_generator = TimesheetGenerator(self.config)
+        return self._timesheet_generator
+    
+    def refresh_store_status(self):
+        """Active l'analyse et affiche la dernière extraction si le magasin de commits existe."""
+        # Un ancien git_logs.csv est importé dans le magasin au premier chargement
+        self.store_available = self.git_processor.get_commit_store().exists() or os.path.exists(self.git_processor.logs_file)
+        if self.current_worker is None:
+            self.btn_analyze_tickets.setEnabled(self.analysis_available())
+            self.btn_generate_team.setEnabled(self.store_available)
+            self.btn_rollup.setEnabled(self.store_available)
+        if self.store_available:
             self.show_last_extraction_time()
     
+    def analysis_available(self):
+        """Indique si l'analyse peut être lancée : commits lus dans Git ou magasin déjà extrait."""
+        return self.store_available or self.config.get_git_filtering()
+    
     def create_generation_tab(self):
         """Crée l'onglet de génération de timesheet."""
         tab = QWidget()
@@ -90,6 +151,22 @@ class MainWindow(QMainWindow):
         self.btn_generate_xml.setEnabled(False)
         actions_layout.addWidget(self.btn_generate_xml)
         
+        # Export dans un format au choix (documentaire ou à plat), aussi utilisé pour l'équipe
+        self.export_format_combo = QComboBox()
+        for export_format, label in available_export_formats().items():
+            self.export_format_combo.addItem(label, export_format)
+        actions_layout.addWidget(self.export_format_combo)
+        
+        self.btn_export = QPushButton("Exporter")
+        self.btn_export.clicked.connect(self.export_timesheet)
+        self.btn_export.setEnabled(False)
+        actions_layout.addWidget(self.btn_export)
+        
+        self.btn_generate_team = QPushButton("Générer pour l'équipe")
+        self.btn_generate_team.clicked.connect(self.generate_team_timesheets)
+        self.btn_generate_team.setEnabled(False)
+        actions_layout.addWidget(self.btn_generate_team)
+        
         layout.addLayout(actions_layout)
         
         # Filtres
@@ -124,14 +201,99 @@ class MainWindow(QMainWindow):
         layout.addWidget(filters_group)
         
         # Tableau des résultats
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Message de commit", "Ticket", "Durée (heures)", "Heure de début", "Heure de fin"])
+        self.table_model = TimesheetTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         layout.addWidget(self.table)
         
         return tab
     
+    def create_tickets_tab(self):
+        """Crée l'onglet du temps passé par ticket (classement et historique d'un ticket)."""
+        tab = QWidget()
+        layout = QHBoxLayout(tab)
+        
+        # Classement des tickets de la dernière analyse
+        top_group = QGroupBox("Tickets les plus longs")
+        top_layout = QVBoxLayout(top_group)
+        top_count_layout = QHBoxLayout()
+        top_count_layout.addWidget(QLabel("Nombre de tickets"))
+        self.top_spin = QSpinBox()
+        self.top_spin.setRange(1, 1000)
+        self.top_spin.setValue(20)
+        self.top_spin.valueChanged.connect(self.update_ticket_ranking)
+        top_count_layout.addWidget(self.top_spin)
+        top_count_layout.addStretch()
+        top_layout.addLayout(top_count_layout)
+        
+        self.ticket_ranking_table = QTableWidget(0, 2)
+        self.ticket_ranking_table.setHorizontalHeaderLabels(["Ticket", "Durée (heures)"])
+        self.ticket_ranking_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.ticket_ranking_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.ticket_ranking_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.ticket_ranking_table.cellClicked.connect(
+            lambda row, column: self.show_ticket_history(self.ticket_ranking_table.item(row, 0).text())
+        )
+        top_layout.addWidget(self.ticket_ranking_table)
+        layout.addWidget(top_group)
+        
+        # Historique d'un ticket : temps par journée, par auteur et par dépôt
+        history_group = QGroupBox("Historique d'un ticket")
+        history_layout = QVBoxLayout(history_group)
+        search_layout = QHBoxLayout()
+        self.ticket_search = QLineEdit()
+        self.ticket_search.setPlaceholderText("Code du ticket (ex. PROJ-123)")
+        self.ticket_search.returnPressed.connect(lambda: self.show_ticket_history(self.ticket_search.text().strip()))
+        search_layout.addWidget(self.ticket_search)
+        btn_search = QPushButton("Afficher")
+        btn_search.clicked.connect(lambda: self.show_ticket_history(self.ticket_search.text().strip()))
+        search_layout.addWidget(btn_search)
+        history_layout.addLayout(search_layout)
+        
+        self.ticket_total_label = QLabel("")
+        history_layout.addWidget(self.ticket_total_label)
+        
+        self.ticket_history_table = QTableWidget(0, 4)
+        self.ticket_history_table.setHorizontalHeaderLabels(["Journée", "Durée (heures)", "Auteur", "Dépôt"])
+        self.ticket_history_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.ticket_history_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        history_layout.addWidget(self.ticket_history_table)
+        layout.addWidget(history_group)
+        
+        return tab
+    
+    def create_rollup_tab(self):
+        """Crée l'onglet des totaux par semaine ou par mois (tables d'agrégats du magasin)."""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        # Niveau et regroupement ; la période et l'auteur sont ceux des filtres de l'onglet de génération
+        options_layout = QHBoxLayout()
+        self.rollup_level_combo = QComboBox()
+        for level, label in (('week', "Par semaine"), ('month', "Par mois"), ('day', "Par journée")):
+            self.rollup_level_combo.addItem(label, level)
+        options_layout.addWidget(self.rollup_level_combo)
+        self.rollup_dimension_combo = QComboBox()
+        for dimension, label in (('author', "Auteur"), ('ticket', "Ticket"), ('repo', "Dépôt")):
+            self.rollup_dimension_combo.addItem(label, dimension)
+        options_layout.addWidget(self.rollup_dimension_combo)
+        self.btn_rollup = QPushButton("Calculer")
+        self.btn_rollup.clicked.connect(self.compute_rollups)
+        self.btn_rollup.setEnabled(False)
+        options_layout.addWidget(self.btn_rollup)
+        options_layout.addStretch()
+        layout.addLayout(options_layout)
+        
+        self.rollup_table = QTableWidget(0, 3)
+        self.rollup_table.setHorizontalHeaderLabels(["Période", "Valeur", "Durée (heures)"])
+        self.rollup_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.rollup_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.rollup_table)
+        
+        return tab
+    
     def create_configuration_tab(self):
         """Crée l'onglet de configuration."""
         tab = QWidget()
@@ -184,6 +346,42 @@ class MainWindow(QMainWindow):
         self.pattern_edit = QLineEdit(self.config.get_ticket_pattern())
         self.pattern_edit.textChanged.connect(self.update_ticket_pattern)
         other_config_layout.addRow("Pattern de ticket:", self.pattern_edit)
+        # Moteur d'analyse des tickets
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItem("Vectorisé", "vectorized")
+        self.engine_combo.addItem("Boucle (historique)", "loop")
+        self.engine_combo.setCurrentIndex(max(0, self.engine_combo.findData(self.config.get_analysis_engine())))
+        self.engine_combo.currentIndexChanged.connect(self.update_analysis_engine)
+        other_config_layout.addRow("Moteur d'analyse:", self.engine_combo)
+        # Analyse des journées répartie sur plusieurs processus (grands volumes)
+        self.processes_spin = QSpinBox()
+        self.processes_spin.setRange(1, os.cpu_count() or 1)
+        self.processes_spin.setValue(min(self.config.get_analysis_processes(), self.processes_spin.maximum()))
+        self.processes_spin.valueChanged.connect(self.update_analysis_processes)
+        other_config_layout.addRow("Processus d'analyse:", self.processes_spin)
+        # Dédoublonnage des commits présents dans plusieurs dépôts ou branches
+        self.dedup_combo = QComboBox()
+        self.dedup_combo.addItem("Par hash", "hash")
+        self.dedup_combo.addItem("Par hash et contenu (cherry-picks)", "content")
+        self.dedup_combo.addItem("Aucun", "off")
+        self.dedup_combo.setCurrentIndex(max(0, self.dedup_combo.findData(self.config.get_dedup_mode())))
+        self.dedup_combo.currentIndexChanged.connect(self.update_dedup_mode)
+        other_config_layout.addRow("Doublons:", self.dedup_combo)
+        # Extraction hors ligne : pas de git fetch, seules les références existantes sont lues
+        self.offline_checkbox = QCheckBox("Hors ligne (ne pas mettre à jour les dépôts)")
+        self.offline_checkbox.setChecked(self.config.get_offline_mode())
+        self.offline_checkbox.toggled.connect(self.update_offline_mode)
+        other_config_layout.addRow("Extraction:", self.offline_checkbox)
+        # Analyse : auteurs et période filtrés par git log, seules les périodes manquantes sont lues
+        self.git_filtering_checkbox = QCheckBox("Lire les commits de la période dans Git (filtrage par git log)")
+        self.git_filtering_checkbox.setChecked(self.config.get_git_filtering())
+        self.git_filtering_checkbox.toggled.connect(self.update_git_filtering)
+        other_config_layout.addRow("Analyse:", self.git_filtering_checkbox)
+        # Mesure de la durée des étapes (résumé dans la barre d'état)
+        self.profiling_checkbox = QCheckBox("Mesurer la durée des étapes")
+        self.profiling_checkbox.setChecked(self.config.get_profiling())
+        self.profiling_checkbox.toggled.connect(self.update_profiling)
+        other_config_layout.addRow("Profilage:", self.profiling_checkbox)
         # Champs horaires de travail matin/après-midi
         work_periods = self.config.get_work_periods()
         self.morning_start_edit = QLineEdit(work_periods['morning']['start'])
@@ -269,6 +467,34 @@ class MainWindow(QMainWindow):
         """Met à jour le pattern de ticket dans la configuration."""
         self.config.set_ticket_pattern(pattern)
     
+    def update_analysis_engine(self, index):
+        """Met à jour le moteur d'analyse des tickets dans la configuration."""
+        self.config.set_analysis_engine(self.engine_combo.itemData(index))
+    
+    def update_analysis_processes(self, processes):
+        """Met à jour le nombre de processus d'analyse dans la configuration."""
+        self.config.set_analysis_processes(processes)
+    
+    def update_dedup_mode(self, index):
+        """Met à jour le mode de dédoublonnage des commits dans la configuration."""
+        self.config.set_dedup_mode(self.dedup_combo.itemData(index))
+    
+    def update_offline_mode(self, offline):
+        """Active ou désactive l'extraction hors ligne dans la configuration."""
+        self.config.set_offline_mode(offline)
+    
+    def update_git_filtering(self, enabled):
+        """Active ou désactive la lecture des commits de la période dans Git lors de l'analyse."""
+        self.config.set_git_filtering(enabled)
+        self.refresh_store_status()
+    
+    def update_profiling(self, enabled):
+        """Active ou désactive la mesure de la durée des étapes."""
+        self.config.set_profiling(enabled)
+        if not enabled:
+            self.profile_label.setText("")
+            self.profile_label.setToolTip("")
+    
     def update_work_periods(self):
         """Met à jour les horaires de travail matin/après-midi dans la configuration."""
         self.config.set_work_periods(
@@ -285,26 +511,133 @@ class MainWindow(QMainWindow):
             self.config.set_export_path(export_path)
             self.export_path_edit.setText(export_path)
     
+    def closeEvent(self, event):
+        """Écrit la configuration en attente avant de fermer la fenêtre."""
+        self.config.flush()
+        super().closeEvent(event)
+    
+    def set_task_running(self, running):
+        """Affiche ou masque la progression et verrouille les boutons pendant une tâche."""
+        self.stage_label.setVisible(running)
+        self.progress_bar.setVisible(running)
+        self.btn_cancel.setVisible(running)
+        self.btn_cancel.setEnabled(running)
+        self.btn_extract_logs.setEnabled(not running)
+        self.btn_analyze_tickets.setEnabled(not running and self.analysis_available())
+        self.btn_generate_team.setEnabled(not running and self.store_available)
+        self.btn_rollup.setEnabled(not running and self.store_available)
+        self.btn_generate_json.setEnabled(not running and bool(self.durees_par_journee))
+        self.btn_generate_xml.setEnabled(not running and bool(self.durees_par_journee))
+        self.btn_export.setEnabled(not running and bool(self.durees_par_journee))
+        if running:
+            self.stage_label.setText("")
+            self.progress_bar.setRange(0, 0)  # Indéterminée jusqu'au premier signal
+    
+    def start_task(self, fn, on_finished, on_failed, *args, **kwargs):
+        """
+        Lance une tâche en arrière-plan.
+        
+        Args:
+            fn: La fonction exécutée dans le pool de threads (voir Worker).
+            on_finished: Le slot appelé, dans le thread de l'interface, avec le résultat.
+            on_failed: Le slot appelé avec le message d'erreur si la tâche échoue.
+            *args: Arguments positionnels transmis à la fonction.
+            **kwargs: Arguments nommés transmis à la fonction.
+        """
+        worker = Worker(fn, *args, **kwargs)
+        worker.signals.progress.connect(self.on_task_progress)
+        worker.signals.finished.connect(self.on_task_done)
+        worker.signals.finished.connect(on_finished)
+        worker.signals.failed.connect(self.on_task_done)
+        worker.signals.failed.connect(on_failed)
+        worker.signals.cancelled.connect(self.on_task_done)
+        worker.signals.cancelled.connect(self.on_task_cancelled)
+        # Connecté en dernier : le résumé inclut le traitement du résultat (remplissage du tableau)
+        for signal in (worker.signals.finished, worker.signals.failed, worker.signals.cancelled):
+            signal.connect(self.on_task_profiled)
+        profiler.enabled = self.config.get_profiling()
+        profiler.reset()
+        self.current_worker = worker
+        self.set_task_running(True)
+        self.thread_pool.start(worker)
+    
+    def on_task_progress(self, stage, current, total, message):
+        """Met à jour l'indicateur d'étape et la barre de progression."""
+        self.stage_label.setText(stage.capitalize())
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(current)
+        else:
+            self.progress_bar.setRange(0, 0)
+        if message:
+            self.status_bar.showMessage(message)
+    
+    def on_task_done(self, *args):
+        """Rétablit l'interface à la fin d'une tâche, quelle que soit son issue."""
+        self.current_worker = None
+        self.set_task_running(False)
+    
+    def on_task_profiled(self, *args):
+        """Affiche les étapes les plus longues de la tâche et écrit la trace si elle est configurée."""
+        if not profiler.enabled:
+            return
+        self.profile_label.setText(profiler.summary(limit=3))
+        self.profile_label.setToolTip(profiler.report())
+        trace_file = self.config.get_profiling_trace_file()
+        if trace_file:
+            try:
+                profiler.write_trace(trace_file)
+            except OSError as e:
+                self.status_bar.showMessage(f"Impossible d'écrire la trace {trace_file} : {e}")
+    
+    def on_task_cancelled(self):
+        """Signale l'annulation d'une tâche."""
+        self.status_bar.showMessage("Opération annulée")
+    
+    def cancel_current_task(self):
+        """Annule la tâche en cours (les processus Git actifs sont interrompus)."""
+        self.btn_cancel.setEnabled(False)
+        self.status_bar.showMessage("Annulation en cours...")
+        self.analysis_cancel_event.set()
+        self.git_processor.cancel()
+    
     def extract_git_logs(self):
-        """Extrait les logs Git."""
+        """Extrait les logs Git en arrière-plan."""
+        self.config.reload_if_changed()
         self.status_bar.showMessage("Extraction des logs Git en cours...")
-        
-        try:
-            logs_file = self.git_processor.extract_git_logs()
-            self.status_bar.showMessage(f"Logs Git extraits dans {logs_file}")
-            self.btn_analyze_tickets.setEnabled(True)
-            self.show_last_extraction_time()
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'extraction des logs Git : {str(e)}")
-            self.status_bar.showMessage("Erreur lors de l'extraction des logs Git")
+        self.start_task(self.git_processor.extract_git_logs, self.on_git_logs_extracted,
+                        self.on_git_logs_extraction_failed)
+    
+    def on_git_logs_extracted(self, store_path):
+        """Applique le résultat de l'extraction des logs Git à l'interface."""
+        self.status_bar.showMessage(f"Logs Git extraits dans {store_path}")
+        # Les analyses en cache portent sur l'ancien contenu du magasin (les résultats par journée,
+        # indexés par l'empreinte de leurs commits, restent valables)
+        self.analysis_cache.invalidate()
+        self.refresh_store_status()
+        
+        # Signaler les dépôts en échec sans bloquer les autres
+        failed = self.git_processor.get_failed_repositories()
+        if failed:
+            details = "\n".join(f"- {r['repository']} : {r['error']}" for r in failed)
+            QMessageBox.warning(self, "Dépôts en échec", f"Certains dépôts n'ont pas pu être extraits :\n{details}")
+        
+        # Dépôts distants injoignables : les commits ont été lus depuis les références existantes
+        fetch_errors = self.git_processor.get_fetch_errors()
+        if fetch_errors:
+            details = "\n".join(f"- {repo_path} : {error}" for repo_path, error in fetch_errors)
+            QMessageBox.warning(self, "Dépôts non mis à jour", f"Certains dépôts distants n'ont pas pu être contactés :\n{details}")
+    
+    def on_git_logs_extraction_failed(self, error):
+        """Signale une erreur lors de l'extraction des logs Git."""
+        QMessageBox.critical(self, "Erreur", f"Erreur lors de l'extraction des logs Git : {error}")
+        self.status_bar.showMessage("Erreur lors de l'extraction des logs Git")
     
     def show_last_extraction_time(self):
         """Affiche la date/heure de la dernière extraction des logs Git sous forme relative dans un label au-dessus des boutons."""
-        import os
         import datetime
-        logs_file = self.git_processor.logs_file
-        if os.path.exists(logs_file):
-            mtime = os.path.getmtime(logs_file)
+        mtime = self.git_processor.get_commit_store().last_modified()
+        if mtime is not None:
             dt = datetime.datetime.fromtimestamp(mtime)
             now = datetime.datetime.now()
             delta = now - dt
@@ -327,111 +660,241 @@ class MainWindow(QMainWindow):
             self.last_extraction_label.setText(msg)
     
     def analyze_tickets(self):
-        """Analyse les tickets à partir des logs Git."""
+        """Analyse les tickets à partir des logs Git, en arrière-plan."""
+        self.config.reload_if_changed()
         self.status_bar.showMessage("Analyse des tickets en cours...")
         
-        try:
-            # Charger les logs Git dans un DataFrame
-            df = self.git_processor.load_git_logs_dataframe()
-            
-            # Filtrer par dates si spécifiées
-            date_from = self.date_from.date().toPyDate()
-            date_to = self.date_to.date().toPyDate()
-            df = df[(df['date'].dt.date >= date_from) & (df['date'].dt.date <= date_to)]
-            
-            # Filtrer par auteur si spécifié
-            selected_author = self.author_combo.currentText()
-            if selected_author != "Tous":
-                df = df[df['author'] == selected_author]
-            
-            # Analyser les tickets
-            self.durees_par_journee = self.ticket_analyzer.extract_tickets_from_dataframe(df)
-            self.durees_par_journee = self.ticket_analyzer.adjust_durations(self.durees_par_journee)
+        # Les filtres sont lus ici, dans le thread de l'interface
+        date_from = self.date_from.date().toPyDate()
+        date_to = self.date_to.date().toPyDate()
+        selected_author = self.author_combo.currentText()
+        
+        self.analysis_cancel_event.clear()
+        self.start_task(self.run_analysis, self.on_tickets_analyzed, self.on_tickets_analysis_failed,
+                        date_from, date_to, selected_author)
+    
+    def run_analysis(self, date_from, date_to, selected_author, progress):
+        """
+        Charge les logs Git et analyse les tickets (exécuté hors du thread de l'interface).
+        
+        Args:
+            date_from: Premier jour inclus.
+            date_to: Dernier jour inclus.
+            selected_author: L'auteur sélectionné, ou "Tous".
+            progress: Fonction (étape, courant, total, message) signalant l'avancement.
             
-            # Mettre à jour le tableau
-            self.update_table()
+        Returns:
+            Un tuple (durées par journée, index des tickets).
+        """
+        # Avec le filtrage par Git, les commits de la période sont lus avant la recherche dans le
+        # cache : git n'est sollicité que pour les périodes et les commits pas encore lus
+        df = None
+        if self.config.get_git_filtering():
+            progress('chargement', 0, 3, "Lecture des commits de la période dans Git...")
+            df, store = self.git_processor.load_commits(date_from, date_to)
+        else:
+            store = self.git_processor.get_commit_store()
+        
+        # Résultat déjà calculé pour ces paramètres (ou pour une période qui contient celle-ci)
+        scope = self.analysis_scope(selected_author, store)
+        cached = self.analysis_cache.get(scope, date_from, date_to)
+        if cached is not None:
+            progress('cache', 3, 3, "")
+            return cached, TicketIndex.from_durations(cached)
+        
+        # Charger les logs Git de la période dans un DataFrame
+        if df is None:
+            progress('chargement', 0, 3, "Chargement des logs Git...")
+            df, _ = self.git_processor.load_commits(date_from, date_to)
+        
+        # Filtrer par auteur si spécifié
+        if selected_author != "Tous":
+            df = df[df['author'] == selected_author]
+        if self.analysis_cancel_event.is_set():
+            raise OperationCancelled("Analyse annulée")
+        
+        # Analyser et ajuster les journées nouvelles ou modifiées, reprendre les autres du cache
+        progress('analyse', 1, 3, f"Analyse de {len(df)} commits...")
+        durees_par_journee = self.ticket_analyzer.analyze_days(
+            df, self.day_cache,
+            progress=lambda changed, total: progress('analyse', 2, 3, f"Analyse de {changed} journée(s) sur {total}...")
+        )
+        if self.analysis_cancel_event.is_set():
+            raise OperationCancelled("Analyse annulée")
+        
+        self.analysis_cache.put(scope, date_from, date_to, durees_par_journee)
+        progress('analyse', 3, 3, "")
+        return durees_par_journee, TicketIndex.from_durations(durees_par_journee)
+    
+    def analysis_scope(self, selected_author, store):
+        """
+        Retourne la clé de cache des paramètres qui influent sur le résultat de l'analyse.
+        
+        Args:
+            selected_author: L'auteur sélectionné, ou "Tous".
+            store: Le magasin de commits lu par l'analyse.
             
-            self.status_bar.showMessage("Analyse des tickets terminée")
-            self.btn_generate_json.setEnabled(True)
-            self.btn_generate_xml.setEnabled(True)
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'analyse des tickets : {str(e)}")
-            self.status_bar.showMessage("Erreur lors de l'analyse des tickets")
+        Returns:
+            La clé du périmètre d'analyse (voir AnalysisCache.scope_key).
+        """
+        return AnalysisCache.scope_key(
+            store=store.fingerprint(),
+            ticket_pattern=self.ticket_analyzer.ticket_pattern.pattern,
+            work_periods=self.config.get_work_periods(),
+            work_calendar=self.config.get_work_calendar(),
+            work_hours=self.config.get_work_hours_per_day(),
+            authors=sorted(self.config.get_authors()),
+            author=selected_author
+        )
+    
+    def on_tickets_analyzed(self, result):
+        """Applique le résultat de l'analyse des tickets (durées et index des tickets) à l'interface."""
+        self.durees_par_journee, self.ticket_index = result
+        
+        # Mettre à jour le tableau et l'onglet des tickets
+        self.update_table()
+        self.update_ticket_ranking()
+        if self.ticket_search.text().strip():
+            self.show_ticket_history(self.ticket_search.text().strip())
+        
+        self.status_bar.showMessage("Analyse des tickets terminée")
+        self.btn_generate_json.setEnabled(True)
+        self.btn_generate_xml.setEnabled(True)
+        self.btn_export.setEnabled(True)
+    
+    def on_tickets_analysis_failed(self, error):
+        """Signale une erreur lors de l'analyse des tickets."""
+        QMessageBox.critical(self, "Erreur", f"Erreur lors de l'analyse des tickets : {error}")
+        self.status_bar.showMessage("Erreur lors de l'analyse des tickets")
     
     def update_table(self):
         """Met à jour le tableau avec les durées par journée."""
-        self.table.setRowCount(0)  # Vider le tableau
-        row = 0
-        for journee, tickets in sorted(self.durees_par_journee.items()):
-            # Ligne de titre pour le jour
-            self.table.insertRow(row)
-            title_item = QTableWidgetItem(str(journee))
-            title_item.setFont(QFont('Arial', weight=QFont.Bold))
-            title_item.setBackground(QBrush(QColor(220, 220, 220)))  # gris clair
-            title_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setSpan(row, 0, 1, 5)
-            self.table.setItem(row, 0, title_item)
-            row += 1
-            for t in tickets:
-                try:
-                    self.table.insertRow(row)
-                    # Message de commit
-                    message_item = QTableWidgetItem(t.get('message', ''))
-                    self.table.setItem(row, 0, message_item)
-                    # Ticket
-                    ticket_item = QTableWidgetItem(t.get('ticket', '?'))
-                    ticket_item.setTextAlignment(Qt.AlignCenter)
-                    self.table.setItem(row, 1, ticket_item)
-                    # Durée (format HH:MM, jamais négatif)
-                    duree = t.get('duree')
-                    if duree is None or not hasattr(duree, 'total_seconds'):
-                        duree = duree.__class__() if duree else __import__('datetime').timedelta(0)
-                    if duree.total_seconds() < 0:
-                        duree = duree.__class__()  # timedelta(0)
-                    heures = int(duree.total_seconds() // 3600)
-                    minutes = int((duree.total_seconds() % 3600) // 60)
-                    duree_str = f"{heures:02d}:{minutes:02d}"
-                    duree_item = QTableWidgetItem(duree_str)
-                    duree_item.setTextAlignment(Qt.AlignCenter)
-                    self.table.setItem(row, 2, duree_item)
-                    # Heure de début
-                    heure_debut = t.get('debut')
-                    heure_debut_str = heure_debut.strftime('%H:%M') if hasattr(heure_debut, 'strftime') else ''
-                    debut_item = QTableWidgetItem(heure_debut_str)
-                    debut_item.setTextAlignment(Qt.AlignCenter)
-                    self.table.setItem(row, 3, debut_item)
-                    # Heure de fin
-                    heure_fin = t.get('fin')
-                    heure_fin_str = heure_fin.strftime('%H:%M') if hasattr(heure_fin, 'strftime') else ''
-                    fin_item = QTableWidgetItem(heure_fin_str)
-                    fin_item.setTextAlignment(Qt.AlignCenter)
-                    self.table.setItem(row, 4, fin_item)
-                    # Coloration matin/après-midi/erreur
-                    color = None
-                    if t.get('erreur', False):
-                        color = QColor(255, 150, 150)  # rouge clair
-                    else:
-                        # Récupérer les bornes matin/aprem
-                        from datetime import datetime
-                        work_periods = self.config.get_work_periods()
-                        morning_end = work_periods['morning']['end']
-                        afternoon_start = work_periods['afternoon']['start']
-                        heure_debut_val = heure_debut_str
-                        if heure_debut_val:
-                            if heure_debut_val < morning_end:
-                                color = QColor(200, 255, 200)  # vert clair
-                            elif heure_debut_val >= afternoon_start:
-                                color = QColor(200, 220, 255)  # bleu clair
-                    if color:
-                        for col in range(5):
-                            self.table.item(row, col).setBackground(QBrush(color))
-                except Exception:
-                    self.table.insertRow(row)
-                    for col in range(5):
-                        item = QTableWidgetItem('Erreur')
-                        item.setBackground(Qt.red)
-                        self.table.setItem(row, col, item)
-                row += 1
+        with profiler.span('update_table') as span:
+            self.table_model.set_durations(self.durees_par_journee, self.config.get_work_periods())
+            
+            # Les lignes de titre des journées occupent toute la largeur du tableau
+            self.table.clearSpans()
+            for row in self.table_model.day_rows:
+                self.table.setSpan(row, 0, 1, self.table_model.columnCount())
+            span.set(rows=self.table_model.rowCount())
+    
+    def update_ticket_ranking(self):
+        """Affiche les tickets qui ont occupé le plus de temps sur la période analysée."""
+        top = self.ticket_index.top(self.top_spin.value())
+        self.ticket_ranking_table.setRowCount(len(top))
+        for row, (ticket, duree) in enumerate(top):
+            self.ticket_ranking_table.setItem(row, 0, QTableWidgetItem(ticket))
+            self.ticket_ranking_table.setItem(row, 1, QTableWidgetItem(format_duration(duree)))
+    
+    def show_ticket_history(self, ticket):
+        """
+        Affiche le temps passé sur un ticket, journée par journée, à partir de l'index des tickets.
+        
+        Args:
+            ticket: Le code du ticket.
+        """
+        self.ticket_search.setText(ticket)
+        self.ticket_history_table.setRowCount(0)
+        if ticket not in self.ticket_index:
+            self.ticket_total_label.setText(f"Aucun créneau pour {ticket} sur la période analysée" if ticket else "")
+            return
+        
+        # Une ligne par journée et par couple (auteur, dépôt)
+        rows = {}
+        for slot in self.ticket_index.slots_for(ticket):
+            key = (slot.day, slot.author, slot.repo)
+            rows[key] = rows.get(key, timedelta()) + slot.duration
+        self.ticket_history_table.setRowCount(len(rows))
+        for row, ((journee, author, repo), duree) in enumerate(rows.items()):
+            self.ticket_history_table.setItem(row, 0, QTableWidgetItem(str(journee)))
+            self.ticket_history_table.setItem(row, 1, QTableWidgetItem(format_duration(duree)))
+            self.ticket_history_table.setItem(row, 2, QTableWidgetItem(author or ""))
+            self.ticket_history_table.setItem(row, 3, QTableWidgetItem(os.path.basename(repo) if repo else ""))
+        
+        total = self.ticket_index.total(ticket)
+        days = len(self.ticket_index.history(ticket))
+        self.ticket_total_label.setText(f"{ticket} : {format_duration(total)} sur {days} journée(s)")
+    
+    def compute_rollups(self):
+        """Met à jour les tables d'agrégats en arrière-plan, puis affiche les totaux demandés."""
+        self.config.reload_if_changed()
+        self.status_bar.showMessage("Calcul des agrégats en cours...")
+        selected_author = self.author_combo.currentText()
+        self.start_task(
+            self.run_rollups, self.on_rollups_computed, self.on_rollups_failed,
+            self.rollup_level_combo.currentData(),
+            self.rollup_dimension_combo.currentData(),
+            self.date_from.date().toPyDate(),
+            self.date_to.date().toPyDate(),
+            selected_author if selected_author != "Tous" else None
+        )
+    
+    def run_rollups(self, level, by, date_from, date_to, author, progress):
+        """
+        Met à jour les tables d'agrégats (mois modifiés seulement) et les interroge (exécuté hors
+        du thread de l'interface).
+        
+        Returns:
+            La liste des tuples (début de période, valeur, durée).
+        """
+        rollups = self.git_processor.get_rollup_store()
+        rollups.update(self.git_processor, self.ticket_analyzer, progress)
+        return rollups.totals(level, by, date_from, date_to, author=author)
+    
+    def on_rollups_computed(self, totals):
+        """Affiche les totaux des tables d'agrégats."""
+        self.rollup_table.setRowCount(len(totals))
+        for row, (period, value, duree) in enumerate(totals):
+            self.rollup_table.setItem(row, 0, QTableWidgetItem(str(period)))
+            self.rollup_table.setItem(row, 1, QTableWidgetItem(value))
+            self.rollup_table.setItem(row, 2, QTableWidgetItem(format_duration(duree)))
+        self.status_bar.showMessage("Calcul des agrégats terminé")
+    
+    def on_rollups_failed(self, error):
+        """Signale une erreur lors du calcul des agrégats."""
+        QMessageBox.critical(self, "Erreur", f"Erreur lors du calcul des agrégats : {error}")
+        self.status_bar.showMessage("Erreur lors du calcul des agrégats")
+    
+    def generate_team_timesheets(self):
+        """Génère en arrière-plan la feuille de temps de chaque auteur de la période, au format choisi."""
+        from src.core.batch_generator import BatchGenerator
+        
+        self.config.reload_if_changed()
+        self.status_bar.showMessage("Génération des feuilles de temps de l'équipe en cours...")
+        date_from = self.date_from.date().toPyDate()
+        date_to = self.date_to.date().toPyDate()
+        
+        self.analysis_cancel_event.clear()
+        self.start_task(BatchGenerator(self.config).generate, self.on_team_timesheets_generated,
+                        self.on_team_timesheets_failed, date_from, date_to,
+                        formats=[self.export_format_combo.currentData()], cancel_event=self.analysis_cancel_event)
+    
+    def on_team_timesheets_generated(self, output_files):
+        """Signale les fichiers générés pour l'équipe."""
+        export_path = self.config.get_export_path()
+        self.status_bar.showMessage(f"{len(output_files)} fichiers générés dans {export_path}")
+        QMessageBox.information(self, "Fichiers générés", f"{len(output_files)} fichiers ont été générés dans :\n{export_path}")
+    
+    def on_team_timesheets_failed(self, error):
+        """Signale une erreur lors de la génération des feuilles de temps de l'équipe."""
+        QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération des feuilles de temps : {error}")
+        self.status_bar.showMessage("Erreur lors de la génération des feuilles de temps")
+    
+    def export_timesheet(self):
+        """Génère la feuille de temps analysée au format choisi."""
+        export_format = self.export_format_combo.currentData()
+        label = self.export_format_combo.currentText()
+        self.status_bar.showMessage(f"Génération du fichier {label} en cours...")
+        author = self.author_combo.currentText()
+        
+        try:
+            output_file = self.timesheet_generator.generate(
+                export_format, self.durees_par_journee, author=author if author != "Tous" else None
+            )
+            self.status_bar.showMessage(f"Fichier {label} généré : {output_file}")
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération du fichier {label} : {str(e)}")
+            self.status_bar.showMessage(f"Erreur lors de la génération du fichier {label}")
     
     def generate_json(self):
         """Génère un fichier JSON avec les durées par journée."""
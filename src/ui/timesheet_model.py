@@ -0,0 +1,171 @@
+from bisect import bisect_right
+from datetime import timedelta
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QBrush, QColor, QFont
+
+
+HEADERS = ["Message de commit", "Ticket", "Durée (heures)", "Heure de début", "Heure de fin"]
+
+# Couleurs des lignes
+DAY_COLOR = QColor(220, 220, 220)  # gris clair
+ERROR_COLOR = QColor(255, 150, 150)  # rouge clair
+MORNING_COLOR = QColor(200, 255, 200)  # vert clair
+AFTERNOON_COLOR = QColor(200, 220, 255)  # bleu clair
+
+
+def format_duration(duree):
+    """
+    Formate une durée en HH:MM (jamais négative).
+
+    Args:
+        duree: Un timedelta (ou Timedelta), ou None.
+
+    Returns:
+        La durée formatée.
+    """
+    if duree is None or not hasattr(duree, 'total_seconds'):
+        duree = timedelta(0)
+    seconds = max(duree.total_seconds(), 0)
+    heures = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    return f"{heures:02d}:{minutes:02d}"
+
+
+def format_time(value):
+    """Formate une heure en HH:MM (vide si la valeur n'est pas une date)."""
+    return value.strftime('%H:%M') if hasattr(value, 'strftime') else ''
+
+
+class TimesheetTableModel(QAbstractTableModel):
+    """
+    Modèle de tableau sur les durées par journée.
+
+    Chaque journée occupe une ligne de titre suivie d'une ligne par ticket. Les lignes ne sont
+    pas matérialisées : une ligne est retrouvée par recherche dichotomique dans les positions
+    de début des journées, et son texte et sa couleur sont calculés à l'affichage.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.days = []
+        self.tickets = []
+        self.day_rows = []  # Ligne de titre de chaque journée
+        self.total_rows = 0
+        self.morning_end = "13:00"
+        self.afternoon_start = "14:00"
+        self.bold_font = QFont('Arial', weight=QFont.Bold)
+        self.brushes = {
+            'day': QBrush(DAY_COLOR),
+            'error': QBrush(ERROR_COLOR),
+            'morning': QBrush(MORNING_COLOR),
+            'afternoon': QBrush(AFTERNOON_COLOR),
+            'failed': QBrush(Qt.red)
+        }
+
+    def set_durations(self, durees_par_journee, work_periods):
+        """
+        Remplace les données affichées.
+
+        Args:
+            durees_par_journee: Le dictionnaire {journée: [tickets]} issu de l'analyse.
+            work_periods: Les plages horaires de travail (pour colorer matin et après-midi).
+        """
+        self.beginResetModel()
+        self.days = sorted(durees_par_journee)
+        self.tickets = [durees_par_journee[day] for day in self.days]
+        self.day_rows = []
+        row = 0
+        for tickets in self.tickets:
+            self.day_rows.append(row)
+            row += 1 + len(tickets)
+        self.total_rows = row
+        self.morning_end = work_periods['morning']['end']
+        self.afternoon_start = work_periods['afternoon']['start']
+        self.endResetModel()
+
+    def locate(self, row):
+        """
+        Retourne la position d'une ligne.
+
+        Args:
+            row: Le numéro de ligne.
+
+        Returns:
+            Un tuple (indice de la journée, indice du ticket), l'indice du ticket valant None
+            pour la ligne de titre de la journée.
+        """
+        day_index = bisect_right(self.day_rows, row) - 1
+        offset = row - self.day_rows[day_index]
+        return day_index, (offset - 1 if offset else None)
+
+    def is_day_row(self, row):
+        """Indique si la ligne est la ligne de titre d'une journée."""
+        return self.locate(row)[1] is None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.total_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        day_index, ticket_index = self.locate(index.row())
+        column = index.column()
+
+        # Ligne de titre de la journée
+        if ticket_index is None:
+            if role == Qt.DisplayRole:
+                return str(self.days[day_index]) if column == 0 else None
+            if role == Qt.FontRole:
+                return self.bold_font
+            if role == Qt.BackgroundRole:
+                return self.brushes['day']
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+            return QVariant()
+
+        ticket = self.tickets[day_index][ticket_index]
+        try:
+            if role == Qt.DisplayRole:
+                return self.display_text(ticket, column)
+            if role == Qt.BackgroundRole:
+                return self.background(ticket)
+        except Exception:
+            if role == Qt.DisplayRole:
+                return 'Erreur'
+            return self.brushes['failed']
+        if role == Qt.TextAlignmentRole and column > 0:
+            return Qt.AlignCenter
+        return QVariant()
+
+    def display_text(self, ticket, column):
+        """Retourne le texte d'une cellule de ticket."""
+        if column == 0:
+            return ticket.get('message', '')
+        if column == 1:
+            return ticket.get('ticket', '?')
+        if column == 2:
+            return format_duration(ticket.get('duree'))
+        if column == 3:
+            return format_time(ticket.get('debut'))
+        return format_time(ticket.get('fin'))
+
+    def background(self, ticket):
+        """Retourne la couleur d'une ligne de ticket : erreur, matin ou après-midi."""
+        if ticket.get('erreur', False):
+            return self.brushes['error']
+        heure_debut = format_time(ticket.get('debut'))
+        if heure_debut:
+            if heure_debut < self.morning_end:
+                return self.brushes['morning']
+            if heure_debut >= self.afternoon_start:
+                return self.brushes['afternoon']
+        return QVariant()
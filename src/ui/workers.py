@@ -0,0 +1,46 @@
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.core.git_processor import OperationCancelled
+
+
+class WorkerSignals(QObject):
+    """Signaux émis par un Worker, reçus dans le thread de l'interface."""
+
+    progress = pyqtSignal(str, int, int, str)  # étape, courant, total, message
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """Tâche exécutée dans le QThreadPool, qui rend compte de sa progression par signaux."""
+
+    def __init__(self, fn, *args, **kwargs):
+        """
+        Initialise la tâche.
+
+        Args:
+            fn: La fonction à exécuter. Elle reçoit un argument nommé progress,
+                fonction (étape, courant, total, message) à appeler pour signaler l'avancement.
+            *args: Arguments positionnels transmis à la fonction.
+            **kwargs: Arguments nommés transmis à la fonction.
+        """
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        """Exécute la fonction et émet finished, failed ou cancelled selon son issue."""
+        try:
+            result = self.fn(*self.args, progress=self.signals.progress.emit, **self.kwargs)
+        except OperationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
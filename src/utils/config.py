@@ -1,20 +1,77 @@
+import atexit
+import copy
 import os
+import threading
+import weakref
 import yaml
 from pathlib import Path
 
 
+# Configurations ouvertes : leurs écritures en attente sont faites à la sortie du programme, par
+# un seul gestionnaire atexit (une configuration fermée ou libérée en sort)
+_open_configs = weakref.WeakSet()
+
+
+def _flush_open_configs():
+    """Écrit les configurations ouvertes qui ont des modifications en attente."""
+    for config in list(_open_configs):
+        config.flush()
+
+
+atexit.register(_flush_open_configs)
+
+
 class Config:
-    """Classe de gestion de la configuration de l'application."""
+    """
+    Classe de gestion de la configuration de l'application.
     
-    def __init__(self, config_path=None):
+    Les modifications sont faites en mémoire : save_config marque la configuration comme modifiée
+    et l'écriture du fichier YAML est différée de save_delay secondes, les sauvegardes rapprochées
+    (saisie au clavier, validation d'un dialogue) n'entraînant qu'une écriture. L'écriture est
+    atomique (fichier temporaire puis renommage). Si le fichier a été modifié par un autre
+    processus (la ligne de commande, par exemple), il est relu et seules les clés modifiées ici
+    sont réécrites par-dessus.
+    """
+    
+    def __init__(self, config_path=None, save_delay=0.5):
         self.config_path = config_path or Path("config.yaml")
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self._mtime = None
         self.config = self._load_config()
+        self._saved = copy.deepcopy(self.config)  # Dernier état lu ou écrit sur disque
+        _open_configs.add(self)
+    
+    def __getstate__(self):
+        """État sérialisable (pickle), pour transmettre la configuration à un processus de calcul."""
+        return {'config_path': self.config_path, 'config': copy.deepcopy(self.config), 'mtime': self._mtime}
+    
+    def __setstate__(self, state):
+        """Restaure une copie de la configuration : sans modification en attente ni écriture différée."""
+        self.config_path = state['config_path']
+        self.config = state['config']
+        self.save_delay = 0
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self._mtime = state['mtime']
+        self._saved = copy.deepcopy(self.config)
+    
+    def _file_mtime(self):
+        """Retourne la date de modification (ns) du fichier de configuration, ou None."""
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
     
     def _load_config(self):
         """Charge la configuration depuis le fichier YAML."""
         if os.path.exists(self.config_path):
+            self._mtime = self._file_mtime()
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+                return yaml.safe_load(f) or self._default_config()
         return self._default_config()
     
     def _default_config(self):
@@ -25,16 +82,84 @@ class Config:
             "ticket_pattern": r'([A-Z]+-\d+)',
             "export_path": "exports",
             "work_hours_per_day": 8,
+            "max_workers": 4,
+            "git_timeout": 300,
+            "offline_mode": False,
+            "git_filtering": True,
+            "dedup_mode": "hash",
+            "analysis_engine": "vectorized",
+            "analysis_processes": 1,
+            "analysis_cache_size": 16,
+            "analysis_cache_dir": "",
+            "profiling": False,
+            "profiling_trace_file": "",
             "work_periods": {
                 "morning": {"start": "09:00", "end": "13:00"},
                 "afternoon": {"start": "14:00", "end": "18:00"}
             }
         }
     
+    def _changed_keys(self):
+        """Retourne les clés modifiées en mémoire depuis la dernière lecture ou écriture."""
+        keys = set(self.config) | set(self._saved)
+        return {key for key in keys if self.config.get(key, KeyError) != self._saved.get(key, KeyError)}
+    
+    def reload_if_changed(self):
+        """
+        Relit le fichier de configuration s'il a été modifié par un autre processus.
+        
+        Les clés modifiées ici et pas encore écrites sont conservées.
+        
+        Returns:
+            True si le fichier a été relu.
+        """
+        with self._lock:
+            mtime = self._file_mtime()
+            if mtime is None or mtime == self._mtime:
+                return False
+            changed = {key: self.config[key] for key in self._changed_keys() if key in self.config}
+            removed = {key for key in self._changed_keys() if key not in self.config}
+            self.config = self._load_config()
+            self._saved = copy.deepcopy(self.config)
+            self.config.update(copy.deepcopy(changed))
+            for key in removed:
+                self.config.pop(key, None)
+            return True
+    
     def save_config(self):
-        """Sauvegarde la configuration dans le fichier YAML."""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self.config, f, default_flow_style=False)
+        """Demande la sauvegarde de la configuration (différée de save_delay secondes)."""
+        with self._lock:
+            self._dirty = True
+            if not self.save_delay:
+                self.flush()
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self):
+        """Écrit immédiatement la configuration si elle a été modifiée."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self.reload_if_changed()
+            tmp_path = f"{self.config_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                yaml.dump(self.config, f, default_flow_style=False)
+            os.replace(tmp_path, self.config_path)
+            self._mtime = self._file_mtime()
+            self._saved = copy.deepcopy(self.config)
+            self._dirty = False
+    
+    def close(self):
+        """Écrit la configuration si elle a été modifiée ; elle n'est plus écrite à la sortie du programme."""
+        self.flush()
+        _open_configs.discard(self)
     
     def get_repositories(self):
         """Retourne la liste des dépôts configurés."""
@@ -42,17 +167,19 @@ class Config:
     
     def add_repository(self, path):
         """Ajoute un dépôt à la configuration."""
-        if "repositories" not in self.config:
-            self.config["repositories"] = []
-        if path not in self.config["repositories"]:
-            self.config["repositories"].append(path)
-            self.save_config()
+        with self._lock:
+            if "repositories" not in self.config:
+                self.config["repositories"] = []
+            if path not in self.config["repositories"]:
+                self.config["repositories"].append(path)
+                self.save_config()
     
     def remove_repository(self, path):
         """Supprime un dépôt de la configuration."""
-        if "repositories" in self.config and path in self.config["repositories"]:
-            self.config["repositories"].remove(path)
-            self.save_config()
+        with self._lock:
+            if "repositories" in self.config and path in self.config["repositories"]:
+                self.config["repositories"].remove(path)
+                self.save_config()
     
     def get_authors(self):
         """Retourne la liste des auteurs configurés."""
@@ -60,17 +187,19 @@ class Config:
     
     def add_author(self, author):
         """Ajoute un auteur à la configuration."""
-        if "authors" not in self.config:
-            self.config["authors"] = []
-        if author not in self.config["authors"]:
-            self.config["authors"].append(author)
-            self.save_config()
+        with self._lock:
+            if "authors" not in self.config:
+                self.config["authors"] = []
+            if author not in self.config["authors"]:
+                self.config["authors"].append(author)
+                self.save_config()
     
     def remove_author(self, author):
         """Supprime un auteur de la configuration."""
-        if "authors" in self.config and author in self.config["authors"]:
-            self.config["authors"].remove(author)
-            self.save_config()
+        with self._lock:
+            if "authors" in self.config and author in self.config["authors"]:
+                self.config["authors"].remove(author)
+                self.save_config()
     
     def get_ticket_pattern(self):
         """Retourne le pattern pour extraire les tickets."""
@@ -78,8 +207,9 @@ class Config:
     
     def set_ticket_pattern(self, pattern):
         """Définit le pattern pour extraire les tickets."""
-        self.config["ticket_pattern"] = pattern
-        self.save_config()
+        with self._lock:
+            self.config["ticket_pattern"] = pattern
+            self.save_config()
     
     def get_export_path(self):
         """Retourne le chemin d'exportation."""
@@ -87,8 +217,9 @@ class Config:
     
     def set_export_path(self, path):
         """Définit le chemin d'exportation."""
-        self.config["export_path"] = path
-        self.save_config()
+        with self._lock:
+            self.config["export_path"] = path
+            self.save_config()
     
     def get_work_hours_per_day(self):
         """Retourne le nombre d'heures de travail par jour."""
@@ -96,8 +227,122 @@ class Config:
     
     def set_work_hours_per_day(self, hours):
         """Définit le nombre d'heures de travail par jour."""
-        self.config["work_hours_per_day"] = hours
-        self.save_config()
+        with self._lock:
+            self.config["work_hours_per_day"] = hours
+            self.save_config()
+    
+    def get_max_workers(self):
+        """Retourne le nombre maximal de dépôts traités en parallèle lors de l'extraction."""
+        return self.config.get("max_workers", 4)
+    
+    def set_max_workers(self, max_workers):
+        """Définit le nombre maximal de dépôts traités en parallèle lors de l'extraction."""
+        with self._lock:
+            self.config["max_workers"] = max_workers
+            self.save_config()
+    
+    def get_git_timeout(self):
+        """Retourne le délai maximal (en secondes) accordé aux commandes Git d'un dépôt."""
+        return self.config.get("git_timeout", 300)
+    
+    def set_git_timeout(self, timeout):
+        """Définit le délai maximal (en secondes) accordé aux commandes Git d'un dépôt."""
+        with self._lock:
+            self.config["git_timeout"] = timeout
+            self.save_config()
+    
+    def get_offline_mode(self):
+        """Indique si l'extraction lit les références existantes sans contacter les dépôts distants (pas de git fetch)."""
+        return self.config.get("offline_mode", False)
+    
+    def set_offline_mode(self, offline):
+        """Active ou désactive l'extraction hors ligne (pas de git fetch)."""
+        with self._lock:
+            self.config["offline_mode"] = offline
+            self.save_config()
+    
+    def get_git_filtering(self):
+        """Indique si l'analyse lit les commits de la période et des auteurs directement dans Git (filtrés par git log)."""
+        return self.config.get("git_filtering", True)
+    
+    def set_git_filtering(self, enabled):
+        """Active ou désactive le filtrage des commits par git log lors de l'analyse."""
+        with self._lock:
+            self.config["git_filtering"] = enabled
+            self.save_config()
+    
+    def get_dedup_mode(self):
+        """
+        Retourne le mode de dédoublonnage des commits à l'ingestion : 'off', 'hash' (même commit
+        dans plusieurs dépôts ou branches) ou 'content' (aussi même auteur, date et sujet : cherry-picks).
+        """
+        return self.config.get("dedup_mode", "hash")
+    
+    def set_dedup_mode(self, mode):
+        """Définit le mode de dédoublonnage des commits à l'ingestion ('off', 'hash' ou 'content')."""
+        with self._lock:
+            self.config["dedup_mode"] = mode
+            self.save_config()
+    
+    def get_analysis_engine(self):
+        """Retourne le moteur d'analyse des tickets ('vectorized' ou 'loop')."""
+        return self.config.get("analysis_engine", "vectorized")
+    
+    def set_analysis_engine(self, engine):
+        """Définit le moteur d'analyse des tickets ('vectorized' ou 'loop')."""
+        with self._lock:
+            self.config["analysis_engine"] = engine
+            self.save_config()
+    
+    def get_analysis_processes(self):
+        """Retourne le nombre de processus entre lesquels les journées sont analysées (1 : sans pool)."""
+        return self.config.get("analysis_processes", 1)
+    
+    def set_analysis_processes(self, processes):
+        """Définit le nombre de processus entre lesquels les journées sont analysées (1 : sans pool)."""
+        with self._lock:
+            self.config["analysis_processes"] = processes
+            self.save_config()
+    
+    def get_analysis_cache_size(self):
+        """Retourne le nombre de résultats d'analyse conservés en cache."""
+        return self.config.get("analysis_cache_size", 16)
+    
+    def set_analysis_cache_size(self, size):
+        """Définit le nombre de résultats d'analyse conservés en cache."""
+        with self._lock:
+            self.config["analysis_cache_size"] = size
+            self.save_config()
+    
+    def get_analysis_cache_dir(self):
+        """Retourne le répertoire du cache d'analyse sur disque (vide : cache en mémoire seulement)."""
+        return self.config.get("analysis_cache_dir", "")
+    
+    def set_analysis_cache_dir(self, directory):
+        """Définit le répertoire du cache d'analyse sur disque (vide : cache en mémoire seulement)."""
+        with self._lock:
+            self.config["analysis_cache_dir"] = directory
+            self.save_config()
+    
+    def get_profiling(self):
+        """Indique si la durée des étapes du traitement est mesurée (résumé dans la barre d'état)."""
+        return self.config.get("profiling", False)
+    
+    def set_profiling(self, enabled):
+        """Active ou désactive la mesure de la durée des étapes du traitement."""
+        with self._lock:
+            self.config["profiling"] = enabled
+            self.save_config()
+    
+    def get_profiling_trace_file(self):
+        """Retourne le fichier de trace (format Chrome Trace Event) écrit après chaque tâche mesurée (vide : aucun)."""
+        return self.config.get("profiling_trace_file", "")
+    
+    def set_profiling_trace_file(self, trace_file):
+        """Définit le fichier de trace écrit après chaque tâche mesurée (vide : aucun)."""
+        with self._lock:
+            self.config["profiling_trace_file"] = trace_file
+            self.save_config()
     
     def get_work_periods(self):
         """Retourne les plages horaires de travail (matin et après-midi)."""
@@ -108,8 +353,39 @@ class Config:
 
     def set_work_periods(self, morning_start, morning_end, afternoon_start, afternoon_end):
         """Définit les plages horaires de travail (matin et après-midi)."""
-        self.config["work_periods"] = {
-            "morning": {"start": morning_start, "end": morning_end},
-            "afternoon": {"start": afternoon_start, "end": afternoon_end}
-        }
-        self.save_config() 
\ No newline at end of file
+        with self._lock:
+            self.config["work_periods"] = {
+                "morning": {"start": morning_start, "end": morning_end},
+                "afternoon": {"start": afternoon_start, "end": afternoon_end}
+            }
+            self.save_config()
+    
+    def get_work_calendar(self):
+        """
+        Retourne le calendrier de travail : plages par jour de la semaine, jours non travaillés
+        et exceptions datées (par défaut, les plages matin et après-midi tous les jours).
+        """
+        return self.config.get("work_calendar", {})
+    
+    def set_work_calendar(self, periods=None, weekdays=None, non_working_days=None, overrides=None):
+        """
+        Définit le calendrier de travail.
+        
+        Args:
+            periods: Les plages [['HH:MM', 'HH:MM'], ...] d'un jour ordinaire (None : matin et après-midi).
+            weekdays: Les plages propres à certains jours de la semaine {0 (lundi) à 6: [plages]}.
+            non_working_days: Les dates non travaillées ['AAAA-MM-JJ', ...].
+            overrides: Les plages propres à certaines dates {'AAAA-MM-JJ': [plages]}.
+        """
+        calendar = {}
+        if periods is not None:
+            calendar["periods"] = [list(period) for period in periods]
+        if weekdays:
+            calendar["weekdays"] = {int(day): [list(period) for period in day_periods] for day, day_periods in weekdays.items()}
+        if non_working_days:
+            calendar["non_working_days"] = [str(day) for day in non_working_days]
+        if overrides:
+            calendar["overrides"] = {str(day): [list(period) for period in day_periods] for day, day_periods in overrides.items()}
+        with self._lock:
+            self.config["work_calendar"] = calendar
+            self.save_config()
@@ -0,0 +1,218 @@
+"""
+Instrumentation légère des étapes du traitement.
+
+Chaque étape (commande Git d'un dépôt, chargement, analyse, remplissage du tableau...) est
+entourée d'un intervalle nommé qui mesure sa durée et peut porter des compteurs (lignes,
+octets, dépôt). Désactivé, profiler.span() retourne un intervalle inerte partagé : le coût se
+limite à un appel et un test.
+
+Usage :
+    with profiler.span('git log', repo=repo_path) as span:
+        ...
+        span.set(rows=count, bytes=size)
+
+Les intervalles se résument en une ligne (barre d'état, console) ou s'exportent au format
+Chrome Trace Event (JSON), lisible par chrome://tracing, Perfetto ou speedscope (flamegraph).
+"""
+import json
+import os
+import threading
+import time
+
+
+def format_seconds(seconds):
+    """Formate une durée en ms ou en s."""
+    return f"{seconds * 1000:.0f} ms" if seconds < 1 else f"{seconds:.1f} s"
+
+
+def format_bytes(size):
+    """Formate une taille en octets, Ko, Mo ou Go."""
+    for unit in ('o', 'Ko', 'Mo'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'o' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} Go"
+
+
+class NullSpan:
+    """Intervalle inerte retourné lorsque l'instrumentation est désactivée."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **attributes):
+        """Ignore les compteurs."""
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    """Intervalle mesuré : nom, début et fin (ns), fil d'exécution et compteurs."""
+
+    __slots__ = ('profiler', 'name', 'attributes', 'start', 'end', 'thread')
+
+    def __init__(self, profiler, name, attributes):
+        self.profiler = profiler
+        self.name = name
+        self.attributes = attributes
+        self.start = self.end = 0
+        self.thread = threading.get_ident()
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        self.profiler.record(self)
+        return False
+
+    def set(self, **attributes):
+        """Ajoute ou remplace des compteurs (rows, bytes...)."""
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self):
+        """La durée de l'intervalle, en secondes."""
+        return (self.end - self.start) / 1e9
+
+
+class Profiler:
+    """Collecteur des intervalles, partagé par les fils d'exécution."""
+
+    def __init__(self, enabled=False):
+        """
+        Initialise le collecteur.
+
+        Args:
+            enabled: True pour enregistrer les intervalles.
+        """
+        self.enabled = enabled
+        self.spans = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name, **attributes):
+        """
+        Retourne l'intervalle à utiliser comme gestionnaire de contexte.
+
+        Args:
+            name: Le nom de l'étape.
+            **attributes: Les compteurs connus dès le début (dépôt, moteur...).
+
+        Returns:
+            Un Span, ou NULL_SPAN si l'instrumentation est désactivée.
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attributes)
+
+    def record(self, span):
+        """Enregistre un intervalle terminé."""
+        with self._lock:
+            self.spans.append(span)
+
+    def reset(self):
+        """Oublie les intervalles enregistrés."""
+        with self._lock:
+            self.spans = []
+            self._origin = time.perf_counter_ns()
+
+    def totals(self):
+        """
+        Agrège les intervalles par nom.
+
+        Returns:
+            Un dictionnaire {nom: {'count', 'seconds', 'rows', 'bytes'}}, par durée décroissante.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        totals = {}
+        for span in spans:
+            total = totals.setdefault(span.name, {'count': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0})
+            total['count'] += 1
+            total['seconds'] += span.duration
+            total['rows'] += span.attributes.get('rows', 0)
+            total['bytes'] += span.attributes.get('bytes', 0)
+        return dict(sorted(totals.items(), key=lambda item: item[1]['seconds'], reverse=True))
+
+    def summary(self, limit=None):
+        """
+        Résume les étapes les plus longues en une ligne.
+
+        Args:
+            limit: Le nombre d'étapes affichées (toutes par défaut).
+
+        Returns:
+            Le résumé, vide si aucun intervalle n'a été enregistré.
+        """
+        items = list(self.totals().items())[:limit]
+        return " · ".join(f"{name} {format_seconds(total['seconds'])}" for name, total in items)
+
+    def report(self):
+        """
+        Retourne le détail des étapes, une par ligne : occurrences, durée cumulée, lignes et octets.
+
+        Returns:
+            Le rapport, vide si aucun intervalle n'a été enregistré.
+        """
+        lines = []
+        for name, total in self.totals().items():
+            line = f"{name:28s} {total['count']:5d} x {format_seconds(total['seconds']):>9s}"
+            if total['rows']:
+                line += f"  {total['rows']} lignes"
+            if total['bytes']:
+                line += f"  {format_bytes(total['bytes'])}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def trace_events(self):
+        """
+        Convertit les intervalles en événements complets ('X') du format Chrome Trace Event.
+
+        Returns:
+            La liste des événements (horodatages en microsecondes depuis reset()).
+        """
+        with self._lock:
+            spans = list(self.spans)
+            origin = self._origin
+        pid = os.getpid()
+        return [
+            {
+                'name': span.name,
+                'ph': 'X',
+                'ts': (span.start - origin) / 1000,
+                'dur': (span.end - span.start) / 1000,
+                'pid': pid,
+                'tid': span.thread,
+                'args': {key: str(value) if not isinstance(value, (int, float)) else value
+                         for key, value in span.attributes.items()}
+            }
+            for span in sorted(spans, key=lambda span: span.start)
+        ]
+
+    def write_trace(self, trace_file):
+        """
+        Écrit la trace au format Chrome Trace Event (JSON).
+
+        Args:
+            trace_file: Le fichier de sortie.
+
+        Returns:
+            Le chemin du fichier écrit.
+        """
+        with open(trace_file, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f)
+        return trace_file
+
+
+# Collecteur de l'application, activé par la configuration ou par --profile
+profiler = Profiler()
@@ -0,0 +1,75 @@
+import os
+from datetime import date
+
+import pandas as pd
+
+from src.core.analysis_cache import DayResultCache
+from src.core.ticket_analyzer import TicketAnalyzer
+from src.utils.config import Config
+
+
+def make_commits():
+    dates = pd.to_datetime([
+        '2024-01-02 10:00', '2024-01-02 16:00',
+        '2024-01-03 11:00', '2024-01-03 15:00',
+        '2024-01-04 10:30', '2024-01-04 17:00'
+    ])
+    return pd.DataFrame({
+        'hash': [f'{i:040x}' for i in range(len(dates))],
+        'author': ['Auteur'] * len(dates),
+        'date': dates,
+        'message': [f'PROJ-{i} travail' for i in range(len(dates))],
+        'repo': ['/depot'] * len(dates)
+    })
+
+
+def test_edited_day_and_calendar_change_invalidate_only_that_day(tmp_path):
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    analyzer = TicketAnalyzer(config)
+    df = make_commits()
+    digests = analyzer.day_digests(df)
+    assert len(set(digests.values())) == 3
+
+    edited = df.copy()
+    edited.loc[3, 'message'] = 'PROJ-3 travail corrigé'
+    changed = analyzer.day_digests(edited)
+    assert [day for day in digests if changed[day] != digests[day]] == [date(2024, 1, 3)]
+
+    config.set_work_calendar(overrides={'2024-01-04': [('10:00', '16:00')]})
+    changed = analyzer.day_digests(df)
+    assert [day for day in digests if changed[day] != digests[day]] == [date(2024, 1, 4)]
+
+    # Seule la journée modifiée est réanalysée
+    day_cache = DayResultCache(directory=str(tmp_path / 'cache'))
+    analyzer.analyze_days(df, day_cache)
+    calls = []
+    result = analyzer.analyze_days(edited, day_cache, progress=lambda missing, total: calls.append((missing, total)))
+    assert calls == [(1, 3)]
+    assert result[date(2024, 1, 3)][1]['message'] == 'PROJ-3 travail corrigé'
+
+
+def test_day_cache_appends_one_batch_per_update(tmp_path):
+    directory = str(tmp_path / 'cache')
+    path = os.path.join(directory, DayResultCache.FILE)
+    cache = DayResultCache(max_days=4, directory=directory)
+    cache.update({date(2024, 1, 2): 'a', date(2024, 1, 3): 'b'}, {date(2024, 1, 2): ['A']})
+    with open(path, 'rb') as f:
+        first = f.read()
+    cache.update({date(2024, 1, 4): 'c'}, {date(2024, 1, 4): ['C']})
+    with open(path, 'rb') as f:
+        journal = f.read()
+    # Le premier lot n'est pas réécrit : le second lui est ajouté
+    assert len(journal) > len(first) and journal.startswith(first)
+
+    reloaded = DayResultCache(max_days=4, directory=directory)
+    known, missing = reloaded.lookup({date(2024, 1, 2): 'a', date(2024, 1, 3): 'b', date(2024, 1, 4): 'c', date(2024, 1, 5): 'd'})
+    assert known == {date(2024, 1, 2): ['A'], date(2024, 1, 3): None, date(2024, 1, 4): ['C']}
+    assert missing == [date(2024, 1, 5)]
+
+    # Au-delà de COMPACT_RATIO * max_days journées écrites, le journal est réécrit sans les évincées
+    for index in range(6):
+        reloaded.update({date(2024, 2, index + 1): f'x{index}'}, {})
+    reloaded = DayResultCache(max_days=4, directory=directory)
+    known, _ = reloaded.lookup({date(2024, 1, 2): 'a', date(2024, 2, 6): 'x5'})
+    assert list(known) == [date(2024, 2, 6)]
+    assert reloaded._journal_days <= DayResultCache.COMPACT_RATIO * 4
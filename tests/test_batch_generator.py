@@ -0,0 +1,31 @@
+from datetime import date
+
+import pandas as pd
+
+from src.core.batch_generator import PROCESS_POOL_MIN_AUTHORS, BatchGenerator, analyze_author
+from src.utils.config import Config
+
+
+def test_pool_output_matches_serial_per_author(tmp_path):
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.set_max_workers(2)
+    dates = pd.date_range('2024-01-01 08:15', periods=400, freq='53min')
+    df = pd.DataFrame({
+        'hash': [f'{i:040x}' for i in range(len(dates))],
+        'author': [f'Auteur {i % (PROCESS_POOL_MIN_AUTHORS + 1)}' for i in range(len(dates))],
+        'date': dates,
+        'message': [f'PROJ-{i % 13} travail' if i % 4 else 'sans ticket' for i in range(len(dates))],
+        'repo': [f'/depots/{i % 3}' for i in range(len(dates))]
+    }).sample(frac=1, random_state=1)
+    generator = BatchGenerator(config)
+    generator.git_processor.load_git_logs_dataframe = lambda *args, **kwargs: df
+
+    authors = sorted(df['author'].unique()) + ['Sans commit']
+    batch = generator.analyze(date(2024, 1, 1), date(2024, 1, 31), authors)
+
+    empty = df.iloc[:0]
+    serial = {author: analyze_author(config, df[df['author'] == author] if author in set(df['author']) else empty)
+              for author in authors}
+    assert list(batch) == authors
+    assert all(batch[author] for author in authors[:-1]) and batch['Sans commit'] == {}
+    assert batch == serial
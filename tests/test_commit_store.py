@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from src.core.commit_store import CommitStore
+from src.core.git_log_stream import CommitRecord
+
+
+def commit_hash(number):
+    return hashlib.sha1(str(number).encode()).hexdigest()
+
+
+def record(number, when, author='Alice', message=None):
+    return CommitRecord(commit_hash(number), author, when, message or f'PROJ-{number} travail')
+
+
+def test_commits_are_partitioned_by_month_and_sorted(tmp_path):
+    store = CommitStore(str(tmp_path), flush_rows=2)
+    records = [
+        record(1, datetime(2024, 2, 3, 10, 0)),
+        record(2, datetime(2024, 1, 31, 23, 59)),
+        record(3, datetime(2024, 1, 5, 9, 0), 'Bob'),
+        record(4, datetime(2024, 2, 1, 8, 30), 'Bob')
+    ]
+    assert store.append('/depot', records) == 4
+    store.save()
+
+    with open(tmp_path / CommitStore.MANIFEST, encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert sorted(manifest['partitions']) == ['2024-01', '2024-02']
+    january = manifest['partitions']['2024-01']
+    assert (january['rows'], january['min'], january['max']) == (2, '2024-01-05T09:00', '2024-01-31T23:59')
+    assert manifest['authors'] == ['Alice', 'Bob'] and manifest['repositories'] == ['/depot']
+
+    reopened = CommitStore(str(tmp_path))
+    assert reopened.row_count() == 4
+    for partition in reopened.manifest['partitions'].values():
+        dates = np.load(os.path.join(tmp_path, partition['dir'], 'date.npy'))
+        assert (np.diff(dates.astype(np.int64)) >= 0).all()
+
+
+def test_reads_slice_the_period_without_overflow(tmp_path):
+    store = CommitStore(str(tmp_path))
+    start = datetime(2024, 1, 30, 8, 0)
+    store.append('/depot', [record(i, start + timedelta(hours=12 * i)) for i in range(10)])
+    store.save()
+
+    df = store.load_dataframe(date(2024, 1, 31), date(2024, 2, 1))
+    assert df['date'].dt.date.unique().tolist() == [date(2024, 1, 31), date(2024, 2, 1)]
+    assert len(df) == 4
+    assert len(store.load_dataframe(date.min, date.max)) == 10
+    assert len(store.load_dataframe(date_to=date.max)) == 10
+    assert store.load_dataframe(date(2025, 1, 1), date.max).empty
+    assert list(store.load_dataframe().columns) == ['hash', 'author', 'date', 'message', 'repo']
+
+
+def test_appends_add_runs_without_rewriting_the_month(tmp_path):
+    store = CommitStore(str(tmp_path))
+    store.append('/depot', [record(i, datetime(2024, 3, 1 + i, 10)) for i in range(5)])
+    store.save()
+    first_dir = store.manifest['partitions']['2024-03']['dir']
+
+    for i in range(5, 5 + CommitStore.MAX_PARTITION_RUNS):
+        store = CommitStore(str(tmp_path))
+        # Même minute qu'un commit déjà présent : l'ordre de lecture reste date, dépôt, hash
+        store.append('/depot', [record(i, datetime(2024, 3, i - 4, 10))])
+        store.save()
+        partition = store.manifest['partitions']['2024-03']
+        assert partition['dir'] == first_dir and os.path.isdir(tmp_path / first_dir)
+    assert len(partition['runs']) == CommitStore.MAX_PARTITION_RUNS
+    assert partition['rows'] == 5 + CommitStore.MAX_PARTITION_RUNS
+
+    df = CommitStore(str(tmp_path)).load_dataframe()
+    expected = df.sort_values(['date', 'repo', 'hash'], kind='stable').reset_index(drop=True)
+    assert df.equals(expected)
+
+    # Au-delà de MAX_PARTITION_RUNS lots, la partition est réécrite en un seul répertoire
+    store = CommitStore(str(tmp_path))
+    store.append('/depot', [record(99, datetime(2024, 3, 20, 10))])
+    store.save()
+    partition = store.manifest['partitions']['2024-03']
+    assert 'runs' not in partition and partition['dir'] != first_dir
+    assert not os.path.exists(tmp_path / first_dir)
+    compacted = store.load_dataframe()
+    assert compacted.drop(compacted.index[compacted['hash'] == commit_hash(99)]).reset_index(drop=True).equals(df)
+
+
+def test_batched_dedup_matches_one_by_one(tmp_path):
+    when = datetime(2024, 4, 2, 10)
+    records = [
+        record(1, when),
+        record(1, when),  # Même hash dans le lot
+        CommitRecord('abc1234', 'Alice', when, 'hash court'),
+        CommitRecord('abc1234', 'Alice', when, 'hash court'),
+        record(2, when + timedelta(hours=1), message='PROJ-2 cherry-pick'),
+        record(3, when + timedelta(hours=1), message='PROJ-2 cherry-pick'),  # Même contenu
+        record(4, when + timedelta(hours=2))
+    ]
+    for mode, expected in (('hash', 5), ('content', 4)):
+        store = CommitStore(str(tmp_path / mode), flush_rows=3, dedup=mode)
+        assert store.append('/a', records) == expected
+        assert store.duplicates == len(records) - expected
+        store.save()
+        # Tout est déjà connu : rien n'est ajouté, depuis un autre dépôt non plus
+        store = CommitStore(str(tmp_path / mode), dedup=mode)
+        assert store.append('/b', records) == 0
+        assert store.sharing_repositories([(store.get_dedup_index().hash_key(commit_hash(4)),)]) == ['/b']
+
+    store = CommitStore(str(tmp_path / 'off'), dedup='off')
+    assert store.append('/a', records) == 5  # Même dépôt et même hash : écarté
+    assert store.append('/b', records) == 5
+
+
+def test_remove_repository_rewrites_only_affected_months(tmp_path):
+    store = CommitStore(str(tmp_path))
+    store.append('/a', [record(1, datetime(2024, 5, 2, 9)), record(2, datetime(2024, 6, 3, 9))])
+    store.append('/b', [record(3, datetime(2024, 5, 2, 11))])
+    store.save()
+    june = store.manifest['partitions']['2024-06']['dir']
+    store = CommitStore(str(tmp_path))
+    store.append('/b', [record(4, datetime(2024, 5, 20, 11))])  # Un lot de plus en mai
+    store.save()
+
+    store = CommitStore(str(tmp_path))
+    assert store.remove_repository('/b') == 2
+    assert sorted(keys[0] for keys in store.removed_keys) == sorted(int(commit_hash(i)[:16], 16) for i in (3, 4))
+    store.save()
+    assert store.manifest['partitions']['2024-06']['dir'] == june
+    assert 'runs' not in store.manifest['partitions']['2024-05']
+    assert CommitStore(str(tmp_path)).load_dataframe()['repo'].tolist() == ['/a', '/a']
+    assert store.remove_repository('/inconnu') == 0
+
+    # Les commits supprimés peuvent être ingérés de nouveau, depuis un autre dépôt
+    store = CommitStore(str(tmp_path))
+    assert store.append('/c', [record(3, datetime(2024, 5, 2, 11))]) == 1
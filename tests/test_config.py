@@ -0,0 +1,90 @@
+import atexit
+import gc
+import os
+import time
+import weakref
+
+import yaml
+
+from src.utils import config as config_module
+from src.utils.config import Config
+
+
+def read_yaml(path):
+    with open(path, encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def test_configs_share_one_exit_handler(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, 'register', lambda *args, **kwargs: registered.append(args))
+    configs = [Config(str(tmp_path / f'config{i}.yaml')) for i in range(3)]
+    assert registered == []
+    assert all(config in config_module._open_configs for config in configs)
+
+    configs[0].set_ticket_pattern(r'(ABC-\d+)')
+    configs[0].close()
+    assert configs[0] not in config_module._open_configs
+    assert read_yaml(tmp_path / 'config0.yaml')['ticket_pattern'] == r'(ABC-\d+)'
+
+    # Une configuration libérée n'est plus retenue par le gestionnaire de sortie
+    released = weakref.ref(configs[1])
+    del configs
+    gc.collect()
+    assert released() is None
+
+
+def test_saves_are_debounced(tmp_path):
+    path = tmp_path / 'config.yaml'
+    config = Config(str(path), save_delay=0.2)
+    config.set_ticket_pattern(r'(A-\d+)')
+    config.set_work_hours_per_day(7)
+    assert not path.exists()
+
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    data = read_yaml(path)
+    assert data['ticket_pattern'] == r'(A-\d+)' and data['work_hours_per_day'] == 7
+    config.close()
+
+
+def test_write_is_atomic(tmp_path, monkeypatch):
+    path = tmp_path / 'config.yaml'
+    config = Config(str(path), save_delay=0)
+    config.set_ticket_pattern(r'(A-\d+)')
+
+    def fail(src, dst):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(os, 'replace', fail)
+    config.config['ticket_pattern'] = r'(B-\d+)'
+    try:
+        config.save_config()
+    except OSError:
+        pass
+    # Le fichier n'est jamais écrit à moitié : il garde son contenu précédent
+    assert read_yaml(path)['ticket_pattern'] == r'(A-\d+)'
+    monkeypatch.undo()
+    config.close()
+    assert read_yaml(path)['ticket_pattern'] == r'(B-\d+)'
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_reload_keeps_local_changes_over_external_ones(tmp_path):
+    path = tmp_path / 'config.yaml'
+    Config(str(path), save_delay=0).set_work_hours_per_day(8)
+    config = Config(str(path), save_delay=60)
+    other = Config(str(path), save_delay=0)
+
+    config.set_ticket_pattern(r'(LOCAL-\d+)')
+    time.sleep(0.01)
+    other.set_work_hours_per_day(6)
+    other.set_ticket_pattern(r'(AUTRE-\d+)')
+
+    assert config.reload_if_changed()
+    assert config.get_work_hours_per_day() == 6
+    assert config.get_ticket_pattern() == r'(LOCAL-\d+)'
+    config.close()
+    data = read_yaml(path)
+    assert data['work_hours_per_day'] == 6 and data['ticket_pattern'] == r'(LOCAL-\d+)'
@@ -0,0 +1,102 @@
+import numpy as np
+
+from src.core.dedup_index import DedupIndex, read_keys, write_keys
+
+
+FULL_HASH = '89abcdef01234567' + 'f' * 24
+
+
+def test_hash_key_uses_the_first_16_hex_digits():
+    index = DedupIndex('hash')
+    assert index.hash_key(FULL_HASH) == 0x89abcdef01234567
+    assert index.hash_key(FULL_HASH.upper()) == 0x89abcdef01234567
+    # Deux hashs complets qui ne diffèrent qu'après le 16e chiffre partagent leur clé
+    assert index.hash_key('89abcdef01234567' + '0' * 24) == index.hash_key(FULL_HASH)
+
+
+def test_short_or_invalid_hashes_fall_back_to_blake2():
+    index = DedupIndex('hash')
+    for commit_hash in ('89abcde', '89abcdef0123456', 'zz' * 10, '+9abcdef01234567', ''):
+        assert index.hash_key(commit_hash) == DedupIndex.digest('h' + commit_hash)
+    # Le hash abrégé d'un commit n'a pas la clé de son hash complet
+    assert index.hash_key(FULL_HASH[:7]) != index.hash_key(FULL_HASH)
+    assert index.hash_key('89abcde') != index.hash_key('89abcdf')
+
+
+def test_bulk_keys_match_single_keys():
+    index = DedupIndex('content')
+    hashes = [FULL_HASH, FULL_HASH.upper(), '89abcde', '', 'é' * 20, '0x23456789abcdef0', 'g' * 40]
+    assert index.hash_keys(hashes).tolist() == [index.hash_key(h) for h in hashes]
+    assert index.hash_keys([]).tolist() == []
+    authors, minutes, subjects = ['Alice', 'Bob'], ['2024-01-02 10:00', '2024-01-02 10:01'], ['PROJ-1', 'PROJ-1']
+    assert index.content_keys(authors, minutes, subjects).tolist() == [
+        index.commit_keys('x', author, minute, subject)[1] for author, minute, subject in zip(authors, minutes, subjects)
+    ]
+
+
+def test_hash_mode_only_compares_hashes():
+    index = DedupIndex('hash')
+    assert index.commit_keys(FULL_HASH, 'Alice', '2024-01-02 10:00', 'PROJ-1') == (0x89abcdef01234567,)
+    assert index.add(index.commit_keys(FULL_HASH))
+    assert not index.add(index.commit_keys(FULL_HASH))
+    # Même contenu, autre hash (cherry-pick) : conservé en mode 'hash'
+    assert index.add(index.commit_keys('0' * 40, 'Alice', '2024-01-02 10:00', 'PROJ-1'))
+
+
+def test_content_mode_catches_cherry_picks():
+    index = DedupIndex('content')
+    assert index.add(index.commit_keys(FULL_HASH, 'Alice', '2024-01-02 10:00', 'PROJ-1 travail'))
+    # Autre hash, même auteur, même minute, même sujet
+    assert not index.add(index.commit_keys('0' * 40, 'Alice', '2024-01-02 10:00', 'PROJ-1 travail'))
+    assert index.add(index.commit_keys('1' * 40, 'Alice', '2024-01-02 10:01', 'PROJ-1 travail'))
+    # Même hash, autre contenu (message reformulé) : doublon par le hash
+    assert not index.add(index.commit_keys(FULL_HASH, 'Alice', '2024-01-03 09:00', 'autre sujet'))
+    # Un doublon n'ajoute pas ses clés
+    assert index.add(index.commit_keys('2' * 40, 'Alice', '2024-01-03 09:00', 'autre sujet'))
+
+
+def test_colliding_keys_are_treated_as_duplicates():
+    index = DedupIndex('hash')
+    # 64 premiers bits identiques : collision assumée, le second commit est écarté
+    assert index.add((index.hash_key('0123456789abcdef' + 'a' * 24),))
+    assert not index.add((index.hash_key('0123456789abcdef' + 'b' * 24),))
+
+
+def test_add_batch_matches_successive_adds():
+    keys = [(1, 10), (2, 20), (1, 30), (3, 20), (4, 40), (5, 50), (5, 60), (7, 40)]
+    one_by_one = DedupIndex('content')
+    one_by_one.add((4, 99))
+    expected = [one_by_one.add(row) for row in keys]
+
+    batched = DedupIndex('content')
+    batched.add((4, 99))
+    columns = tuple(np.array(column, dtype=np.uint64) for column in zip(*keys))
+    assert batched.add_batch(columns).tolist() == expected
+    assert batched.keys == one_by_one.keys
+    assert sorted(batched.pending) == sorted(one_by_one.pending)
+
+
+def test_segments_round_trip(tmp_path):
+    index = DedupIndex('hash')
+    index.add((1,))
+    index.add((2 ** 64 - 1,))
+    first = str(tmp_path / 'dedup' / '1.bin')
+    index.write_segment(first)
+    assert len(index.pending) == 0
+    index.add((42,))
+    second = str(tmp_path / 'dedup' / '2.bin')
+    index.write_segment(second)
+    assert list(read_keys(second)) == [42]
+
+    loaded = DedupIndex('hash')
+    for segment in (first, second):
+        loaded.load_segment(segment)
+    assert loaded.keys == {1, 2 ** 64 - 1, 42}
+
+    complete = str(tmp_path / 'dedup' / 'complet.bin')
+    index.discard((1,))
+    index.write_segment(complete, complete=True)
+    assert sorted(read_keys(complete)) == [42, 2 ** 64 - 1]
+
+    write_keys(str(tmp_path / 'vide' / 'segment.bin'), [])
+    assert list(read_keys(str(tmp_path / 'vide' / 'segment.bin'))) == []
@@ -0,0 +1,81 @@
+import csv
+import json
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.core import exporters
+from src.core.exporters import FLAT_COLUMNS, CsvExporter, FlatExporter, NdjsonExporter, ParquetExporter
+from src.core.timesheet_generator import available_export_formats
+
+
+TIMESHEETS = [
+    ('Alice', {date(2024, 1, 2): [
+        {'ticket': 'PROJ-1', 'duree': timedelta(hours=2), 'debut': datetime(2024, 1, 2, 9),
+         'fin': datetime(2024, 1, 2, 11), 'message': 'PROJ-1 début, "citation"'},
+        {'ticket': 'PROJ-2', 'duree': timedelta(minutes=90), 'debut': datetime(2024, 1, 2, 11),
+         'fin': datetime(2024, 1, 2, 12, 30), 'message': 'PROJ-2 été\nsuite'}
+    ]}),
+    (None, {date(2024, 1, 3): [
+        {'ticket': 'PROJ-3', 'duree': timedelta(hours=1), 'debut': datetime(2024, 1, 3, 14),
+         'fin': datetime(2024, 1, 3, 15), 'message': 'PROJ-3'}
+    ]})
+]
+
+EXPECTED = [
+    ['Alice', '2024-01-02', 'PROJ-1', 7200.0, '09:00', '11:00', 'PROJ-1 début, "citation"'],
+    ['Alice', '2024-01-02', 'PROJ-2', 5400.0, '11:00', '12:30', 'PROJ-2 été\nsuite'],
+    ['', '2024-01-03', 'PROJ-3', 3600.0, '14:00', '15:00', 'PROJ-3']
+]
+
+
+def test_flat_exporter_is_abstract():
+    with pytest.raises(TypeError):
+        FlatExporter()
+
+    class Incomplete(FlatExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_ndjson_output(tmp_path):
+    path = tmp_path / 'sortie.ndjson'
+    NdjsonExporter(chunk_rows=2).write(str(path), TIMESHEETS)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == [dict(zip(FLAT_COLUMNS, row)) for row in EXPECTED]
+
+
+def test_csv_output(tmp_path):
+    path = tmp_path / 'sortie.csv'
+    CsvExporter(chunk_rows=2).write(str(path), TIMESHEETS)
+    with open(path, encoding='utf-8', newline='') as fp:
+        rows = list(csv.reader(fp))
+    assert rows[0] == FLAT_COLUMNS
+    assert rows[1:] == [[str(value) for value in row] for row in EXPECTED]
+
+
+def test_parquet_output(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'sortie.parquet'
+    ParquetExporter(chunk_rows=2).write(str(path), TIMESHEETS)
+    parquet_file = pq.ParquetFile(str(path))
+    assert parquet_file.num_row_groups == 2
+    table = parquet_file.read()
+    assert table.column_names == FLAT_COLUMNS
+    assert [list(row.values()) for row in table.to_pylist()] == EXPECTED
+
+
+def test_parquet_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporters.importlib.util, 'find_spec', lambda name, *args: None)
+    for name in [name for name in sys.modules if name == 'pyarrow' or name.startswith('pyarrow.')]:
+        monkeypatch.delitem(sys.modules, name)
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+    assert not ParquetExporter.is_available()
+    assert 'parquet' not in available_export_formats()
+    with pytest.raises(RuntimeError, match='pyarrow'):
+        ParquetExporter().write(str(tmp_path / 'sortie.parquet'), TIMESHEETS)
+    assert not (tmp_path / 'sortie.parquet').exists()
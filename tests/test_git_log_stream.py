@@ -0,0 +1,64 @@
+import io
+import subprocess
+from datetime import datetime
+
+from src.core.git_log_stream import (
+    LOG_FORMAT, DATE_FORMAT, FIELD_SEPARATOR, CommitRecord, iter_commit_records, format_commit_record
+)
+
+
+RECORDS = [
+    CommitRecord('a' * 40, 'Alice', datetime(2024, 1, 2, 9, 15), 'PROJ-1 première tâche'),
+    CommitRecord('b' * 40, 'Bérénice Élan', datetime(2024, 1, 2, 14, 0), 'PROJ-2 café ☕ et accents'),
+    CommitRecord('c' * 40, 'Bob', datetime(2024, 1, 3, 10, 30), 'PROJ-3 a\x1fb\x1f'),
+    CommitRecord('d' * 40, 'Bob', datetime(2024, 1, 3, 11, 45), ''),
+]
+
+
+class ShortReads(io.RawIOBase):
+    """Flux qui renvoie moins d'octets que demandé, comme un tube."""
+
+    def __init__(self, data, size):
+        self.data = data
+        self.size = size
+
+    def read(self, n=-1):
+        chunk, self.data = self.data[:self.size], self.data[self.size:]
+        return chunk
+
+
+def test_records_split_across_chunk_boundaries():
+    data = b''.join(format_commit_record(record) for record in RECORDS)
+    # Toutes les tailles de bloc : coupures au milieu d'un champ, d'un séparateur
+    # ou d'un caractère UTF-8 multi-octets
+    for chunk_size in range(1, len(data) + 2):
+        assert list(iter_commit_records(io.BytesIO(data), chunk_size=chunk_size)) == RECORDS
+        assert list(iter_commit_records(ShortReads(data, chunk_size), chunk_size=len(data))) == RECORDS
+
+
+def test_last_record_without_separator_and_malformed_records():
+    data = b''.join(format_commit_record(record) for record in RECORDS)
+    assert list(iter_commit_records(io.BytesIO(data[:-1]), chunk_size=7)) == RECORDS
+    garbage = b'\n' + FIELD_SEPARATOR.join([b'e' * 40, b'Eve', b'pas une date', b'PROJ-4']) + b'\x00incomplet\x00'
+    assert list(iter_commit_records(io.BytesIO(garbage + data), chunk_size=5)) == RECORDS
+    assert list(iter_commit_records(io.BytesIO(b''))) == []
+
+
+def test_subject_with_separator_bytes_from_git(tmp_path):
+    repo = tmp_path / 'repo'
+    subprocess.run(['git', 'init', '-q', str(repo)], check=True)
+    subjects = ['PROJ-1 avant\x1faprès', 'PROJ-2 \x1f\x1f fin\x1f']
+    for subject in subjects:
+        subprocess.run(
+            ['git', '-C', str(repo), '-c', 'user.name=Test', '-c', 'user.email=test@example.com',
+             'commit', '-q', '--allow-empty', '-m', subject],
+            check=True
+        )
+    output = subprocess.run(
+        ['git', '-C', str(repo), 'log', '-z', f'--pretty={LOG_FORMAT}', f'--date=format:{DATE_FORMAT}'],
+        check=True, capture_output=True
+    ).stdout
+    for chunk_size in (1, 3, 64 * 1024):
+        records = list(iter_commit_records(io.BytesIO(output), chunk_size=chunk_size))
+        assert [record.message for record in records] == subjects[::-1]
+        assert all(record.author == 'Test' and len(record.hash) == 40 for record in records)
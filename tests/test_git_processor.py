@@ -0,0 +1,142 @@
+import os
+import subprocess
+
+from src.core.commit_store import CommitStore
+from src.core.git_processor import GitProcessor
+from src.utils.config import Config
+
+
+def git(repo, *args):
+    """Exécute une commande Git dans un dépôt de test."""
+    return subprocess.run(
+        ['git', '-C', str(repo), '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+        check=True, capture_output=True, text=True
+    ).stdout
+
+
+def test_history_rewrite_keeps_commits_held_by_a_mirror(tmp_path):
+    repo_a = tmp_path / 'a'
+    repo_b = tmp_path / 'b'
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(repo_a)], check=True)
+    for ticket in ('PROJ-1', 'PROJ-2', 'PROJ-3'):
+        git(repo_a, 'commit', '-q', '--allow-empty', '-m', f'{ticket} travail')
+    subprocess.run(['git', 'clone', '-q', str(repo_a), str(repo_b)], check=True)
+
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.config['repositories'] = [str(repo_a), str(repo_b)]
+    config.config['dedup_mode'] = 'hash'
+    config.config['offline_mode'] = True
+    processor = GitProcessor(config)
+    store_path = str(tmp_path / 'store')
+
+    processor.extract_git_logs(store_path)
+    assert CommitStore(store_path).row_count() == 3
+
+    # Réécriture de l'historique de A : le dernier commit n'existe plus que dans B
+    git(repo_a, 'reset', '-q', '--hard', 'HEAD~1')
+    git(repo_a, 'reflog', 'expire', '--expire=now', '--all')
+    git(repo_a, 'gc', '-q', '--prune=now')
+    processor.extract_git_logs(store_path)
+
+    store = CommitStore(store_path)
+    df = store.load_dataframe()
+    assert store.row_count() == 3
+    assert df['message'].str.contains('PROJ-3').any()
+    assert not df.duplicated('hash').any()
+
+    # Extraction suivante : rien n'a changé, rien n'est relu
+    processor.extract_git_logs(store_path)
+    assert all(result['unchanged'] for result in processor.extraction_results)
+    assert CommitStore(store_path).row_count() == 3
+
+
+def test_history_rewrite_rereads_only_repositories_sharing_lost_commits(tmp_path):
+    repo_a = tmp_path / 'a'
+    repo_b = tmp_path / 'b'
+    repo_c = tmp_path / 'c'
+    for repo in (repo_a, repo_c):
+        subprocess.run(['git', 'init', '-q', '-b', 'main', str(repo)], check=True)
+    for ticket in ('PROJ-1', 'PROJ-2', 'PROJ-3'):
+        git(repo_a, 'commit', '-q', '--allow-empty', '-m', f'{ticket} travail')
+        git(repo_c, 'commit', '-q', '--allow-empty', '-m', f'{ticket} autre projet')
+    subprocess.run(['git', 'clone', '-q', str(repo_a), str(repo_b)], check=True)
+
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.config['repositories'] = [str(repo_a), str(repo_b), str(repo_c)]
+    config.config['dedup_mode'] = 'hash'
+    config.config['offline_mode'] = False
+    processor = GitProcessor(config)
+    store_path = str(tmp_path / 'store')
+    processor.extract_git_logs(store_path)
+    assert CommitStore(store_path).row_count() == 6
+
+    calls = []
+    extract_repository = processor.extract_repository
+
+    def recording_extract_repository(repo_path, watermark=None, timeout=None, offline=False):
+        result = extract_repository(repo_path, watermark, timeout, offline)
+        calls.append((os.path.basename(repo_path), result['full_rescan'], offline))
+        return result
+
+    processor.extract_repository = recording_extract_repository
+    git(repo_a, 'commit', '-q', '--amend', '--allow-empty', '-m', 'PROJ-3 travail corrigé')
+    processor.extract_git_logs(store_path)
+
+    # A est relu une fois, C reste incrémental ; seul B, qui contient encore l'ancien commit, est relu (sans fetch)
+    assert sorted(calls[:3]) == [('a', True, False), ('b', False, False), ('c', False, False)]
+    assert calls[3:] == [('b', True, True)]
+    df = CommitStore(store_path).load_dataframe()
+    assert len(df) == 7
+    assert df['message'].str.contains('PROJ-3 travail corrigé').any()
+    assert (df['message'] == 'PROJ-3 travail').sum() == 1
+
+
+def test_incremental_extraction_follows_watermarks(tmp_path):
+    repo_a = tmp_path / 'a'
+    repo_b = tmp_path / 'b'
+    repo_c = tmp_path / 'c'
+    for repo in (repo_a, repo_c):
+        subprocess.run(['git', 'init', '-q', '-b', 'main', str(repo)], check=True)
+        git(repo, 'commit', '-q', '--allow-empty', '-m', f'PROJ-1 initial ({repo.name})')
+        git(repo, 'commit', '-q', '--allow-empty', '-m', f'PROJ-2 suite ({repo.name})')
+    subprocess.run(['git', 'clone', '-q', str(repo_a), str(repo_b)], check=True)
+
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.config['repositories'] = [str(repo_a), str(repo_b), str(repo_c)]
+    config.config['dedup_mode'] = 'hash'
+    config.config['offline_mode'] = True
+    processor = GitProcessor(config)
+    store_path = str(tmp_path / 'store')
+
+    def extract():
+        processor.extract_git_logs(store_path)
+        return {
+            os.path.basename(result['repository']): (result['full_rescan'], result['unchanged'], result['commits'])
+            for result in processor.extraction_results
+        }
+
+    assert extract() == {'a': (True, False, 2), 'b': (True, False, 2), 'c': (True, False, 2)}
+    assert extract() == {'a': (False, True, 0), 'b': (False, True, 0), 'c': (False, True, 0)}
+
+    # Nouveau commit : seul ce commit est lu
+    git(repo_c, 'commit', '-q', '--allow-empty', '-m', 'PROJ-3 nouveau')
+    assert extract() == {'a': (False, True, 0), 'b': (False, True, 0), 'c': (False, False, 1)}
+    assert CommitStore(store_path).row_count() == 5
+
+    # Commit amendé : le dépôt est relu entièrement, les autres restent inchangés
+    git(repo_c, 'commit', '-q', '--amend', '--allow-empty', '-m', 'PROJ-3 corrigé')
+    assert extract() == {'a': (False, True, 0), 'b': (False, True, 0), 'c': (True, False, 3)}
+    df = CommitStore(store_path).load_dataframe()
+    assert len(df) == 5 and not (df['message'] == 'PROJ-3 nouveau').any()
+
+    # Dépôt retiré : seul le clone qui partageait ses commits est relu
+    config.config['repositories'] = [str(repo_b), str(repo_c)]
+    assert extract() == {'b': (True, False, 2), 'c': (False, True, 0)}
+    df = CommitStore(store_path).load_dataframe()
+    assert len(df) == 5
+    assert set(df['repo']) == {str(repo_b), str(repo_c)}
+
+    # Dépôt retiré sans commit partagé : aucun dépôt n'est relu
+    config.config['repositories'] = [str(repo_b)]
+    assert extract() == {'b': (False, True, 0)}
+    assert CommitStore(store_path).row_count() == 2
@@ -0,0 +1,108 @@
+import os
+import subprocess
+from datetime import date
+
+from src.core.git_processor import GitProcessor
+from src.core.git_query import GitQuery, merge_intervals, missing_intervals
+from src.utils.config import Config
+
+
+def test_missing_intervals():
+    covered = [(date(2024, 1, 5), date(2024, 1, 10)), (date(2024, 1, 20), date(2024, 1, 25))]
+    assert missing_intervals([], date(2024, 1, 1), date(2024, 1, 31)) == [(date(2024, 1, 1), date(2024, 1, 31))]
+    assert missing_intervals(covered, date(2024, 1, 1), date(2024, 1, 31)) == [
+        (date(2024, 1, 1), date(2024, 1, 4)),
+        (date(2024, 1, 11), date(2024, 1, 19)),
+        (date(2024, 1, 26), date(2024, 1, 31))
+    ]
+    assert missing_intervals(covered, date(2024, 1, 6), date(2024, 1, 9)) == []
+    assert missing_intervals(covered, date(2024, 1, 8), date(2024, 1, 22)) == [(date(2024, 1, 11), date(2024, 1, 19))]
+    assert missing_intervals(covered, date.min, date.max) == [
+        (date.min, date(2024, 1, 4)),
+        (date(2024, 1, 11), date(2024, 1, 19)),
+        (date(2024, 1, 26), date.max)
+    ]
+
+
+def test_merge_intervals():
+    assert merge_intervals([]) == []
+    assert merge_intervals([
+        (date(2024, 2, 1), date(2024, 2, 10)),
+        (date(2024, 1, 1), date(2024, 1, 31)),  # Contiguë à la suivante
+        (date(2024, 2, 5), date(2024, 2, 20)),  # Chevauchante
+        (date(2024, 3, 1), date(2024, 3, 2))
+    ]) == [(date(2024, 1, 1), date(2024, 2, 20)), (date(2024, 3, 1), date(2024, 3, 2))]
+    assert merge_intervals([(date(2024, 1, 1), date(2024, 1, 31)), (date(2024, 1, 3), date(2024, 1, 4))]) == [
+        (date(2024, 1, 1), date(2024, 1, 31))
+    ]
+
+
+def test_to_git_args_widens_the_period_by_one_day():
+    query = GitQuery(authors=['Bob', 'Alice'], since=date(2024, 1, 1), until=date(2024, 1, 31), refs=['main'])
+    assert query.to_git_args(date(2024, 1, 1), date(2024, 1, 31)) == [
+        '--fixed-strings',
+        '--author=Alice',
+        '--author=Bob',
+        '--since=2023-12-31 00:00:00',
+        '--until=2024-02-01 23:59:59',
+        'main'
+    ]
+    # Période ouverte : pas de borne, toutes les branches
+    assert GitQuery().to_git_args(*GitQuery().bounds()) == ['--all']
+    assert GitQuery().to_git_args(date.min, date(2024, 1, 31)) == ['--until=2024-02-01 23:59:59', '--all']
+    # Le périmètre ne dépend pas de la période
+    assert GitQuery(['Alice'], date(2024, 1, 1)).scope_key() == GitQuery(['Alice'], date(2023, 1, 1)).scope_key()
+    assert GitQuery(['Alice']).scope_key() != GitQuery(['Bob']).scope_key()
+
+
+def test_load_commits_reads_only_missing_periods(tmp_path):
+    repo = tmp_path / 'repo'
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(repo)], check=True)
+    commits = (
+        ('2023-12-10', '2023-12-10', 'Alice', 'PROJ-0'),
+        ('2024-01-10', '2024-01-10', 'Alice', 'PROJ-1'),
+        ('2024-02-10', '2024-02-10', 'Bob', 'PROJ-2'),
+        ('2024-01-20', '2024-03-05', 'Alice', 'PROJ-4'),  # Amendé en mars : date de commit tardive
+        ('2024-03-10', '2024-03-10', 'Alice', 'PROJ-3')
+    )
+    for authored, committed, author, ticket in commits:
+        subprocess.run(
+            ['git', '-C', str(repo), '-c', f'user.name={author}', '-c', 'user.email=test@example.com',
+             'commit', '-q', '--allow-empty', '-m', f'{ticket} travail'],
+            check=True, env=dict(os.environ, GIT_AUTHOR_DATE=f'{authored}T10:00:00', GIT_COMMITTER_DATE=f'{committed}T10:00:00')
+        )
+
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.config['repositories'] = [str(repo)]
+    config.config['authors'] = ['Alice']
+    processor = GitProcessor(config)
+    store_path = str(tmp_path / 'store')
+    queries = []
+    iter_git_log = processor.iter_git_log
+
+    def recording_iter_git_log(repo_path, exclude_tips=None, deadline=None, query_args=None):
+        queries.append(query_args)
+        return iter_git_log(repo_path, exclude_tips, deadline, query_args)
+
+    processor.iter_git_log = recording_iter_git_log
+
+    # La période est lue jusqu'au dernier commit : le commit amendé après la période est vu
+    df, store = processor.load_commits(date(2024, 1, 1), date(2024, 1, 31), store_path)
+    assert df['message'].tolist() == ['PROJ-1 travail', 'PROJ-4 travail']
+    assert queries == [['--fixed-strings', '--author=Alice', '--since=2023-12-31 00:00:00', '--all']]
+    assert store.path.startswith(store_path)
+
+    # Périodes déjà lues : git n'est pas relancé
+    queries.clear()
+    df, _ = processor.load_commits(date(2024, 1, 5), date(2024, 3, 31), store_path)
+    assert df['message'].tolist() == ['PROJ-1 travail', 'PROJ-4 travail', 'PROJ-3 travail'] and queries == []
+
+    # Période antérieure : seule la période manquante est lue, jusqu'aux commits déjà lus
+    df, _ = processor.load_commits(date(2023, 12, 1), date(2024, 1, 15), store_path)
+    assert df['message'].tolist() == ['PROJ-0 travail', 'PROJ-1 travail']
+    assert queries == [['--fixed-strings', '--author=Alice', '--since=2023-11-30 00:00:00', '--until=2024-01-01 23:59:59', '--all']]
+
+    # Sans filtrage par Git, le magasin principal (non extrait ici) est lu
+    config.config['git_filtering'] = False
+    df, store = processor.load_commits(date(2024, 1, 1), date(2024, 3, 31), store_path)
+    assert df.empty and store.path == store_path
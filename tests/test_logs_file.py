@@ -0,0 +1,72 @@
+import subprocess
+
+from src.core.git_processor import GitProcessor
+from src.utils.config import Config
+
+
+def git(repo, *args):
+    """Exécute une commande Git dans un dépôt de test."""
+    return subprocess.run(
+        ['git', '-C', str(repo), '-c', 'user.name=Test', '-c', 'user.email=test@example.com', *args],
+        check=True, capture_output=True, text=True
+    ).stdout
+
+
+def make_processor(tmp_path, repositories):
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.config['repositories'] = [str(repo) for repo in repositories]
+    config.config['offline_mode'] = True
+    processor = GitProcessor(config)
+    processor.logs_file = str(tmp_path / 'git_logs.csv')
+    return processor
+
+
+def init_repository(repo, messages):
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(repo)], check=True)
+    for message in messages:
+        git(repo, 'commit', '-q', '--allow-empty', '-m', message)
+
+
+def test_logs_file_round_trip(tmp_path):
+    repo = tmp_path / 'repo'
+    init_repository(repo, ['PROJ-1 début', 'PROJ-2 « NA » › séparateur', 'NA'])
+    processor = make_processor(tmp_path, [repo])
+    store_path = str(tmp_path / 'store')
+    processor.extract_git_logs(store_path)
+    stored = processor.get_commit_store(store_path).load_dataframe()
+
+    logs_file = processor.export_git_logs(str(tmp_path / 'git_logs.log'), store_path=store_path)
+    assert not processor.is_legacy_logs_file(logs_file)
+    df = processor.read_logs_file(logs_file)
+    columns = ['hash', 'author', 'date', 'message']
+    assert df[columns].equals(stored[columns])
+
+    copy_path = str(tmp_path / 'copy')
+    assert processor.import_logs_file(logs_file, copy_path) == 3
+    copied = processor.get_commit_store(copy_path).load_dataframe()
+    assert copied[columns].equals(stored[columns])
+    assert set(copied['repo']) == {logs_file}
+
+
+def test_legacy_csv_is_migrated_on_first_load_without_duplicates(tmp_path):
+    repo = tmp_path / 'repo'
+    init_repository(repo, ['PROJ-1 début', 'PROJ-2 suite'])
+    processor = make_processor(tmp_path, [repo])
+    # Ancien format : hashs abrégés, séparateur '›', dates à la minute
+    legacy = git(repo, 'log', '--all', '--pretty=format:%h›%an›%ad›%s', '--date=format:%Y-%m-%d %H:%M')
+    with open(processor.logs_file, 'w', encoding='utf-8') as f:
+        f.write(legacy + '\n')
+    assert processor.is_legacy_logs_file(processor.logs_file)
+
+    store_path = str(tmp_path / 'store')
+    df = processor.load_git_logs_dataframe(store_path=store_path)
+    assert sorted(df['message']) == ['PROJ-1 début', 'PROJ-2 suite']
+    # Les hashs abrégés sont complétés depuis le dépôt
+    assert sorted(df['hash']) == sorted(git(repo, 'rev-list', '--all').split())
+
+    # L'extraction reconnaît les commits importés : aucun doublon
+    git(repo, 'commit', '-q', '--allow-empty', '-m', 'PROJ-3 nouveau')
+    processor.extract_git_logs(store_path)
+    store = processor.get_commit_store(store_path)
+    assert store.row_count() == 3
+    assert processor.migrate_legacy_logs(store_path) == 0
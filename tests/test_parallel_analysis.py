@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from src.core.parallel_analysis import analyze_parallel
+from src.core.ticket_analyzer import TicketAnalyzer
+from src.utils.config import Config
+
+
+@pytest.mark.parametrize('engine', ['vectorized', 'loop'])
+def test_parallel_matches_serial(tmp_path, engine):
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    dates = pd.date_range('2024-01-01 07:30', periods=240, freq='97min')
+    df = pd.DataFrame({
+        'hash': [f'{i:040x}' for i in range(len(dates))],
+        'author': [None if i % 11 == 0 else f'Auteur {i % 3}' for i in range(len(dates))],
+        'date': dates,
+        'message': [f'PROJ-{i % 7} é' if i % 5 else 'sans ticket' for i in range(len(dates))],
+        'repo': [f'/depots/{i % 2}' for i in range(len(dates))]
+    })
+    # Une journée travaillée sans ticket figure aussi dans les résultats
+    df = pd.concat([df, pd.DataFrame({
+        'hash': ['f' * 40], 'author': ['Auteur 0'], 'date': [pd.Timestamp('2024-01-22 10:00')],
+        'message': ['sans ticket'], 'repo': ['/depots/0']
+    })]).sample(frac=1, random_state=0)
+
+    serial = TicketAnalyzer(config).extract_tickets_from_dataframe(df, engine, processes=1)
+    parallel = analyze_parallel(config, df, engine, 2)
+
+    assert any(serial.values()) and not all(serial.values())
+    assert list(parallel) == list(serial)
+    assert parallel == serial
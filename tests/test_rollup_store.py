@@ -0,0 +1,122 @@
+import os
+import subprocess
+from datetime import date, timedelta
+
+from src.core.git_processor import GitProcessor
+from src.core.ticket_analyzer import TicketAnalyzer
+from src.utils.config import Config
+
+
+COMMITS = (
+    ('Alice', '2024-01-09T10:00:00', 'PROJ-1 début'),
+    ('Bob', '2024-01-09T11:00:00', 'PROJ-2 revue'),
+    ('Alice', '2024-01-09T12:30:00', 'PROJ-2 suite'),
+    ('Alice', '2024-01-09T16:00:00', 'PROJ-1 fin'),
+    ('Bob', '2024-01-31T17:00:00', 'PROJ-3 clôture'),
+    ('Alice', '2024-02-06T09:30:00', 'PROJ-1 correctif'),
+    ('Alice', '2024-02-06T14:30:00', 'PROJ-2 tests'),
+    ('Bob', '2024-02-06T15:00:00', 'PROJ-2 relecture'),
+    ('Alice', '2024-02-07T11:00:00', 'PROJ-3 reprise'),
+)
+
+
+def commit(repo, author, when, message):
+    env = dict(os.environ, GIT_AUTHOR_DATE=when, GIT_COMMITTER_DATE=when)
+    subprocess.run(
+        ['git', '-C', str(repo), '-c', f'user.name={author}', '-c', 'user.email=test@example.com',
+         'commit', '-q', '--allow-empty', '-m', message],
+        check=True, capture_output=True, env=env
+    )
+
+
+def direct_totals(processor, config, store_path):
+    """Totaux (journée, auteur, ticket) en secondes d'une analyse directe, auteur par auteur."""
+    analyzer = TicketAnalyzer(config)
+    df = processor.load_git_logs_dataframe(store_path=store_path)
+    totals = {}
+    for author, group in df.groupby('author'):
+        for journee, tickets in analyzer.adjust_durations(analyzer.extract_tickets_from_dataframe(group)).items():
+            for t in tickets:
+                key = (journee, author, t['ticket'])
+                totals[key] = totals.get(key, 0.0) + t['duree'].total_seconds()
+    return totals
+
+
+def rollup_totals(rollups):
+    """Totaux (journée, auteur, ticket) en secondes de la table des journées."""
+    table = rollups.tables['day']
+    totals = {}
+    for day, author, ticket, seconds in zip(
+        table['period'].tolist(), table['author'].tolist(), table['ticket'].tolist(), table['seconds'].tolist()
+    ):
+        key = (day, rollups.authors[author], rollups.tickets[ticket])
+        totals[key] = totals.get(key, 0.0) + seconds
+    return totals
+
+
+def make_store(tmp_path):
+    repo = tmp_path / 'depot'
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(repo)], check=True)
+    for author, when, message in COMMITS:
+        commit(repo, author, when, message)
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.config['repositories'] = [str(repo)]
+    config.config['offline_mode'] = True
+    processor = GitProcessor(config)
+    return config, processor, processor.extract_git_logs(str(tmp_path / 'store'))
+
+
+def test_rollup_totals_match_a_direct_analysis(tmp_path):
+    config, processor, store_path = make_store(tmp_path)
+    assert processor.get_rollup_store(store_path).update(processor, TicketAnalyzer(config)) == ['2024-01', '2024-02']
+
+    rollups = processor.get_rollup_store(store_path)
+    expected = direct_totals(processor, config, store_path)
+    assert expected and rollup_totals(rollups) == expected
+
+    # Semaines et mois : sommes des journées
+    for level in ('week', 'month'):
+        for period, author, seconds in (
+            (row[0], row[1], row[2].total_seconds()) for row in rollups.totals(level, by='author')
+        ):
+            assert seconds == sum(
+                value for (day, day_author, _), value in expected.items()
+                if day_author == author and
+                (day - timedelta(days=day.weekday()) if level == 'week' else day.replace(day=1)) == period
+            )
+    assert rollups.totals('month', by='ticket', ticket='PROJ-3') == [
+        (date(2024, 1, 1), 'PROJ-3', timedelta(seconds=expected[(date(2024, 1, 31), 'Bob', 'PROJ-3')])),
+        (date(2024, 2, 1), 'PROJ-3', timedelta(seconds=expected[(date(2024, 2, 7), 'Alice', 'PROJ-3')]))
+    ]
+    assert processor.get_rollup_store(store_path).update(processor, TicketAnalyzer(config)) == []
+
+
+def test_work_calendar_change_invalidates_affected_months(tmp_path):
+    config, processor, store_path = make_store(tmp_path)
+    processor.get_rollup_store(store_path).update(processor, TicketAnalyzer(config))
+    before = rollup_totals(processor.get_rollup_store(store_path))
+
+    # Configuration équivalente au calendrier par défaut : rien à recalculer
+    config.set_work_calendar(periods=[('14:00', '18:00'), ('09:00', '13:00')])
+    assert processor.get_rollup_store(store_path).update(processor, TicketAnalyzer(config)) == []
+
+    # Exception datée en février : seul ce mois est recalculé
+    config.set_work_calendar(overrides={'2024-02-06': [('08:00', '12:00'), ('13:00', '16:00')]})
+    assert processor.get_rollup_store(store_path).update(processor, TicketAnalyzer(config)) == ['2024-02']
+    after = rollup_totals(processor.get_rollup_store(store_path))
+    assert after == direct_totals(processor, config, store_path)
+    assert after != before
+    assert {key: value for key, value in after.items() if key[0].month == 1} == {
+        key: value for key, value in before.items() if key[0].month == 1
+    }
+
+    # Journée non travaillée en janvier, puis nouvelles plages de travail : tous les mois
+    config.set_work_calendar(
+        overrides={'2024-02-06': [('08:00', '12:00'), ('13:00', '16:00')]}, non_working_days=['2024-01-31']
+    )
+    assert processor.get_rollup_store(store_path).update(processor, TicketAnalyzer(config)) == ['2024-01']
+    assert (date(2024, 1, 31), 'Bob', 'PROJ-3') not in rollup_totals(processor.get_rollup_store(store_path))
+    config.set_work_periods('08:00', '12:00', '13:00', '17:00')
+    config.set_work_calendar()
+    assert processor.get_rollup_store(store_path).update(processor, TicketAnalyzer(config)) == ['2024-01', '2024-02']
+    assert rollup_totals(processor.get_rollup_store(store_path)) == direct_totals(processor, config, store_path)
@@ -0,0 +1,34 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_startup_benchmark():
+    spec = importlib.util.spec_from_file_location('startup', os.path.join(ROOT, 'benchmarks', 'startup.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_main_window_shows_without_heavy_modules():
+    pytest.importorskip('PyQt5.QtWidgets')
+    startup = load_startup_benchmark()
+    env = dict(os.environ, PYTHONPATH=ROOT, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    assert startup.measure(env)['heavy'] == []
+
+
+def test_ticket_analyzer_imports_without_pandas():
+    probe = (
+        "import json, sys\n"
+        "import src.core.ticket_analyzer\n"
+        "print(json.dumps([name for name in ('pandas', 'numpy', 'src.core.parallel_analysis') if name in sys.modules]))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert json.loads(output) == []
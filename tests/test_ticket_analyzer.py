@@ -0,0 +1,24 @@
+import pandas as pd
+
+from src.core.ticket_analyzer import TicketAnalyzer
+from src.utils.config import Config
+
+
+def test_engines_agree_on_pattern_with_inline_flags(tmp_path):
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.config['ticket_pattern'] = r'(?i)proj-\d+'
+    analyzer = TicketAnalyzer(config)
+    df = pd.DataFrame({
+        'hash': ['a1', 'b2', 'c3', 'd4'],
+        'author': ['Test'] * 4,
+        'date': pd.to_datetime(['2024-01-02 09:00', '2024-01-02 11:00', '2024-01-02 15:00', '2024-01-03 10:00']),
+        'message': ['PROJ-1 début', 'proj-2 suite', 'sans ticket', 'Proj-3 fin']
+    })
+
+    codes = analyzer.extract_ticket_codes(df['message'])
+    assert codes.tolist()[:2] == ['PROJ-1', 'proj-2']
+    assert pd.isna(codes[2]) and codes[3] == 'Proj-3'
+
+    loop = analyzer.extract_tickets_from_dataframe(df, engine='loop')
+    vectorized = analyzer.extract_tickets_from_dataframe(df, engine='vectorized')
+    assert loop and vectorized == loop
@@ -0,0 +1,90 @@
+import os
+import subprocess
+from datetime import date, datetime, timedelta
+
+from src.core.batch_generator import analyze_author
+from src.core.git_processor import GitProcessor
+from src.core.ticket_analyzer import TicketAnalyzer
+from src.core.ticket_index import TicketIndex
+from src.utils.config import Config
+
+
+def slot(ticket, hour, hours, author='Alice', repo='/depot'):
+    return {
+        'ticket': ticket, 'debut': datetime(2024, 1, 1, hour), 'fin': datetime(2024, 1, 1, hour + hours),
+        'duree': timedelta(hours=hours), 'author': author, 'repo': repo, 'message': ticket, 'erreur': False
+    }
+
+
+def make_index():
+    return TicketIndex.from_durations({
+        date(2024, 1, 3): [slot('PROJ-1', 9, 2, 'Bob', '/autre'), slot('PROJ-2', 11, 1)],
+        date(2024, 1, 1): [slot('PROJ-1', 9, 3), slot('PROJ-2', 12, 1), slot('PROJ-1', 14, 1)],
+        date(2024, 1, 2): [slot('PROJ-3', 9, 5)]
+    })
+
+
+def test_slots_for_uses_period_bounds():
+    index = make_index()
+    assert [s.day for s in index.slots_for('PROJ-1')] == [date(2024, 1, 1), date(2024, 1, 1), date(2024, 1, 3)]
+    assert [s.day for s in index.slots_for('PROJ-1', date(2024, 1, 2))] == [date(2024, 1, 3)]
+    assert [s.day for s in index.slots_for('PROJ-1', date_to=date(2024, 1, 2))] == [date(2024, 1, 1)] * 2
+    assert index.slots_for('PROJ-1', date(2024, 1, 2), date(2024, 1, 2)) == []
+    assert index.slots_for('INCONNU') == []
+    assert index.history('PROJ-1') == [(date(2024, 1, 1), timedelta(hours=4)), (date(2024, 1, 3), timedelta(hours=2))]
+
+
+def test_top_and_contributors():
+    index = make_index()
+    assert index.top(2) == [('PROJ-1', timedelta(hours=6)), ('PROJ-3', timedelta(hours=5))]
+    assert index.top(5, date(2024, 1, 3)) == [('PROJ-1', timedelta(hours=2)), ('PROJ-2', timedelta(hours=1))]
+    assert index.contributors('PROJ-1') == {('Alice', '/depot'): timedelta(hours=4), ('Bob', '/autre'): timedelta(hours=2)}
+    assert index.contributors('PROJ-1', date_to=date(2024, 1, 1)) == {('Alice', '/depot'): timedelta(hours=4)}
+
+
+def commit(repo, author, when, message):
+    env = dict(os.environ, GIT_AUTHOR_DATE=when, GIT_COMMITTER_DATE=when)
+    subprocess.run(
+        ['git', '-C', str(repo), '-c', f'user.name={author}', '-c', 'user.email=test@example.com',
+         'commit', '-q', '--allow-empty', '-m', message],
+        check=True, capture_output=True, env=env
+    )
+
+
+def test_persisted_index_matches_analysis_and_follows_new_commits(tmp_path):
+    repo = tmp_path / 'depot'
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(repo)], check=True)
+    for author, when, message in (
+        ('Alice', '2024-01-09T10:00:00', 'PROJ-1 début'),
+        ('Bob', '2024-01-09T11:00:00', 'PROJ-2 revue'),
+        ('Alice', '2024-01-09T15:00:00', 'PROJ-2 suite'),
+        ('Bob', '2024-02-06T10:30:00', 'PROJ-1 correctif')
+    ):
+        commit(repo, author, when, message)
+
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.config['repositories'] = [str(repo)]
+    config.config['offline_mode'] = True
+    processor = GitProcessor(config)
+    store_path = processor.extract_git_logs(str(tmp_path / 'store'))
+
+    rollups = processor.get_rollup_store(store_path)
+    assert rollups.update(processor, TicketAnalyzer(config)) == ['2024-01', '2024-02']
+
+    # Relu depuis le disque, l'index est celui de l'analyse de chaque auteur
+    index = processor.get_rollup_store(store_path).ticket_index()
+    df = processor.load_git_logs_dataframe(store_path=store_path)
+    for author in ('Alice', 'Bob'):
+        expected = TicketIndex.from_durations(analyze_author(config, df[df['author'] == author], processes=1))
+        assert processor.get_rollup_store(store_path).ticket_index(author=author).totals() == expected.totals()
+    assert set(index.contributors('PROJ-1')) == {('Alice', str(repo)), ('Bob', str(repo))}
+    before = index.totals()
+
+    # Un commit de mars : seul ce mois est analysé, l'index le reprend
+    commit(repo, 'Alice', '2024-03-05T09:30:00', 'PROJ-3 nouveau')
+    processor.extract_git_logs(store_path)
+    rollups = processor.get_rollup_store(store_path)
+    assert rollups.update(processor, TicketAnalyzer(config)) == ['2024-03']
+    index = processor.get_rollup_store(store_path).ticket_index()
+    assert [s.day for s in index.slots_for('PROJ-3')] == [date(2024, 3, 5)]
+    assert index.totals(date_to=date(2024, 2, 29)) == before
@@ -0,0 +1,134 @@
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.core.ticket_analyzer import TicketAnalyzer
+from src.core.work_calendar import WorkCalendar, parse_periods
+from src.utils.config import Config
+
+
+MONDAY = date(2024, 1, 1)
+
+
+def at(hhmm, day=MONDAY):
+    """Retourne le datetime d'une heure 'HH:MM' d'une journée."""
+    return datetime.combine(day, datetime.strptime(hhmm, '%H:%M').time())
+
+
+def legacy_split(debut, fin, fin_matin, debut_aprem):
+    """Découpage historique : une seule pause, entre le matin et l'après-midi."""
+    if debut < fin_matin and fin > fin_matin:
+        return [(debut, fin_matin), (debut_aprem, fin)]
+    return [(debut, fin)]
+
+
+def test_from_config_defaults_to_morning_and_afternoon(tmp_path):
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    calendar = WorkCalendar.from_config(config)
+    assert calendar.periods(MONDAY) == ((9 * 60, 13 * 60), (14 * 60, 18 * 60))
+    assert all(calendar.is_working_day(MONDAY + timedelta(days=n)) for n in range(7))
+
+    config.set_work_periods('08:30', '12:00', '13:30', '17:00')
+    assert WorkCalendar.from_config(config).bounds(MONDAY) == [
+        (at('08:30'), at('12:00')), (at('13:30'), at('17:00'))
+    ]
+
+    # Les plages du calendrier l'emportent sur work_periods
+    config.set_work_calendar(periods=[('07:00', '11:00')])
+    assert WorkCalendar.from_config(config).periods(MONDAY) == ((7 * 60, 11 * 60),)
+
+
+def test_weekdays_non_working_days_and_overrides(tmp_path):
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.set_work_calendar(
+        weekdays={'4': [('09:00', '12:00')], 5: [], 6: []},
+        non_working_days=['2024-01-03', date(2024, 1, 4)],
+        overrides={'2024-01-02': [('10:00', '11:00'), ('08:00', '09:00')], '2024-01-06': [('09:00', '10:00')]}
+    )
+    calendar = WorkCalendar.from_config(config)
+    assert calendar.periods(MONDAY) == ((9 * 60, 13 * 60), (14 * 60, 18 * 60))
+    # Exception datée : plages triées
+    assert calendar.periods(date(2024, 1, 2)) == ((8 * 60, 9 * 60), (10 * 60, 11 * 60))
+    assert not calendar.is_working_day(date(2024, 1, 3))
+    assert calendar.bounds(date(2024, 1, 4)) == []
+    assert calendar.periods(date(2024, 1, 5)) == ((9 * 60, 12 * 60),)
+    # Une exception rend travaillé un samedi
+    assert calendar.periods(date(2024, 1, 6)) == ((9 * 60, 10 * 60),)
+    assert not calendar.is_working_day(date(2024, 1, 7))
+    assert calendar.periods(date(2024, 1, 13)) == ()
+
+    # Une date à la fois non travaillée et en exception n'est pas travaillée
+    calendar = WorkCalendar([('09:00', '17:00')], non_working_days=['2024-01-02'], overrides={'2024-01-02': [('09:00', '10:00')]})
+    assert not calendar.is_working_day(date(2024, 1, 2))
+
+
+def test_overlapping_or_empty_periods_are_rejected():
+    with pytest.raises(ValueError):
+        parse_periods([('09:00', '13:00'), ('12:00', '18:00')])
+    with pytest.raises(ValueError):
+        parse_periods([('14:00', '18:00'), ('09:00', '14:30')])
+    with pytest.raises(ValueError):
+        parse_periods([('09:00', '09:00')])
+    with pytest.raises(ValueError):
+        WorkCalendar([('09:00', '17:00')], overrides={'2024-01-02': [('10:00', '12:00'), ('11:00', '13:00')]})
+    # Des plages contiguës ne se chevauchent pas
+    assert parse_periods([('13:00', '18:00'), ('09:00', '13:00')]) == ((540, 780), (780, 1080))
+
+
+def test_split_at_every_crossed_break():
+    bounds = WorkCalendar([('08:00', '10:00'), ('10:30', '12:00'), ('13:00', '17:00')]).bounds(MONDAY)
+    split = WorkCalendar.split
+    assert split(at('08:15'), at('09:45'), bounds) == [(at('08:15'), at('09:45'))]
+    assert split(at('09:00'), at('11:00'), bounds) == [(at('09:00'), at('10:00')), (at('10:30'), at('11:00'))]
+    assert split(at('09:00'), at('16:00'), bounds) == [
+        (at('09:00'), at('10:00')), (at('10:30'), at('12:00')), (at('13:00'), at('16:00'))
+    ]
+    # Début pendant une pause : seules les pauses suivantes coupent le créneau
+    assert split(at('10:10'), at('14:00'), bounds) == [(at('10:10'), at('12:00')), (at('13:00'), at('14:00'))]
+    # Bornes exactes : un créneau qui finit ou commence sur une fin de plage n'est pas coupé
+    assert split(at('08:00'), at('10:00'), bounds) == [(at('08:00'), at('10:00'))]
+    assert split(at('12:00'), at('13:30'), bounds) == [(at('12:00'), at('13:30'))]
+
+
+def test_split_outside_working_hours():
+    bounds = WorkCalendar([('09:00', '13:00'), ('14:00', '18:00')]).bounds(MONDAY)
+    split = WorkCalendar.split
+    # Commit avant le début de journée : morceau de durée négative, signalé par l'analyseur
+    assert split(at('09:00'), at('08:00'), bounds) == [(at('09:00'), at('08:00'))]
+    # Commit du soir : le dernier morceau dépasse la fin de journée
+    assert split(at('15:00'), at('19:30'), bounds) == [(at('15:00'), at('19:30'))]
+    assert split(at('07:00'), at('20:00'), bounds) == [(at('07:00'), at('13:00')), (at('14:00'), at('20:00'))]
+    assert split(at('13:15'), at('13:45'), bounds) == [(at('13:15'), at('13:45'))]
+    assert split(at('09:00'), at('17:00'), []) == [(at('09:00'), at('17:00'))]
+
+
+def test_split_matches_legacy_morning_and_afternoon_logic():
+    bounds = WorkCalendar([('09:00', '13:00'), ('14:00', '18:00')]).bounds(MONDAY)
+    instants = [at('00:00') + timedelta(minutes=minutes) for minutes in range(0, 24 * 60, 15)]
+    for debut in instants:
+        for fin in instants:
+            assert WorkCalendar.split(debut, fin, bounds) == legacy_split(debut, fin, at('13:00'), at('14:00'))
+
+
+def test_analysis_outside_working_hours_and_on_non_working_days(tmp_path):
+    config = Config(str(tmp_path / 'config.yaml'), save_delay=0)
+    config.set_work_calendar(non_working_days=['2024-01-03'])
+    analyzer = TicketAnalyzer(config)
+    df = pd.DataFrame({
+        'hash': ['a1', 'b2', 'c3', 'd4'],
+        'author': ['Test'] * 4,
+        'date': pd.to_datetime(['2024-01-02 08:00', '2024-01-02 15:00', '2024-01-02 19:30', '2024-01-03 10:00']),
+        'message': ['PROJ-1 tôt', 'PROJ-2 midi', 'PROJ-3 tard', 'PROJ-4 jour chômé']
+    })
+    for engine in ('loop', 'vectorized'):
+        infos = analyzer.extract_tickets_from_dataframe(df, engine=engine)
+        assert list(infos) == [date(2024, 1, 2)]
+        slots = [(info['ticket'], info['debut'], info['fin'], info['duree'], info['erreur']) for info in infos[date(2024, 1, 2)]]
+        day = date(2024, 1, 2)
+        assert slots == [
+            ('PROJ-1', at('09:00', day), at('08:00', day), timedelta(0), True),
+            ('PROJ-2', at('08:00', day), at('13:00', day), timedelta(hours=5), False),
+            ('PROJ-2', at('14:00', day), at('15:00', day), timedelta(hours=1), False),
+            ('PROJ-3', at('15:00', day), at('19:30', day), timedelta(hours=4, minutes=30), False),
+        ]